@@ -6,12 +6,11 @@ from pathlib import Path
 
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-import yaml
 from src.rag.vector_store import PgVectorStore
+from src.utils.config_cache import load_config_fast
 
 # Load config
-with open("config/config.yaml") as f:
-    cfg = yaml.safe_load(f)
+cfg = load_config_fast(Path("config/config.yaml"))
 
 pg = cfg["rag"]["pgvector"]
 
@@ -30,42 +29,58 @@ store.connect()
 class_name = "PaymentMethodConfig"
 print(f"\nChecking for class: {class_name}\n")
 
-# Exact match
-cur = store._conn.cursor()
-cur.execute(
-    "SELECT class_name, file_path, chunk_type FROM code_chunks WHERE class_name = %s AND chunk_type = 'class'",
-    (class_name,),
-)
-exact_match = cur.fetchall()
+# Send all lookups in one pipeline so they share a single network round-trip
+conn = store._conn
+with conn.pipeline():
+    # Exact match
+    exact_cur = conn.execute(
+        "SELECT class_name, file_path, chunk_type FROM code_chunks WHERE class_name = %s AND chunk_type = 'class'",
+        (class_name,),
+    )
+
+    # Partial match: UNION ALL lets each branch use its trigram index and stop
+    # after 20 rows, which Postgres cannot do for a single OR predicate. The
+    # second branch skips rows the first one already matched.
+    pattern = f"%{class_name}%"
+    partial_cur = conn.execute(
+        """
+        (SELECT class_name, file_path, chunk_type FROM code_chunks
+         WHERE class_name LIKE %s LIMIT 20)
+        UNION ALL
+        (SELECT class_name, file_path, chunk_type FROM code_chunks
+         WHERE file_path LIKE %s AND COALESCE(class_name, '') NOT LIKE %s LIMIT 20)
+        LIMIT 20
+        """,
+        (pattern, pattern, pattern),
+    )
+
+    # Check file path
+    file_cur = conn.execute(
+        "SELECT class_name, file_path, chunk_type FROM code_chunks WHERE file_path LIKE %s LIMIT 10",
+        ("%PaymentMethodConfig.java%",),
+    )
+
+    # Check all class chunks
+    count_cur = conn.execute(
+        "SELECT COUNT(*) FROM code_chunks WHERE chunk_type = 'class' AND language = 'java'"
+    )
+
+exact_match = exact_cur.fetchall()
 print(f"Exact match (class_name='{class_name}' AND chunk_type='class'):")
 for row in exact_match:
     print(f"  {row}")
 
-# Partial match
-cur.execute(
-    "SELECT class_name, file_path, chunk_type FROM code_chunks WHERE class_name LIKE %s OR file_path LIKE %s LIMIT 20",
-    (f"%{class_name}%", f"%{class_name}%"),
-)
-partial_match = cur.fetchall()
+partial_match = partial_cur.fetchall()
 print(f"\nPartial match (class_name or file_path LIKE '%{class_name}%'):")
 for row in partial_match:
     print(f"  {row}")
 
-# Check file path
-cur.execute(
-    "SELECT class_name, file_path, chunk_type FROM code_chunks WHERE file_path LIKE %s LIMIT 10",
-    ("%PaymentMethodConfig.java%",),
-)
-file_match = cur.fetchall()
+file_match = file_cur.fetchall()
 print(f"\nFile path match (file_path LIKE '%PaymentMethodConfig.java%'):")
 for row in file_match:
     print(f"  {row}")
 
-# Check all class chunks
-cur.execute(
-    "SELECT COUNT(*) FROM code_chunks WHERE chunk_type = 'class' AND language = 'java'"
-)
-total_java_classes = cur.fetchone()[0]
+total_java_classes = count_cur.fetchone()[0]
 print(f"\nTotal Java class chunks in database: {total_java_classes}")
 
 store.close()
@@ -13,11 +13,18 @@ config_path = script_dir / "config" / "config.yaml"
 print(f"Script directory: {script_dir}")
 print(f"Config path: {config_path}")
 print(f"Config absolute path: {config_path.absolute()}")
-print(f"Config exists: {config_path.exists()}")
 
-if config_path.exists():
+# One stat call answers both "does it exist" and "how big is it"
+try:
+    config_stat = config_path.stat()
+except FileNotFoundError:
+    config_stat = None
+
+print(f"Config exists: {config_stat is not None}")
+
+if config_stat is not None:
     print(f"\n✓ Config file found!")
-    print(f"  Size: {config_path.stat().st_size} bytes")
+    print(f"  Size: {config_stat.st_size} bytes")
 else:
     print(f"\n✗ Config file NOT found!")
     print(f"\nTo create it:")
@@ -6,12 +6,11 @@ from pathlib import Path
 
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-import yaml
 from src.rag.vector_store import PgVectorStore
+from src.utils.config_cache import load_config_fast
 
 # Load config
-with open("config/config.yaml") as f:
-    cfg = yaml.safe_load(f)
+cfg = load_config_fast(Path("config/config.yaml"))
 
 pg = cfg["rag"]["pgvector"]
 
@@ -30,20 +29,43 @@ print("\n" + "="*80)
 print("Checking database for PaymentMethodConfig chunks")
 print("="*80 + "\n")
 
-# Check for PaymentMethodConfig class
-cur = store._conn.cursor()
-cur.execute("""
-    SELECT class_name, chunk_type, file_path, start_line, end_line, 
-           LENGTH(content) as content_length,
-           metadata->>'parent_class' as parent_class
-    FROM code_chunks 
-    WHERE class_name LIKE '%PaymentMethodConfig%' 
-       OR file_path LIKE '%PaymentMethodConfig%'
-    ORDER BY chunk_type, class_name
-    LIMIT 50
-""")
-
-rows = cur.fetchall()
+# Issue all lookups in one pipeline so they share a single network round-trip
+conn = store._conn
+with conn.pipeline():
+    # Check for PaymentMethodConfig class
+    related_cur = conn.execute("""
+        SELECT class_name, chunk_type, file_path, start_line, end_line, 
+               LENGTH(content) as content_length,
+               metadata->>'parent_class' as parent_class
+        FROM code_chunks 
+        WHERE class_name LIKE '%PaymentMethodConfig%' 
+           OR file_path LIKE '%PaymentMethodConfig%'
+        ORDER BY chunk_type, class_name
+        LIMIT 50
+    """)
+
+    # Check for enum chunks specifically
+    enum_cur = conn.execute("""
+        SELECT class_name, chunk_type, file_path, 
+               metadata->>'parent_class' as parent_class
+        FROM code_chunks 
+        WHERE chunk_type = 'enum'
+        ORDER BY class_name
+        LIMIT 20
+    """)
+
+    # All counts in a single table scan
+    stats_cur = conn.execute("""
+        SELECT COUNT(*),
+               COUNT(*) FILTER (WHERE chunk_type = 'class'),
+               COUNT(*) FILTER (WHERE chunk_type = 'enum'),
+               COUNT(*) FILTER (WHERE chunk_type = 'method')
+        FROM code_chunks
+    """)
+
+rows = related_cur.fetchall()
+enum_rows = enum_cur.fetchall()
+total, class_count, enum_count, method_count = stats_cur.fetchone()
 
 if rows:
     print(f"Found {len(rows)} chunks related to PaymentMethodConfig:\n")
@@ -77,17 +99,6 @@ print("\n" + "="*80)
 print("Checking for enum chunks")
 print("="*80 + "\n")
 
-cur.execute("""
-    SELECT class_name, chunk_type, file_path, 
-           metadata->>'parent_class' as parent_class
-    FROM code_chunks 
-    WHERE chunk_type = 'enum'
-    ORDER BY class_name
-    LIMIT 20
-""")
-
-enum_rows = cur.fetchall()
-
 if enum_rows:
     print(f"Found {len(enum_rows)} enum chunks:\n")
     for row in enum_rows:
@@ -104,20 +115,9 @@ print("\n" + "="*80)
 print("Database Statistics")
 print("="*80 + "\n")
 
-cur.execute("SELECT COUNT(*) FROM code_chunks")
-total = cur.fetchone()[0]
 print(f"Total chunks: {total:,}")
-
-cur.execute("SELECT COUNT(*) FROM code_chunks WHERE chunk_type = 'class'")
-class_count = cur.fetchone()[0]
 print(f"Class chunks: {class_count:,}")
-
-cur.execute("SELECT COUNT(*) FROM code_chunks WHERE chunk_type = 'enum'")
-enum_count = cur.fetchone()[0]
 print(f"Enum chunks: {enum_count:,}")
-
-cur.execute("SELECT COUNT(*) FROM code_chunks WHERE chunk_type = 'method'")
-method_count = cur.fetchone()[0]
 print(f"Method chunks: {method_count:,}")
 
 store.close()
@@ -23,16 +23,20 @@ The script will:
 """
 
 import argparse
+import hashlib
 import json
 import logging
-import random
+import os
+import pickle
 import re
 import sys
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Optional
+from typing import Iterable, Optional
 
-import yaml
+import numpy as np
+import orjson
 
 # Add src to path
 sys.path.insert(0, str(Path(__file__).parent.parent))
@@ -42,6 +46,7 @@ from src.converters.strategies.template_generation import (
     TemplateGenerationStrategy,
 )
 from src.extractors.java_extractor import JavaClass, JavaExtractor
+from src.utils.config_cache import load_config_fast
 
 logging.basicConfig(
     level=logging.INFO,
@@ -49,6 +54,25 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Below this many templates, process start-up costs more than parallel parsing saves
+PARALLEL_LOAD_THRESHOLD = 64
+
+# Default location for cached Java extraction results
+DEFAULT_CACHE_DIR = Path("data/cache")
+
+
+def _load_template_file(template_file: Path) -> tuple[Path, Optional[dict], Optional[str]]:
+    """Read and parse one template file (runs in a worker process).
+
+    Returns:
+        Tuple of (path, parsed content or None, error message or None)
+    """
+    try:
+        with open(template_file, "rb") as f:
+            return template_file, orjson.loads(f.read()), None
+    except (orjson.JSONDecodeError, OSError) as e:
+        return template_file, None, str(e)
+
 
 @dataclass
 class MatchedPair:
@@ -63,17 +87,23 @@ class MatchedPair:
 class TemplateTrainingGenerator:
     """Generate training data from Java class and template pairs."""
 
+    # A whole JSON string holding a PascalCase identifier that may name a Java
+    # class; the lookbehind skips escaped quotes inside longer strings
+    CLASS_REFERENCE_PATTERN = re.compile(rb'(?<!\\)"([A-Z][a-zA-Z0-9]+)"')
+
     def __init__(
         self,
         java_dir: Path,
         template_dir: Path,
         mapping_file: Optional[Path] = None,
         system_instruction: Optional[str] = None,
+        cache_dir: Optional[Path] = DEFAULT_CACHE_DIR,
     ):
         self.java_dir = java_dir
         self.template_dir = template_dir
         self.mapping_file = mapping_file
         self.system_instruction = system_instruction
+        self.cache_dir = cache_dir
 
         self.java_extractor = JavaExtractor()
         self.strategy = TemplateGenerationStrategy(
@@ -119,7 +149,7 @@ class TemplateTrainingGenerator:
 
         # Extract all Java classes
         logger.info(f"Extracting Java classes from {self.java_dir}")
-        java_classes = self.java_extractor.extract_directory(self.java_dir)
+        java_classes = self._extract_java_classes()
         logger.info(f"Found {len(java_classes)} Java classes")
 
         # Load all templates
@@ -161,24 +191,29 @@ class TemplateTrainingGenerator:
 
             logger.info(f"Generated {synthetic_count} synthetic examples")
 
-        # Shuffle and split
-        random.shuffle(all_examples)
+        # Shuffle an index permutation and stream each split straight to disk,
+        # instead of shuffling the example list and copying it into two slices
+        order = np.random.default_rng().permutation(len(all_examples))
 
         n_validation = int(len(all_examples) * validation_split)
-        validation_examples = all_examples[:n_validation]
-        training_examples = all_examples[n_validation:]
+        validation_order = order[:n_validation]
+        training_order = order[n_validation:]
 
         # Write JSONL files
-        self._write_jsonl(training_examples, output_dir / train_file)
-        self._write_jsonl(validation_examples, output_dir / validation_file)
+        self._write_jsonl(
+            (all_examples[i] for i in training_order), output_dir / train_file
+        )
+        self._write_jsonl(
+            (all_examples[i] for i in validation_order), output_dir / validation_file
+        )
 
         stats = {
             "total_java_classes": len(java_classes),
             "total_templates": len(templates),
             "matched_pairs": len(matched_pairs),
             "match_breakdown": self._count_match_types(matched_pairs),
-            "training_examples": len(training_examples),
-            "validation_examples": len(validation_examples),
+            "training_examples": len(training_order),
+            "validation_examples": len(validation_order),
             "output_files": {
                 "train": str(output_dir / train_file),
                 "validation": str(output_dir / validation_file),
@@ -188,6 +223,72 @@ class TemplateTrainingGenerator:
         logger.info(f"Generation complete: {stats}")
         return stats
 
+    def _java_tree_key(self) -> str:
+        """Hash the resolved java_dir, so cache entries can be scoped per source tree."""
+        return hashlib.blake2b(
+            str(self.java_dir.resolve()).encode(), digest_size=8
+        ).hexdigest()
+
+    def _java_tree_fingerprint(self) -> str:
+        """Hash the extractor and the path, mtime and size of every Java file.
+
+        The extractor's source file and settings are part of the hash, so a
+        parser change or a different configuration never reuses stale classes.
+
+        Returns:
+            Hex digest that changes whenever a Java file is added, removed or
+            modified, or the extractor changes
+        """
+        digest = hashlib.blake2b(digest_size=16)
+        extractor = self.java_extractor
+        extractor_source = Path(sys.modules[type(extractor).__module__].__file__)
+        digest.update(
+            hashlib.blake2b(extractor_source.read_bytes(), digest_size=16).digest()
+        )
+        digest.update(
+            f"{extractor.include_private}:{extractor.include_comments}:"
+            f"{extractor.include_imports}:{extractor.max_lines}\n".encode()
+        )
+        for java_file in sorted(self.java_dir.glob("**/*.java")):
+            st = java_file.stat()
+            rel = java_file.relative_to(self.java_dir).as_posix()
+            digest.update(f"{rel}\0{st.st_mtime_ns}\0{st.st_size}\n".encode())
+        return digest.hexdigest()
+
+    def _extract_java_classes(self) -> list[JavaClass]:
+        """Extract Java classes, reusing a pickled result if the tree is unchanged."""
+        if self.cache_dir is None:
+            return self.java_extractor.extract_directory(self.java_dir)
+
+        tree_key = self._java_tree_key()
+        fingerprint = self._java_tree_fingerprint()
+        cache_file = self.cache_dir / f"java_classes_{tree_key}_{fingerprint}.pkl"
+
+        if cache_file.exists():
+            try:
+                with open(cache_file, "rb") as f:
+                    java_classes = pickle.load(f)
+                logger.info(f"Loaded cached Java classes from {cache_file}")
+                return java_classes
+            except (pickle.UnpicklingError, EOFError, AttributeError, OSError) as e:
+                logger.warning(f"Ignoring unreadable cache {cache_file}: {e}")
+
+        java_classes = self.java_extractor.extract_directory(self.java_dir)
+
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            # Drop caches for earlier states of this tree; other source dirs keep theirs
+            for stale in self.cache_dir.glob(f"java_classes_{tree_key}_*.pkl"):
+                stale.unlink(missing_ok=True)
+            tmp_file = cache_file.with_suffix(".tmp")
+            with open(tmp_file, "wb") as f:
+                pickle.dump(java_classes, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_file, cache_file)
+        except OSError as e:
+            logger.warning(f"Could not write Java class cache: {e}")
+
+        return java_classes
+
     def _load_templates(self) -> dict[str, dict]:
         """Load all JSON templates from the template directory."""
         templates = {}
@@ -195,17 +296,25 @@ class TemplateTrainingGenerator:
         if not self.template_dir.exists():
             return templates
 
-        for template_file in self.template_dir.rglob("*.json"):
-            try:
-                with open(template_file, "r", encoding="utf-8") as f:
-                    content = json.load(f)
-                templates[str(template_file)] = {
-                    "path": template_file,
-                    "content": content,
-                    "name": template_file.stem,
-                }
-            except (json.JSONDecodeError, IOError) as e:
-                logger.warning(f"Could not load template {template_file}: {e}")
+        template_files = list(self.template_dir.rglob("*.json"))
+
+        if len(template_files) < PARALLEL_LOAD_THRESHOLD:
+            results = map(_load_template_file, template_files)
+        else:
+            with ProcessPoolExecutor() as executor:
+                results = list(
+                    executor.map(_load_template_file, template_files, chunksize=32)
+                )
+
+        for template_file, content, error in results:
+            if error is not None:
+                logger.warning(f"Could not load template {template_file}: {error}")
+                continue
+            templates[str(template_file)] = {
+                "path": template_file,
+                "content": content,
+                "name": template_file.stem,
+            }
 
         return templates
 
@@ -260,7 +369,7 @@ class TemplateTrainingGenerator:
                 used_templates.add(template_path)
 
         # 3. Reference-based matching
-        class_pattern = re.compile(r"^[A-Z][a-zA-Z0-9]+(?:[A-Z][a-zA-Z0-9]+)*$")
+        paired_class_names = {p.java_class.name for p in pairs}
 
         for template_path, template_data in templates.items():
             if template_path in used_templates:
@@ -268,14 +377,12 @@ class TemplateTrainingGenerator:
 
             # Find class references in template
             references = self._find_class_references(
-                template_data["content"], class_pattern
+                template_data["content"], self.CLASS_REFERENCE_PATTERN
             )
 
             # Match to the most specific class reference
             for ref in references:
-                if ref in class_by_name and ref not in [
-                    p.java_class.name for p in pairs
-                ]:
+                if ref in class_by_name and ref not in paired_class_names:
                     pairs.append(
                         MatchedPair(
                             java_class=class_by_name[ref],
@@ -284,27 +391,22 @@ class TemplateTrainingGenerator:
                             match_type="reference",
                         )
                     )
+                    paired_class_names.add(ref)
                     used_templates.add(template_path)
                     break
 
         return pairs
 
     def _find_class_references(self, obj: any, pattern: re.Pattern) -> list[str]:
-        """Find class references in a JSON structure."""
-        references = []
-
-        if isinstance(obj, dict):
-            for key, value in obj.items():
-                if isinstance(key, str) and pattern.match(key):
-                    references.append(key)
-                if isinstance(value, str) and pattern.match(value):
-                    references.append(value)
-                references.extend(self._find_class_references(value, pattern))
-        elif isinstance(obj, list):
-            for item in obj:
-                references.extend(self._find_class_references(item, pattern))
-
-        return references
+        """Find class references in a JSON structure.
+
+        Serializes the structure once and runs a single regex sweep over the
+        bytes, so every JSON string (keys, values and list items) is checked
+        without a Python-level tree walk. References are deduplicated,
+        keeping first-seen order so matching stays deterministic.
+        """
+        blob = orjson.dumps(obj)
+        return list(dict.fromkeys(m.group(1).decode() for m in pattern.finditer(blob)))
 
     def _count_match_types(self, pairs: list[MatchedPair]) -> dict[str, int]:
         """Count pairs by match type."""
@@ -313,27 +415,39 @@ class TemplateTrainingGenerator:
             counts[pair.match_type] = counts.get(pair.match_type, 0) + 1
         return counts
 
-    def _to_vertex_format(self, example) -> dict:
-        """Convert a training example to Vertex AI format."""
-        return {
-            "systemInstruction": {
-                "role": "system",
-                "parts": [{"text": example.system_instruction}],
-            },
-            "contents": [
-                {"role": "user", "parts": [{"text": example.user_prompt}]},
-                {"role": "model", "parts": [{"text": example.model_response}]},
-            ],
-        }
-
-    def _write_jsonl(self, examples: list, output_file: Path) -> None:
-        """Write examples to a JSONL file."""
-        with open(output_file, "w", encoding="utf-8") as f:
-            for example in examples:
-                vertex_format = self._to_vertex_format(example)
-                f.write(json.dumps(vertex_format, ensure_ascii=False) + "\n")
+    @staticmethod
+    def _contents(example) -> list[dict]:
+        """Build the user/model turns of a training example."""
+        return [
+            {"role": "user", "parts": [{"text": example.user_prompt}]},
+            {"role": "model", "parts": [{"text": example.model_response}]},
+        ]
+
+    def _write_jsonl(self, examples: Iterable, output_file: Path) -> None:
+        """Write examples to a JSONL file.
+
+        orjson emits UTF-8 bytes directly, so lines go straight to a
+        large-buffered binary file without a text-layer encode per line.
+        The systemInstruction prefix is identical across examples, so it is
+        serialized once per instruction and only the turns are encoded per
+        line.
+        """
+        prefixes: dict[str, bytes] = {}
+        count = 0
+        with open(output_file, "wb", buffering=1 << 20) as f:
+            for count, example in enumerate(examples, 1):
+                prefix = prefixes.get(example.system_instruction)
+                if prefix is None:
+                    system_block = orjson.dumps(
+                        {"role": "system", "parts": [{"text": example.system_instruction}]}
+                    )
+                    prefix = b'{"systemInstruction":' + system_block + b',"contents":'
+                    prefixes[example.system_instruction] = prefix
+                f.write(prefix)
+                f.write(orjson.dumps(self._contents(example)))
+                f.write(b"}\n")
 
-        logger.info(f"Wrote {len(examples)} examples to {output_file}")
+        logger.info(f"Wrote {count} examples to {output_file}")
 
 
 def main():
@@ -384,6 +498,17 @@ def main():
         action="store_true",
         help="Don't generate synthetic templates for unmatched classes",
     )
+    parser.add_argument(
+        "--cache-dir",
+        type=Path,
+        default=DEFAULT_CACHE_DIR,
+        help=f"Directory for cached Java extraction results (default: {DEFAULT_CACHE_DIR})",
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Always re-extract Java classes instead of using the cache",
+    )
     parser.add_argument(
         "-v",
         "--verbose",
@@ -399,11 +524,10 @@ def main():
     # Load config if provided
     system_instruction = None
     if args.config and args.config.exists():
-        with open(args.config, "r") as f:
-            config = yaml.safe_load(f)
-            system_instruction = config.get("training", {}).get(
-                "template_system_instruction"
-            )
+        config = load_config_fast(args.config)
+        system_instruction = config.get("training", {}).get(
+            "template_system_instruction"
+        )
 
     # Validate directories
     if not args.java_dir.exists():
@@ -423,6 +547,7 @@ def main():
         template_dir=args.template_dir,
         mapping_file=args.mapping_file,
         system_instruction=system_instruction,
+        cache_dir=None if args.no_cache else args.cache_dir,
     )
 
     stats = generator.generate(
@@ -1,25 +1,316 @@
 #!/usr/bin/env python3
 """Index codebase into vector database for RAG queries."""
 
+import asyncio
+import heapq
+import os
 import sys
+from collections import Counter
+from itertools import chain, islice
+from operator import attrgetter, itemgetter
 from pathlib import Path
+from typing import Iterable, Iterator
 
 # Add src to path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 import click
-import yaml
-from rich.console import Console
+import psycopg
+from rich.console import Console, Group
 from rich.panel import Panel
+from rich.markup import escape as rich_escape
 from rich.progress import Progress, SpinnerColumn, TextColumn
 from rich.table import Table
 
-from src.rag.chunker import CodeChunker
+from src.rag.chunker import CodeChunk, CodeChunker
+from src.rag.embed_cache import EmbeddingCache
 from src.rag.embedder import VertexEmbedder
 from src.rag.vector_store import PgVectorStore
+from src.utils.config_cache import load_config_fast
+from src.utils.parse_cache import ParseCache
 
 console = Console()
 
+# Chunks embedded and upserted together; bounds peak memory while streaming
+PIPELINE_BATCH_SIZE = 500
+
+# Default location of the persistent embedding cache
+DEFAULT_EMBEDDING_CACHE = Path("data/cache/embeddings.sqlite")
+
+# Default location of the persistent parse cache
+DEFAULT_PARSE_CACHE = Path("data/cache/parse_cache.sqlite")
+
+# Once a run has this many new or changed chunks to write, the vector indexes
+# are dropped before the rest are written and rebuilt afterwards; one bulk
+# build beats maintaining the index row by row. Runs that touch fewer rows
+# keep their indexes.
+BULK_LOAD_INDEX_THRESHOLD = 10_000
+
+# Chunks a dry run produces before it stops and extrapolates (see --full-scan)
+DRY_RUN_SAMPLE_CHUNKS = 1000
+
+
+def _batched(iterable: Iterable, size: int) -> Iterator[list]:
+    """Yield successive lists of at most ``size`` items from ``iterable``."""
+    iterator = iter(iterable)
+    while batch := list(islice(iterator, size)):
+        yield batch
+
+
+def _track_batches(batches: Iterable[list[CodeChunk]], stats: dict) -> Iterator[list[CodeChunk]]:
+    """Pass chunk batches through while tallying statistics into ``stats``.
+
+    Counting a whole batch at a time with Counter.update over attrgetter
+    keeps the per-chunk work in C.
+    """
+    for batch in batches:
+        stats["total"] += len(batch)
+        stats["by_language"].update(map(attrgetter("language"), batch))
+        stats["by_type"].update(map(attrgetter("chunk_type"), batch))
+        stats["with_refs"] += sum(map(bool, map(attrgetter("references"), batch)))
+        yield batch
+
+
+async def _embed_and_store(
+    batches: Iterable[list[CodeChunk]],
+    embedder: VertexEmbedder,
+    store: PgVectorStore,
+    batch_size: int,
+    max_tokens_per_request: int = 15000,
+    embed_concurrency: int = 8,
+    skip_unchanged: bool = True,
+    on_stored=None,
+    on_bulk_load=None,
+) -> tuple[int, int, list[dict]]:
+    """Embed chunk batches and upsert them concurrently.
+
+    A producer embeds batches (chunking happens lazily as batches are
+    pulled) and hands them to a consumer that writes them to the database
+    through a bounded queue, so Vertex and PostgreSQL latency overlap
+    instead of adding up. Chunks whose stored content hash matches skip
+    embedding, so re-indexing only pays Vertex for what changed; their
+    other columns (line span, references, metadata) are still refreshed.
+
+    Args:
+        batches: Chunk batches to index
+        embedder: Embedder for chunk vectors
+        store: Connected vector store
+        batch_size: Maximum chunks per embedding API call
+        max_tokens_per_request: Token budget packed into each embedding API call
+        embed_concurrency: Maximum embedding API calls in flight at once
+        skip_unchanged: Skip embedding chunks already stored with the same
+            content hash and embedding model (their non-embedding columns
+            are still updated)
+        on_stored: Optional callback receiving the running upsert count
+        on_bulk_load: Optional callback run once, under the database lock,
+            when the chunks to write reach BULK_LOAD_INDEX_THRESHOLD; later
+            batches are written after it returns
+
+    Returns:
+        Tuple of (rows upserted, unchanged chunks skipped, skipped chunk info)
+    """
+    queue: asyncio.Queue = asyncio.Queue(maxsize=2)
+    # The store has a single connection; keep lookups and upserts from interleaving
+    db_lock = asyncio.Lock()
+    skipped_chunks: list[dict] = []
+    unchanged = 0
+    to_write = 0
+    batches = iter(batches)
+
+    async def produce() -> None:
+        nonlocal unchanged, to_write
+        while batch := await asyncio.to_thread(next, batches, None):
+            if skip_unchanged:
+                async with db_lock:
+                    stored_hashes = await asyncio.to_thread(
+                        store.get_content_hashes, [chunk.id for chunk in batch]
+                    )
+                changed = []
+                same = []
+                for chunk in batch:
+                    if stored_hashes.get(chunk.id) == store.embedding_hash(chunk):
+                        same.append(chunk)
+                    else:
+                        changed.append(chunk)
+                unchanged += len(same)
+                if same:
+                    # The embedding is still valid, but line spans, references
+                    # and metadata may have moved; refresh those columns
+                    async with db_lock:
+                        await asyncio.to_thread(store.update_chunk_fields, same)
+                if not changed:
+                    continue
+                batch = changed
+
+            crossed = to_write < BULK_LOAD_INDEX_THRESHOLD <= to_write + len(batch)
+            to_write += len(batch)
+            if crossed and on_bulk_load is not None:
+                async with db_lock:
+                    await asyncio.to_thread(on_bulk_load)
+
+            chunk_embeddings, batch_skipped = await embedder.embed_chunks_async(
+                batch,
+                batch_size=batch_size,
+                max_tokens_per_request=max_tokens_per_request,
+                concurrency=embed_concurrency,
+            )
+            skipped_chunks.extend(batch_skipped)
+            if chunk_embeddings:
+                await queue.put(chunk_embeddings)
+        await queue.put(None)
+
+    async def consume() -> int:
+        count = 0
+        while (chunk_embeddings := await queue.get()) is not None:
+            async with db_lock:
+                count += await store.upsert_async(chunk_embeddings)
+            if on_stored:
+                on_stored(count)
+        return count
+
+    _, count = await asyncio.gather(produce(), consume())
+    return count, unchanged, skipped_chunks
+
+
+def _print_database_error(error: psycopg.Error, pgvector_config: dict) -> None:
+    """Display a database error with setup hints."""
+    console.print(f"[red]Database error: {error}[/red]")
+    console.print("\nMake sure PostgreSQL is running with pgvector extension:")
+    console.print("  1. Install pgvector: https://github.com/pgvector/pgvector")
+    console.print(
+        f"  2. Create database: createdb {pgvector_config.get('database', 'codebase_rag')}"
+    )
+    console.print("  3. Enable extension: CREATE EXTENSION vector;")
+
+
+def _build_indexes(store: PgVectorStore, pgvector_config: dict) -> None:
+    """Build the vector index (and the binary index if configured).
+
+    Failures are reported as warnings; searches still work without the
+    indexes, only slower.
+    """
+    try:
+        with Progress(
+            SpinnerColumn(),
+            TextColumn("[progress.description]{task.description}"),
+            console=console,
+        ) as progress:
+            progress.add_task("Building vector index...", total=None)
+            store.create_vector_index(
+                maintenance_workers=pgvector_config.get("maintenance_workers"),
+                maintenance_work_mem=pgvector_config.get("maintenance_work_mem"),
+            )
+        console.print("[green]Vector index created[/green]")
+    except Exception as e:
+        console.print(f"[yellow]Warning: Could not create vector index: {e}[/yellow]")
+        console.print("[yellow]Search will still work but may be slower[/yellow]")
+
+    if pgvector_config.get("binary_index"):
+        try:
+            with Progress(
+                SpinnerColumn(),
+                TextColumn("[progress.description]{task.description}"),
+                console=console,
+            ) as progress:
+                progress.add_task("Building binary-quantized index...", total=None)
+                store.create_binary_index(
+                    maintenance_workers=pgvector_config.get("maintenance_workers"),
+                    maintenance_work_mem=pgvector_config.get("maintenance_work_mem"),
+                )
+            console.print("[green]Binary-quantized index created[/green]")
+        except Exception as e:
+            console.print(
+                f"[yellow]Warning: Could not create binary-quantized index: {e}[/yellow]"
+            )
+            console.print("[yellow]Queries will search full-precision vectors only[/yellow]")
+
+
+def _count_candidate_files(source_dir: Path, chunker: CodeChunker) -> int:
+    """Count files under ``source_dir`` that the chunker may read.
+
+    Only suffixes are checked, so this is a cheap upper-bound estimate used
+    to extrapolate sampled dry-run statistics.
+    """
+    suffixes = {
+        ".java",
+        *chunker.generic_extractor.LANGUAGE_EXTENSIONS,
+        *chunker.TEMPLATE_EXTENSIONS,
+        *chunker.DOCUMENT_EXTENSIONS,
+    }
+    return sum(1 for file_path in source_dir.rglob("*") if file_path.suffix in suffixes)
+
+
+def _print_chunk_statistics(stats: dict, title: str = "Chunk Statistics") -> None:
+    """Display the chunk statistics table."""
+    table = Table(title=title)
+    table.add_column("Metric", style="cyan")
+    table.add_column("Count", style="green")
+
+    table.add_row("Total Chunks", str(stats["total"]))
+    table.add_row("Chunks with Class References", str(stats["with_refs"]))
+    table.add_row("", "")
+    table.add_row("[bold]By Language[/bold]", "")
+    for lang, count in sorted(stats["by_language"].items()):
+        table.add_row(f"  {lang}", str(count))
+    table.add_row("", "")
+    table.add_row("[bold]By Type[/bold]", "")
+    for chunk_type, count in sorted(stats["by_type"].items()):
+        table.add_row(f"  {chunk_type}", str(count))
+
+    console.print(table)
+
+
+def _print_skipped_summary(skipped_chunks: list[dict]) -> None:
+    """Display statistics about chunks that could not be embedded."""
+    console.print(f"\n[yellow]⚠ Skipped {len(skipped_chunks)} chunks:[/yellow]")
+
+    # Group by reason and type; Counter and itemgetter keep the tallies in C
+    by_reason = Counter(map(itemgetter("reason"), skipped_chunks))
+    by_type = Counter(map(itemgetter("chunk_type"), skipped_chunks))
+    total_tokens_skipped = sum(map(itemgetter("token_count"), skipped_chunks))
+
+    # Show summary table
+    skip_table = Table(title="Skipped Chunks Summary")
+    skip_table.add_column("Reason", style="yellow")
+    skip_table.add_column("Count", style="red")
+
+    for reason, count in by_reason.most_common():
+        skip_table.add_row(reason, str(count))
+
+    # Collect everything and render it in a single print
+    renderables = [skip_table]
+
+    # Show breakdown by type
+    if len(by_type) > 1:
+        type_table = Table(title="Skipped by Chunk Type")
+        type_table.add_column("Type", style="cyan")
+        type_table.add_column("Count", style="red")
+
+        for chunk_type, count in by_type.most_common():
+            type_table.add_row(chunk_type, str(count))
+
+        renderables.append(type_table)
+
+    # Show largest skipped chunks
+    largest_skipped = heapq.nlargest(5, skipped_chunks, key=itemgetter("token_count"))
+    lines = ["\n[bold yellow]Top 5 Largest Skipped Chunks:[/bold yellow]"]
+    for i, skipped in enumerate(largest_skipped, 1):
+        chunk = skipped['chunk']
+        lines.append(
+            f"  {i}. {chunk.location} "
+            f"({skipped['chunk_type']}) - {skipped['token_count']:,} tokens "
+            f"({skipped['size_chars']:,} chars)"
+        )
+
+    lines.append(f"\n[dim]Total tokens skipped: {total_tokens_skipped:,}[/dim]")
+    lines.append(
+        "[dim]Tip: Large JSON templates or very long code files may exceed the 15,000 token limit. "
+        "Consider splitting them into smaller chunks.[/dim]"
+    )
+    renderables.append("\n".join(lines))
+
+    console.print(Group(*renderables))
+
 
 @click.command()
 @click.option(
@@ -46,18 +337,72 @@ console = Console()
     is_flag=True,
     help="Show what would be indexed without actually indexing",
 )
+@click.option(
+    "--full-scan",
+    is_flag=True,
+    help=f"With --dry-run, chunk every file instead of stopping after {DRY_RUN_SAMPLE_CHUNKS} chunks",
+)
 @click.option(
     "--batch-size",
     type=int,
-    default=100,
-    help="Batch size for embedding API calls",
+    default=250,
+    help="Maximum chunks per embedding API call",
+)
+@click.option(
+    "--max-tokens-per-request",
+    type=int,
+    default=18000,
+    help="Estimated token budget packed into each embedding API call (API limit is 20k)",
+)
+@click.option(
+    "--embed-concurrency",
+    type=int,
+    default=8,
+    help="Maximum concurrent embedding API calls (lower it if you hit Vertex quota errors)",
+)
+@click.option(
+    "--parse-workers",
+    type=int,
+    default=os.cpu_count() or 1,
+    show_default=True,
+    help="Processes used to parse source files (1 parses in this process)",
+)
+@click.option(
+    "--parse-cache",
+    type=click.Path(path_type=Path),
+    default=DEFAULT_PARSE_CACHE,
+    help="SQLite file caching parsed source files by content",
+)
+@click.option(
+    "--no-parse-cache",
+    is_flag=True,
+    help="Always reparse source files instead of reusing cached results",
+)
+@click.option(
+    "--embedding-cache",
+    type=click.Path(path_type=Path),
+    default=DEFAULT_EMBEDDING_CACHE,
+    help="SQLite file caching embeddings by content, model and dimensions",
+)
+@click.option(
+    "--no-embedding-cache",
+    is_flag=True,
+    help="Always call Vertex AI instead of reusing cached embeddings",
 )
 def main(
     source_dir: Path,
     config: str | None,
     reset: bool,
     dry_run: bool,
+    full_scan: bool,
     batch_size: int,
+    max_tokens_per_request: int,
+    embed_concurrency: int,
+    embedding_cache: Path,
+    no_embedding_cache: bool,
+    parse_workers: int,
+    parse_cache: Path,
+    no_parse_cache: bool,
 ):
     """Index source code into vector database for RAG queries.
 
@@ -113,8 +458,7 @@ def main(
 
     # Load configuration
     try:
-        with open(config) as f:
-            cfg = yaml.safe_load(f)
+        cfg = load_config_fast(config)
     except Exception as e:
         console.print(f"[red]Error loading configuration file: {e}[/red]")
         return
@@ -145,6 +489,50 @@ def main(
     )
     console.print()
 
+    # Verify the database before any parsing or paid Vertex calls, so a
+    # misconfigured run fails in seconds instead of after embedding
+    if not dry_run:
+        embedder = VertexEmbedder(
+            project_id=project_id,
+            location=location,
+            model=rag_config.get("embedding_model", "text-embedding-005"),
+        )
+
+        store = PgVectorStore(
+            host=pgvector_config.get("host", "localhost"),
+            port=pgvector_config.get("port", 5432),
+            database=pgvector_config.get("database", "codebase_rag"),
+            user=pgvector_config.get("user", "postgres"),
+            password=pgvector_config.get("password"),
+            embedding_dimensions=embedder.dimensions,
+            embedding_model=embedder.model,
+        )
+
+        try:
+            console.print("[dim]Connecting to database...[/dim]")
+            store.connect()
+
+            if reset:
+                console.print("[yellow]Resetting table...[/yellow]")
+                try:
+                    store.drop_table()
+                    console.print("[green]Table dropped[/green]")
+                except Exception as e:
+                    console.print(f"[yellow]Warning during table drop: {e}[/yellow]")
+                    console.print("[yellow]Continuing anyway...[/yellow]")
+
+            console.print("[dim]Creating table...[/dim]")
+            store.create_table()
+        except psycopg.Error as e:
+            _print_database_error(e, pgvector_config)
+            store.close()
+            return
+
+        if not no_embedding_cache:
+            embedder.cache = EmbeddingCache(
+                embedding_cache, embedder.model, embedder.dimensions
+            )
+
     # Step 1: Chunk source code
     console.print(
         "[bold]Step 1: Chunking source code, templates, and documents...[/bold]"
@@ -156,184 +544,140 @@ def main(
         include_documentation=True,
         include_templates=True,
         include_documents=True,
+        parse_workers=parse_workers,
+        parse_cache=None if no_parse_cache else ParseCache(parse_cache),
     )
 
-    chunks = chunker.chunk_directory(source_dir)
-
-    if not chunks:
+    # Chunks are produced lazily and flow through embedding and storage in
+    # bounded batches, so the whole corpus is never held in memory
+    chunk_iter = chunker.iter_chunks(source_dir)
+    first_chunk = next(chunk_iter, None)
+    all_chunks = chain([first_chunk], chunk_iter)
+    sampling = dry_run and not full_scan
+    if sampling:
+        # A dry run only previews; stop chunking once the sample is full
+        all_chunks = islice(all_chunks, DRY_RUN_SAMPLE_CHUNKS)
+
+    if first_chunk is None:
         console.print(f"[yellow]No content found in {source_dir}[/yellow]")
         console.print("\nMake sure your content is in the correct location:")
         console.print("  - Java files: data/raw/java/")
         console.print("  - JSON templates: data/raw/templates/")
         console.print("  - Documents: data/raw/docs/")
         console.print("  - Other code: data/raw/")
+        if not dry_run:
+            store.close()
         return
 
-    # Show known classes for cross-referencing
-    known_classes = chunker.get_known_classes()
-    if known_classes:
-        console.print(
-            f"\n[dim]Found {len(known_classes)} Java classes for cross-referencing[/dim]"
-        )
-
-    # Show chunk statistics
-    table = Table(title="Chunk Statistics")
-    table.add_column("Metric", style="cyan")
-    table.add_column("Count", style="green")
-
-    by_language = {}
-    by_type = {}
-    chunks_with_refs = 0
-    for chunk in chunks:
-        by_language[chunk.language] = by_language.get(chunk.language, 0) + 1
-        by_type[chunk.chunk_type] = by_type.get(chunk.chunk_type, 0) + 1
-        if chunk.references:
-            chunks_with_refs += 1
-
-    table.add_row("Total Chunks", str(len(chunks)))
-    table.add_row("Chunks with Class References", str(chunks_with_refs))
-    table.add_row("", "")
-    table.add_row("[bold]By Language[/bold]", "")
-    for lang, count in sorted(by_language.items()):
-        table.add_row(f"  {lang}", str(count))
-    table.add_row("", "")
-    table.add_row("[bold]By Type[/bold]", "")
-    for chunk_type, count in sorted(by_type.items()):
-        table.add_row(f"  {chunk_type}", str(count))
-
-    console.print(table)
+    chunk_stats = {
+        "total": 0,
+        "with_refs": 0,
+        "by_language": Counter(),
+        "by_type": Counter(),
+    }
+    batches = _track_batches(
+        _batched(all_chunks, PIPELINE_BATCH_SIZE), chunk_stats
+    )
 
     if dry_run:
-        console.print("\n[yellow]DRY RUN - No indexing performed[/yellow]")
-        console.print("\nSample chunks:")
-        for chunk in chunks[:3]:
-            console.print(f"\n  [cyan]{chunk.file_path}[/cyan]")
+        first_batch = next(batches)
+        sample_chunks = first_batch[:3]
+        sampled_files = set(map(attrgetter("file_path"), first_batch))
+        for batch in batches:
+            # Drain to complete statistics
+            sampled_files.update(map(attrgetter("file_path"), batch))
+        # Closing the generator shuts down its parse workers early
+        chunk_iter.close()
+
+        known_classes = chunker.get_known_classes()
+        if known_classes:
             console.print(
-                f"  Type: {chunk.chunk_type}, Lines: {chunk.start_line}-{chunk.end_line}"
+                f"\n[dim]Found {len(known_classes)} Java classes for cross-referencing[/dim]"
             )
-            preview = chunk.content[:200].replace("\n", " ")
-            console.print(f"  Preview: {preview}...")
-        return
 
-    # Step 2: Generate embeddings
-    console.print("\n[bold]Step 2: Generating embeddings...[/bold]")
-
-    embedder = VertexEmbedder(
-        project_id=project_id,
-        location=location,
-        model=rag_config.get("embedding_model", "text-embedding-005"),
-    )
-
-    chunk_embeddings, skipped_chunks = embedder.embed_chunks(chunks, batch_size=batch_size)
-    
-    # Extract chunks and embeddings (already filtered - None embeddings removed)
-    filtered_chunks = [chunk for chunk, _ in chunk_embeddings]
-    embeddings = [emb for _, emb in chunk_embeddings]
-
-    console.print(f"[green]Generated {len(embeddings)} embeddings[/green]")
-    
-    # Display skipped chunks statistics
-    if skipped_chunks:
-        console.print(f"\n[yellow]⚠ Skipped {len(skipped_chunks)} chunks:[/yellow]")
-        
-        # Group by reason
-        by_reason = {}
-        by_type = {}
-        total_tokens_skipped = 0
-        
-        for skipped in skipped_chunks:
-            reason = skipped['reason']
-            chunk_type = skipped['chunk_type']
-            
-            by_reason[reason] = by_reason.get(reason, 0) + 1
-            by_type[chunk_type] = by_type.get(chunk_type, 0) + 1
-            total_tokens_skipped += skipped['token_count']
-        
-        # Show summary table
-        skip_table = Table(title="Skipped Chunks Summary")
-        skip_table.add_column("Reason", style="yellow")
-        skip_table.add_column("Count", style="red")
-        
-        for reason, count in sorted(by_reason.items(), key=lambda x: x[1], reverse=True):
-            skip_table.add_row(reason, str(count))
-        
-        console.print(skip_table)
-        
-        # Show breakdown by type
-        if len(by_type) > 1:
-            type_table = Table(title="Skipped by Chunk Type")
-            type_table.add_column("Type", style="cyan")
-            type_table.add_column("Count", style="red")
-            
-            for chunk_type, count in sorted(by_type.items(), key=lambda x: x[1], reverse=True):
-                type_table.add_row(chunk_type, str(count))
-            
-            console.print(type_table)
-        
-        # Show largest skipped chunks
-        largest_skipped = sorted(skipped_chunks, key=lambda x: x['token_count'], reverse=True)[:5]
-        console.print(f"\n[bold yellow]Top 5 Largest Skipped Chunks:[/bold yellow]")
-        for i, skipped in enumerate(largest_skipped, 1):
-            chunk = skipped['chunk']
+        if sampling and chunk_stats["total"] >= DRY_RUN_SAMPLE_CHUNKS:
+            total_files = max(
+                _count_candidate_files(source_dir, chunker), len(sampled_files)
+            )
+            estimated_chunks = chunk_stats["total"] * total_files // len(sampled_files)
             console.print(
-                f"  {i}. {chunk.file_path}:{chunk.start_line}-{chunk.end_line} "
-                f"({skipped['chunk_type']}) - {skipped['token_count']:,} tokens "
-                f"({skipped['size_chars']:,} chars)"
+                f"[dim]Sampled {len(sampled_files)} of ~{total_files} files; "
+                f"~{estimated_chunks} chunks in total "
+                f"(use --full-scan for exact counts)[/dim]"
             )
-        
-        console.print(f"\n[dim]Total tokens skipped: {total_tokens_skipped:,}[/dim]")
-        console.print(
-            "[dim]Tip: Large JSON templates or very long code files may exceed the 15,000 token limit. "
-            "Consider splitting them into smaller chunks.[/dim]"
-        )
+            _print_chunk_statistics(chunk_stats, title="Chunk Statistics (sample)")
+        else:
+            _print_chunk_statistics(chunk_stats)
 
-    # Step 3: Store in vector database
-    console.print("\n[bold]Step 3: Storing in vector database...[/bold]")
+        console.print("\n[yellow]DRY RUN - No indexing performed[/yellow]")
+        samples = []
+        for chunk in sample_chunks:
+            preview = chunk.content[:200].replace("\n", " ")
+            samples.append(
+                f"[cyan]{chunk.file_path}[/cyan]\n"
+                f"Type: {chunk.chunk_type}, Lines: {chunk.start_line}-{chunk.end_line}\n"
+                f"Preview: {rich_escape(preview)}..."
+            )
+        console.print(Panel("\n\n".join(samples), title="Sample chunks", border_style="dim"))
+        return
 
-    store = PgVectorStore(
-        host=pgvector_config.get("host", "localhost"),
-        port=pgvector_config.get("port", 5432),
-        database=pgvector_config.get("database", "codebase_rag"),
-        user=pgvector_config.get("user", "postgres"),
-        password=pgvector_config.get("password"),
-        embedding_dimensions=embedder.dimensions,
+    # Steps 2 + 3: Embed and store each batch as it is chunked
+    console.print(
+        "\n[bold]Step 2: Generating embeddings and storing in vector database...[/bold]"
     )
 
-    try:
-        store.connect()
+    indexes_dropped = False
 
-        if reset:
-            console.print("[yellow]Resetting table...[/yellow]")
-            try:
-                store.drop_table()
-                console.print("[green]Table dropped[/green]")
-            except Exception as e:
-                console.print(f"[yellow]Warning during table drop: {e}[/yellow]")
-                console.print("[yellow]Continuing anyway...[/yellow]")
-
-        console.print("[dim]Creating table...[/dim]")
-        store.create_table()
+    def drop_indexes() -> None:
+        # A large load: skip per-row index maintenance, rebuild once below
+        nonlocal indexes_dropped
+        store.drop_vector_index()
+        indexes_dropped = True
 
+    try:
         with Progress(
             SpinnerColumn(),
             TextColumn("[progress.description]{task.description}"),
             console=console,
         ) as progress:
-            task = progress.add_task(
-                f"Inserting {len(filtered_chunks)} chunks...", 
-                total=len(filtered_chunks)
+            task = progress.add_task("Embedding and inserting chunks...", total=None)
+            count, unchanged, skipped_chunks = asyncio.run(
+                _embed_and_store(
+                    batches,
+                    embedder,
+                    store,
+                    batch_size,
+                    max_tokens_per_request,
+                    embed_concurrency,
+                    # A freshly reset table has nothing to compare against
+                    skip_unchanged=not reset,
+                    on_stored=lambda n: progress.update(
+                        task,
+                        description=f"Embedded and inserted {n} of {chunk_stats['total']} chunks...",
+                    ),
+                    on_bulk_load=drop_indexes,
+                )
             )
-            count = store.upsert(filtered_chunks, embeddings, batch_size=500)
-            progress.update(task, completed=len(filtered_chunks))
+
+        # Show known classes for cross-referencing
+        known_classes = chunker.get_known_classes()
+        if known_classes:
+            console.print(
+                f"\n[dim]Found {len(known_classes)} Java classes for cross-referencing[/dim]"
+            )
+        _print_chunk_statistics(chunk_stats)
+
+        console.print(f"[green]Generated {count} embeddings[/green]")
+        if unchanged:
+            console.print(f"[dim]Reused embeddings for {unchanged} unchanged chunks[/dim]")
+
+        # Display skipped chunks statistics
+        if skipped_chunks:
+            _print_skipped_summary(skipped_chunks)
 
         # Create vector index after data is inserted (better performance)
-        console.print("[dim]Creating vector index...[/dim]")
-        try:
-            store.create_vector_index()
-            console.print("[green]Vector index created[/green]")
-        except Exception as e:
-            console.print(f"[yellow]Warning: Could not create vector index: {e}[/yellow]")
-            console.print("[yellow]Search will still work but may be slower[/yellow]")
+        _build_indexes(store, pgvector_config)
+        indexes_dropped = False
 
         console.print(f"[green]Indexed {count} chunks[/green]")
 
@@ -343,18 +687,19 @@ def main(
         console.print(f"  Total chunks: {stats['total_chunks']}")
         console.print(f"  Files indexed: {stats['file_count']}")
 
-    except Exception as e:
-        console.print(f"[red]Database error: {e}[/red]")
-        console.print("\nMake sure PostgreSQL is running with pgvector extension:")
-        console.print("  1. Install pgvector: https://github.com/pgvector/pgvector")
-        console.print(
-            f"  2. Create database: createdb {pgvector_config.get('database', 'codebase_rag')}"
-        )
-        console.print("  3. Enable extension: CREATE EXTENSION vector;")
+    except psycopg.Error as e:
+        _print_database_error(e, pgvector_config)
         return
 
     finally:
+        if indexes_dropped:
+            # The load failed after the indexes were dropped; rebuild them so
+            # searches do not fall back to sequential scans
+            console.print("[yellow]Rebuilding vector indexes after the failed load...[/yellow]")
+            _build_indexes(store, pgvector_config)
         store.close()
+        if embedder.cache is not None:
+            embedder.cache.close()
 
     console.print("\n[bold green]Indexing complete![/bold green]")
     console.print("\nNext steps:")
@@ -1,6 +1,7 @@
 #!/usr/bin/env python3
 """Prepare training data from source code."""
 
+import os
 import sys
 from pathlib import Path
 
@@ -8,15 +9,22 @@ from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 import click
-import yaml
 from rich.console import Console
 from rich.panel import Panel
 from rich.table import Table
 
 from src.converters.code_to_jsonl import CodeToJSONLConverter
+from src.utils.config_cache import load_config_fast
+from src.utils.parse_cache import ParseCache
 
 console = Console()
 
+# Default location of the persistent parse cache (shared with index_codebase.py)
+DEFAULT_PARSE_CACHE = Path("data/cache/parse_cache.sqlite")
+
+# Extensions that count as source code when checking for input files
+SOURCE_SUFFIXES = frozenset({".java", ".py", ".js", ".ts"})
+
 
 @click.command()
 @click.option(
@@ -53,12 +61,33 @@ console = Console()
     default=0.1,
     help="Fraction of data for validation (0.0-1.0)",
 )
+@click.option(
+    "--workers",
+    type=click.IntRange(min=1),
+    default=os.cpu_count() or 1,
+    show_default=True,
+    help="Processes used to convert Java files (1 converts inline)",
+)
+@click.option(
+    "--parse-cache",
+    type=click.Path(path_type=Path),
+    default=DEFAULT_PARSE_CACHE,
+    help="SQLite file caching parsed source files by content",
+)
+@click.option(
+    "--no-parse-cache",
+    is_flag=True,
+    help="Always reparse source files instead of reusing cached results",
+)
 def main(
     source_dir: Path,
     output_dir: Path,
     strategy: str,
     config: Path,
     validation_split: float,
+    workers: int,
+    parse_cache: Path,
+    no_parse_cache: bool,
 ):
     """Prepare training data from source code files.
 
@@ -78,8 +107,7 @@ def main(
     # Load config if exists
     cfg = {}
     if config.exists():
-        with open(config) as f:
-            cfg = yaml.safe_load(f)
+        cfg = load_config_fast(config)
         console.print(f"[dim]Loaded config from {config}[/dim]")
 
     # Get system instruction from config if available
@@ -100,15 +128,15 @@ def main(
         console.print(f"[yellow]Warning: {java_dir} not found[/yellow]")
         console.print(f"[dim]Create this directory and add your Java files[/dim]")
 
-        # Check if there are any files at all
-        all_files = list(source_dir.rglob("*"))
-        source_files = [
+        # Check if there are any files at all; stop walking at the first match.
+        # The suffix test comes first so only candidates cost an is_file() stat
+        source_files = (
             f
-            for f in all_files
-            if f.is_file() and f.suffix in [".java", ".py", ".js", ".ts"]
-        ]
+            for f in source_dir.rglob("*")
+            if f.suffix in SOURCE_SUFFIXES and f.is_file()
+        )
 
-        if not source_files:
+        if next(source_files, None) is None:
             console.print(f"\n[red]No source files found in {source_dir}[/red]")
             console.print("\n[bold]To get started:[/bold]")
             console.print("  1. Copy your Java files to data/raw/java/")
@@ -120,6 +148,8 @@ def main(
         strategy=strategy,
         system_instruction=system_instruction,
         validation_split=validation_split,
+        workers=workers,
+        parse_cache=None if no_parse_cache else ParseCache(parse_cache),
     )
 
     # Convert
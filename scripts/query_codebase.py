@@ -1,28 +1,244 @@
 #!/usr/bin/env python3
 """Query codebase using RAG."""
 
+from __future__ import annotations
+
+import json
+import os
+import queue
+import re
+import socket
+import socketserver
 import sys
+import threading
+from dataclasses import dataclass
+from functools import lru_cache
+from itertools import groupby
+from operator import attrgetter
 from pathlib import Path
-from typing import Optional
+from types import SimpleNamespace
+from typing import TYPE_CHECKING, Callable, Optional
 
 # Add src to path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 import click
-import yaml
-from rich.console import Console
-from rich.markdown import Markdown
+from rich.console import Console, Group, RenderableType
+from rich.live import Live
 from rich.panel import Panel
 from rich.prompt import Prompt
-from rich.syntax import Syntax
+from rich.segment import Segments
 from rich.table import Table
 
-from src.rag.embedder import VertexEmbedder
-from src.rag.retriever import CodeRetriever, InteractiveRetriever
-from src.rag.vector_store import PgVectorStore
+from src.utils.config_cache import load_config_fast
+from src.utils.query_cache import QueryCache
+
+# src.rag pulls in google-genai, psycopg and numpy; it is imported in main()
+# once the config is valid so --help and config errors stay fast
+if TYPE_CHECKING:
+    from pygments.lexer import Lexer
+    from rich.syntax import Syntax
+
+    from src.rag.chunker import CodeChunk
+    from src.rag.retriever import CodeRetriever, RAGResponse
+    from src.rag.vector_store import ClassSummary, PgVectorStore
 
 console = Console()
 
+# Default location of the persistent embedding cache (shared with indexing)
+DEFAULT_EMBEDDING_CACHE = Path("data/cache/embeddings.sqlite")
+
+# Default location of the persistent --class-lookup answer cache
+DEFAULT_CLASS_LOOKUP_CACHE = Path("data/cache/class_lookups.sqlite")
+
+# Default location of the exported ONNX cross-encoder used by --rerank
+DEFAULT_RERANK_MODEL = Path("models/reranker")
+
+# Characters of chunk content shown per result by display_chunks
+CODE_PREVIEW_CHARS = 500
+
+# Pygments style used for code snippets
+SYNTAX_THEME = "monokai"
+
+# Phrases that make a question about classes a request to list them
+LIST_PHRASES = (
+    "list all",
+    "list the",
+    "show all",
+    "show the",
+    "which are",
+    "what are",
+    "how many",
+    "count",
+)
+
+# Languages recognised in questions, by priority when several are named
+QUERY_LANGUAGES = ("java", "python", "javascript", "typescript")
+
+# Scans a question once for all of the above. List phrases and "class"
+# match anywhere (e.g. "subclasses"); languages only as whole words, so
+# "javascript" is not taken for "java"
+_QUERY_FLAGS_RE = re.compile(
+    "(?P<list>" + "|".join(map(re.escape, LIST_PHRASES)) + ")"
+    "|(?P<cls>class)"
+    r"|\b(?P<language>" + "|".join(QUERY_LANGUAGES) + r")\b",
+    re.IGNORECASE,
+)
+
+# A question that is just an identifier may be a class name to look up
+_CLASS_NAME_RE = re.compile(r"[A-Za-z_][A-Za-z0-9_]{1,63}")
+
+
+@dataclass
+class QueryFlags:
+    """What a question asks about, as detected by detect_query_flags."""
+
+    is_list: bool = False
+    has_class: bool = False
+    language: Optional[str] = None
+
+
+def detect_query_flags(query: str) -> QueryFlags:
+    """Detect list phrases, class keywords and a language in one regex pass."""
+    flags = QueryFlags()
+    languages = set()
+    for match in _QUERY_FLAGS_RE.finditer(query):
+        if match.lastgroup == "list":
+            flags.is_list = True
+        elif match.lastgroup == "cls":
+            flags.has_class = True
+        else:
+            languages.add(match.group().lower())
+    flags.language = next((lang for lang in QUERY_LANGUAGES if lang in languages), None)
+    return flags
+
+
+@dataclass(frozen=True, slots=True)
+class RetrievalPlan:
+    """Retrieval settings for one question, derived once from its wording.
+
+    Class questions search only class chunks with a larger top_k, filtered
+    by the given language or else one named in the question.
+    """
+
+    query: str
+    top_k: int
+    language: Optional[str]
+    chunk_type: Optional[str]
+    with_deps: bool = False
+    is_list: bool = False
+
+    @classmethod
+    def from_user_input(
+        cls,
+        query: str,
+        default_top_k: int,
+        default_language: Optional[str] = None,
+        with_deps: bool = False,
+    ) -> RetrievalPlan:
+        """Build the plan for a question.
+
+        Args:
+            query: User's question
+            default_top_k: top_k requested on the command line
+            default_language: Language filter requested on the command line
+            with_deps: Whether to answer with class dependencies
+
+        Returns:
+            Plan whose is_list is set when the question asks to list classes
+        """
+        flags = detect_query_flags(query)
+        if not flags.has_class:
+            return cls(query, default_top_k, default_language, None, with_deps)
+        return cls(
+            query,
+            _class_query_top_k(default_top_k),
+            default_language or flags.language,
+            "class",
+            with_deps,
+            flags.is_list,
+        )
+
+    def to_kwargs(self) -> dict:
+        """Return the filters passed to CodeRetriever.query."""
+        return {"top_k": self.top_k, "language": self.language, "chunk_type": self.chunk_type}
+
+
+@lru_cache(maxsize=1)
+def _syntax_theme():
+    """Resolve SYNTAX_THEME once instead of per rendered snippet."""
+    from rich.syntax import Syntax
+
+    return Syntax.get_theme(SYNTAX_THEME)
+
+
+@lru_cache(maxsize=16)
+def _lexer_for(language: str) -> Lexer:
+    """Return a cached Pygments lexer, configured as rich configures its own."""
+    from pygments.lexers import TextLexer, get_lexer_by_name
+    from pygments.util import ClassNotFound
+
+    try:
+        return get_lexer_by_name(language, stripnl=False, ensurenl=True, tabsize=4)
+    except ClassNotFound:
+        return TextLexer(stripnl=False, ensurenl=True, tabsize=4)
+
+
+def _preview(text: str, limit: int, marker: str = "...") -> str:
+    """Return text cut to limit characters, with marker appended if it was cut."""
+    return text if len(text) <= limit else text[:limit] + marker
+
+
+def _code_syntax(code: str, language: str, start_line: int) -> Syntax:
+    """Build a line-numbered Syntax renderable for a code snippet."""
+    from rich.syntax import Syntax
+
+    return Syntax(
+        code,
+        _lexer_for(language),
+        theme=_syntax_theme(),
+        line_numbers=True,
+        start_line=start_line,
+    )
+
+
+def _print_group(items: list[RenderableType]) -> None:
+    """Render a list of items as one group.
+
+    Strings are parsed as markup exactly as console.print would, so the
+    output matches printing each item separately. When output is piped,
+    rich lays out and writes everything with one console.print call. On a
+    terminal, a worker thread renders the next items (tokenizing code
+    snippets is the slow part) while the main thread writes finished ones,
+    so output starts after the first item instead of the last.
+    """
+    if not items:
+        return
+    renderables = (
+        console.render_str(item) if isinstance(item, str) else item for item in items
+    )
+    if not console.is_terminal:
+        console.print(Group(*renderables))
+        return
+
+    rendered: queue.Queue = queue.Queue(maxsize=2)
+    options = console.options
+
+    def prerender() -> None:
+        try:
+            for renderable in renderables:
+                rendered.put(Segments(list(console.render(renderable, options))))
+        except Exception as e:
+            rendered.put(e)
+            return
+        rendered.put(None)
+
+    threading.Thread(target=prerender, daemon=True).start()
+    while (segments := rendered.get()) is not None:
+        if isinstance(segments, Exception):
+            raise segments
+        console.print(segments)
+
 
 @click.command()
 @click.option(
@@ -36,8 +252,8 @@ console = Console()
     "--query",
     "-q",
     type=str,
-    default=None,
-    help="Single query to run",
+    multiple=True,
+    help="Query to run (repeat to run several; they are embedded in one API call)",
 )
 @click.option(
     "--interactive",
@@ -70,6 +286,23 @@ console = Console()
     is_flag=True,
     help="Only retrieve chunks, don't generate answer",
 )
+@click.option(
+    "--hybrid",
+    "-H",
+    is_flag=True,
+    help="With --retrieve-only, fuse keyword and semantic search (answers always use it)",
+)
+@click.option(
+    "--rerank",
+    is_flag=True,
+    help="Rerank 4x top-k candidates with a local cross-encoder before answering",
+)
+@click.option(
+    "--rerank-model",
+    type=click.Path(path_type=Path),
+    default=DEFAULT_RERANK_MODEL,
+    help="Directory with the reranker's model.onnx and tokenizer.json",
+)
 @click.option(
     "--model",
     "-m",
@@ -100,19 +333,90 @@ console = Console()
     is_flag=True,
     help="List all indexed Java classes",
 )
+@click.option(
+    "--llm-summary",
+    is_flag=True,
+    help="Have the LLM summarize class listings instead of printing counts per language",
+)
+@click.option(
+    "--ef-search",
+    type=click.IntRange(min=1, max=1000),
+    default=None,
+    help="HNSW candidates per vector search; higher improves recall, lower is faster "
+    "(default: rag.pgvector.ef_search or 40)",
+)
+@click.option(
+    "--exact",
+    is_flag=True,
+    help="Search full-precision vectors only, skipping the binary-quantized first stage "
+    "(used when the index has one)",
+)
+@click.option(
+    "--embedding-cache",
+    type=click.Path(path_type=Path),
+    default=DEFAULT_EMBEDDING_CACHE,
+    help="SQLite file caching query embeddings by text, model and dimensions",
+)
+@click.option(
+    "--no-embedding-cache",
+    is_flag=True,
+    help="Always call Vertex AI to embed queries",
+)
+@click.option(
+    "--cache-size",
+    type=click.IntRange(min=1),
+    default=2000,
+    help="Answers and retrievals kept in memory for repeated queries in this run",
+)
+@click.option(
+    "--cache-ttl",
+    type=click.FloatRange(min=0),
+    default=300,
+    help="Seconds a cached answer stays valid",
+)
+@click.option(
+    "--no-cache",
+    is_flag=True,
+    help="Never reuse answers for repeated queries, nor --class-lookup answers saved by earlier runs",
+)
+@click.option(
+    "--serve",
+    type=click.Path(path_type=Path),
+    default=None,
+    help="Keep the embedder, database and retriever loaded and answer --client queries on this Unix socket",
+)
+@click.option(
+    "--client",
+    type=click.Path(path_type=Path),
+    default=None,
+    help="Send -q queries to a --serve process on this Unix socket instead of starting up",
+)
 def main(
     config: str | None,
-    query: str,
+    query: tuple[str, ...],
     interactive: bool,
     top_k: int,
     language: str,
     show_sources: bool,
     retrieve_only: bool,
+    hybrid: bool,
+    rerank: bool,
+    rerank_model: Path,
     model: str,
     with_deps: bool,
     class_lookup: str,
     template_deps: str,
     list_classes: bool,
+    llm_summary: bool,
+    ef_search: Optional[int],
+    exact: bool,
+    embedding_cache: Path,
+    no_embedding_cache: bool,
+    cache_size: int,
+    cache_ttl: float,
+    no_cache: bool,
+    serve: Optional[Path],
+    client: Optional[Path],
 ):
     """Query your codebase using natural language.
 
@@ -120,6 +424,9 @@ def main(
         # Single query
         python scripts/query_codebase.py -q "Is user authentication implemented?"
 
+        # Several queries in one run
+        python scripts/query_codebase.py -q "database connection" -q "error handling"
+
         # Interactive mode
         python scripts/query_codebase.py -i
 
@@ -137,6 +444,10 @@ def main(
 
         # Find Java classes referenced by a template
         python scripts/query_codebase.py --template-deps "config/user-template.json"
+
+        # Start once, then query without per-run startup cost
+        python scripts/query_codebase.py --serve /tmp/rag.sock
+        python scripts/query_codebase.py --client /tmp/rag.sock -q "error handling"
     """
     console.print(
         Panel.fit(
@@ -145,6 +456,23 @@ def main(
         )
     )
 
+    # Client mode needs no config, credentials or database
+    if client is not None:
+        if not query:
+            console.print("[red]Error: --client needs at least one -q query[/red]")
+            return
+        run_client(
+            socket_path=client,
+            queries=query,
+            top_k=top_k,
+            language=language,
+            show_sources=show_sources,
+            retrieve_only=retrieve_only,
+            hybrid=hybrid,
+            with_deps=with_deps,
+        )
+        return
+
     # Resolve config path
     if config is None:
         # Try default location relative to script directory
@@ -168,8 +496,7 @@ def main(
 
     # Load configuration
     try:
-        with open(config) as f:
-            cfg = yaml.safe_load(f)
+        cfg = load_config_fast(config)
     except Exception as e:
         console.print(f"[red]Error loading configuration file: {e}[/red]")
         return
@@ -187,6 +514,20 @@ def main(
         )
         return
 
+    from src.rag.embed_cache import EmbeddingCache
+    from src.rag.embedder import VertexEmbedder
+    from src.rag.reranker import CrossEncoderReranker
+    from src.rag.retriever import CodeRetriever
+    from src.rag.vector_store import PgVectorStore
+
+    reranker = None
+    if rerank:
+        try:
+            reranker = CrossEncoderReranker(rerank_model)
+        except Exception as e:
+            console.print(f"[red]Could not load reranker from {rerank_model}: {e}[/red]")
+            return
+
     # Initialize components
     try:
         embedder = VertexEmbedder(
@@ -194,6 +535,10 @@ def main(
             location=location,
             model=rag_config.get("embedding_model", "text-embedding-005"),
         )
+        if not no_embedding_cache:
+            embedder.cache = EmbeddingCache(
+                embedding_cache, embedder.model, embedder.dimensions
+            )
 
         store = PgVectorStore(
             host=pgvector_config.get("host", "localhost"),
@@ -202,6 +547,10 @@ def main(
             user=pgvector_config.get("user", "postgres"),
             password=pgvector_config.get("password"),
             embedding_dimensions=embedder.dimensions,
+            ef_search=ef_search or pgvector_config.get("ef_search"),
+            quantized_search=not exact,
+            # Server threads each need their own connection
+            max_connections=8 if serve is not None else 1,
         )
         store.connect()
 
@@ -216,6 +565,17 @@ def main(
             f"[dim]Connected to database with {chunk_count} code chunks[/dim]\n"
         )
 
+        # Re-indexing bumps the index generation, which drops cached answers.
+        # A lone one-off query can never hit the cache, so it gets none
+        query_cache = None
+        one_off = len(query) == 1 and not interactive and serve is None
+        if not no_cache and not one_off:
+            query_cache = QueryCache(
+                max_size=cache_size,
+                ttl_seconds=cache_ttl,
+                generation=store.index_generation,
+            )
+
         llm_model = model or rag_config.get("llm_model", "gemini-2.5-pro")
 
         retriever = CodeRetriever(
@@ -223,6 +583,7 @@ def main(
             store=store,
             llm_model=llm_model,
             system_prompt=rag_config.get("system_prompt"),
+            reranker=reranker,
         )
 
     except Exception as e:
@@ -233,8 +594,18 @@ def main(
         console.print("  3. Run: python scripts/index_codebase.py first")
         return
 
+    # Server mode
+    if serve is not None:
+        run_server(serve, retriever, query_cache)
+        store.close()
+        return
+
     # Class lookup mode
     if class_lookup:
+        if not no_cache:
+            from src.rag.answer_cache import ClassLookupCache
+
+            retriever.lookup_cache = ClassLookupCache(DEFAULT_CLASS_LOOKUP_CACHE)
         run_class_lookup(retriever, class_lookup, show_sources)
         store.close()
         return
@@ -247,27 +618,48 @@ def main(
 
     # Single query mode
     if query and not interactive:
-        run_single_query(
-            retriever=retriever,
-            query=query,
-            top_k=top_k,
-            language=language,
-            show_sources=show_sources,
-            retrieve_only=retrieve_only,
-            with_deps=with_deps,
-            store=store,  # Pass store for list queries
-        )
+        if len(query) > 1 and retrieve_only and not hybrid:
+            # One embedding call and one search for all queries, fetching
+            # enough rows for class queries' larger top_k
+            retriever.prefetch_retrievals(
+                list(query),
+                top_k=_class_query_top_k(top_k),
+                language=language,
+                preview_chars=CODE_PREVIEW_CHARS + 1 if show_sources else 0,
+            )
+        elif len(query) > 1:
+            # One batched embedding call; each query then hits the memo
+            embedder.embed_queries(list(query))
+        for i, single_query in enumerate(query):
+            if i:
+                console.print()
+            run_single_query(
+                retriever=retriever,
+                query=single_query,
+                top_k=top_k,
+                language=language,
+                show_sources=show_sources,
+                retrieve_only=retrieve_only,
+                hybrid=hybrid,
+                with_deps=with_deps,
+                store=store,  # Pass store for list queries
+                query_cache=query_cache,
+                llm_summary=llm_summary,
+            )
         store.close()
         return
 
     # Interactive mode
     if interactive:
+        # Load the HNSW index while the user types the first question
+        threading.Thread(target=store.prewarm_vector_index, daemon=True).start()
         run_interactive_session(
             retriever=retriever,
             store=store,
             top_k=top_k,
             language=language,
             show_sources=show_sources,
+            query_cache=query_cache,
         )
         store.close()
         return
@@ -288,30 +680,103 @@ def run_list_classes(store: PgVectorStore, language: Optional[str] = None):
     if not classes:
         console.print("[yellow]No classes found in the database.[/yellow]")
         return
-    
-    # Group by language
-    by_language = {}
-    for cls in classes:
-        lang = cls.language
-        if lang not in by_language:
-            by_language[lang] = []
-        by_language[lang].append(cls)
-    
+
     console.print(f"\n[bold]Found {len(classes)} indexed classes:[/bold]\n")
-    
-    for lang in sorted(by_language.keys()):
-        lang_classes = by_language[lang]
-        console.print(f"[bold cyan]{lang.upper()} Classes ({len(lang_classes)}):[/bold cyan]")
-        
-        # Sort by class name
-        lang_classes.sort(key=lambda c: c.class_name or c.file_path)
-        
+    _print_classes_by_language(classes)
+
+
+def _print_classes_by_language(classes: list[ClassSummary]) -> None:
+    """Print classes grouped by language.
+
+    Relies on list_classes returning rows sorted by language, then name.
+    """
+    items: list[RenderableType] = []
+    for lang, group in groupby(classes, key=attrgetter("language")):
+        lang_classes = list(group)
+        items.append(f"[bold cyan]{lang.upper()} Classes ({len(lang_classes)}):[/bold cyan]")
         for cls in lang_classes:
             class_name = cls.class_name or Path(cls.file_path).stem
-            location = f"{cls.file_path}:{cls.start_line}-{cls.end_line}"
-            console.print(f"  • {class_name} ({location})")
-        
-        console.print()
+            items.append(f"  • {class_name} ({cls.location})")
+        items.append("")
+    _print_group(items)
+
+
+def _class_counts_markdown(classes: list[ClassSummary]) -> str:
+    """Summarize class counts per language, in list_classes order."""
+    lines = [f"Your codebase contains **{len(classes)}** indexed classes:", ""]
+    for lang, group in groupby(classes, key=attrgetter("language")):
+        count = sum(1 for _ in group)
+        lines.append(f"- **{lang}**: {count} {'class' if count == 1 else 'classes'}")
+    return "\n".join(lines)
+
+
+def _class_query_top_k(top_k: int) -> int:
+    """Return the larger top_k used for queries about classes."""
+    return max(top_k * 3, 20)
+
+
+def _cache_key(method: str, query: str, **params) -> bytes:
+    """Build a QueryCache key from a retriever method, its query and its filters."""
+    return QueryCache.make_key(method, query.strip().lower(), *sorted(params.items()))
+
+
+def _stream_answer(
+    query_fn: Callable[[Callable[[str], None]], RAGResponse],
+    query_cache: Optional[QueryCache] = None,
+    cache_key: Optional[bytes] = None,
+) -> RAGResponse:
+    """Run a retriever query, rendering its answer live as it streams.
+
+    Args:
+        query_fn: Calls the retriever, passing its argument as on_answer_chunk
+        query_cache: If set with cache_key, a cached response is shown
+            instead of calling query_fn, and new responses are stored
+        cache_key: Key of this query in query_cache
+
+    Returns:
+        The retriever's response
+    """
+    from rich.markdown import Markdown
+
+    use_cache = query_cache is not None and cache_key is not None
+    if use_cache:
+        response = query_cache.get(cache_key)
+        if response is not None:
+            console.print(Panel(Markdown(response.answer)))
+            return response
+
+    parts: list[str] = []
+    live = Live(console=console, refresh_per_second=10, vertical_overflow="visible")
+
+    def on_answer_chunk(text: str) -> None:
+        # Start on the first chunk so retrieval output is not overdrawn
+        if not parts:
+            live.start()
+        parts.append(text)
+        live.update(Panel(Markdown("".join(parts))))
+
+    try:
+        response = query_fn(on_answer_chunk)
+    finally:
+        live.stop()
+        # When output is not a terminal, rich prints the final frame
+        # without a trailing newline
+        if parts and not console.is_terminal:
+            console.line()
+
+    if not parts:
+        console.print(Panel(Markdown(response.answer)))
+    if use_cache:
+        query_cache.put(cache_key, response)
+    return response
+
+
+def _bare_class_name(text: str, store: Optional[PgVectorStore]) -> Optional[str]:
+    """Return text as a class name if it is nothing but an indexed class's name."""
+    name = text.strip()
+    if store is None or not _CLASS_NAME_RE.fullmatch(name):
+        return None
+    return name if store.class_exists(name) else None
 
 
 def run_single_query(
@@ -321,254 +786,340 @@ def run_single_query(
     language: str,
     show_sources: bool,
     retrieve_only: bool,
+    hybrid: bool = False,
     with_deps: bool = False,
     store: Optional[PgVectorStore] = None,
+    query_cache: Optional[QueryCache] = None,
+    llm_summary: bool = False,
 ):
     """Run a single query."""
     console.print(f"[bold]Query:[/bold] {query}\n")
 
-    # Check if query is asking to list classes
-    query_lower = query.lower()
-    list_classes_patterns = [
-        "list all",
-        "list the",
-        "show all",
-        "show the",
-        "which are",
-        "what are",
-        "how many",
-        "count",
-    ]
-    class_keywords = ["class", "classes", "java class", "java classes"]
-    
-    is_list_query = any(pattern in query_lower for pattern in list_classes_patterns)
-    has_class_keyword = any(keyword in query_lower for keyword in class_keywords)
-    
+    if not query.strip():
+        console.print("[yellow]Empty query[/yellow]")
+        return
+
+    # A bare indexed class name needs no search: answer it as --class-lookup
+    class_name = _bare_class_name(query, store) if not retrieve_only else None
+    if class_name:
+        run_class_lookup(retriever, class_name, show_sources)
+        return
+
+    plan = RetrievalPlan.from_user_input(query, top_k, language, with_deps)
+
     # If asking to list classes and we have store access, use direct query
-    if is_list_query and has_class_keyword and store:
-        # Extract language if specified
-        detected_language = language
-        if not detected_language:
-            if "java" in query_lower:
-                detected_language = "java"
-            elif "python" in query_lower:
-                detected_language = "python"
-            elif "javascript" in query_lower or "typescript" in query_lower:
-                detected_language = "javascript" if "javascript" in query_lower else "typescript"
-        
-        classes = store.list_classes(language=detected_language)
+    if plan.is_list and store:
+        classes = store.list_classes(language=plan.language)
         
         if classes:
             console.print(f"[bold green]Found {len(classes)} indexed classes:[/bold green]\n")
-            
-            # Group by language
-            by_language = {}
-            for cls in classes:
-                lang = cls.language
-                if lang not in by_language:
-                    by_language[lang] = []
-                by_language[lang].append(cls)
-            
-            for lang in sorted(by_language.keys()):
-                lang_classes = by_language[lang]
-                console.print(f"[bold cyan]{lang.upper()} Classes ({len(lang_classes)}):[/bold cyan]")
-                
-                # Sort by class name
-                lang_classes.sort(key=lambda c: c.class_name or c.file_path)
-                
-                for cls in lang_classes:
-                    class_name = cls.class_name or Path(cls.file_path).stem
-                    location = f"{cls.file_path}:{cls.start_line}-{cls.end_line}"
-                    console.print(f"  • {class_name} ({location})")
-                
-                console.print()
-            
-            # Also generate a natural language answer using RAG
-            # Use a query that will trigger the list detection in the retriever
+            _print_classes_by_language(classes)
+
             console.print("\n[bold]Summary:[/bold]")
+            if not llm_summary:
+                from rich.markdown import Markdown
+
+                console.print(Panel(Markdown(_class_counts_markdown(classes))))
+                return
+
+            # Generate a natural language answer using RAG instead
             # Use "list" and "indexed" keywords to trigger complete list detection
             summary_query = f"List all {len(classes)} classes indexed in the codebase"
-            if with_deps:
-                response = retriever.query_with_dependencies(
-                    summary_query,
-                    top_k=min(20, len(classes))
+            summary_top_k = min(20, len(classes))
+            if plan.with_deps:
+                _stream_answer(
+                    lambda on_answer_chunk: retriever.query_with_dependencies(
+                        summary_query,
+                        top_k=summary_top_k,
+                        on_answer_chunk=on_answer_chunk,
+                    ),
+                    query_cache,
+                    _cache_key("query_with_dependencies", summary_query, top_k=summary_top_k),
                 )
             else:
-                response = retriever.query(
-                    summary_query,
-                    top_k=min(20, len(classes)),
-                    language=detected_language,
-                    chunk_type="class"  # Force class chunk type to trigger list detection
+                _stream_answer(
+                    lambda on_answer_chunk: retriever.query(
+                        summary_query,
+                        top_k=summary_top_k,
+                        language=plan.language,
+                        chunk_type="class",  # Force class chunk type to trigger list detection
+                        on_answer_chunk=on_answer_chunk,
+                        all_classes=classes,
+                    ),
+                    query_cache,
+                    _cache_key(
+                        "query",
+                        summary_query,
+                        top_k=summary_top_k,
+                        language=plan.language,
+                        chunk_type="class",
+                    ),
                 )
-            console.print(Panel(Markdown(response.answer)))
             return
 
-    # Determine chunk_type and adjust top_k for class queries
-    chunk_type = None
-    adjusted_top_k = top_k
-    
-    query_lower = query.lower()
-    if "class" in query_lower or "classes" in query_lower:
-        chunk_type = "class"
-        # Increase top_k for class queries to get more context
-        adjusted_top_k = max(top_k * 3, 20)
-
     if retrieve_only:
         # Just retrieve and display chunks
-        results = retriever.retrieve_only(query, top_k=adjusted_top_k, language=language)
+        # Only a preview is displayed, so let Postgres truncate the content;
+        # one extra character still tells display_chunks it was cut
+        preview_chars = CODE_PREVIEW_CHARS + 1 if show_sources else 0
+        cache_key = _cache_key(
+            "retrieve_only",
+            query,
+            top_k=plan.top_k,
+            language=plan.language,
+            hybrid=hybrid,
+            preview_chars=preview_chars,
+        )
+        results = query_cache.get(cache_key) if query_cache is not None else None
+        if results is None:
+            results = retriever.retrieve_only(
+                query,
+                top_k=plan.top_k,
+                language=plan.language,
+                use_hybrid_search=hybrid,
+                preview_chars=preview_chars,
+            )
+            if query_cache is not None:
+                query_cache.put(cache_key, results)
         display_chunks(results, show_code=show_sources)
     else:
-        # Full RAG: retrieve + generate
-        if with_deps:
-            response = retriever.query_with_dependencies(query, top_k=adjusted_top_k)
+        # Full RAG: retrieve + generate, streaming the answer as it arrives
+        console.print("[bold]Answer:[/bold]")
+        if plan.with_deps:
+            response = _stream_answer(
+                lambda on_answer_chunk: retriever.query_with_dependencies(
+                    query, top_k=plan.top_k, on_answer_chunk=on_answer_chunk
+                ),
+                query_cache,
+                _cache_key("query_with_dependencies", query, top_k=plan.top_k),
+            )
         else:
             # Use chunk_type filter for class queries
-            response = retriever.query(
-                query, 
-                top_k=adjusted_top_k, 
-                language=language,
-                chunk_type=chunk_type
+            response = _stream_answer(
+                lambda on_answer_chunk: retriever.query(
+                    query, **plan.to_kwargs(), on_answer_chunk=on_answer_chunk
+                ),
+                query_cache,
+                _cache_key("query", query, **plan.to_kwargs()),
             )
 
-        console.print("[bold]Answer:[/bold]")
-        console.print(Panel(Markdown(response.answer)))
+        if show_sources:
+            display_response_sources(response)
 
-        if show_sources and response.sources:
-            console.print("\n[bold]Sources:[/bold]")
-            display_chunks(
-                list(zip(response.sources, response.scores)),
-                show_code=True,
-            )
 
-        if show_sources and response.dependencies:
-            console.print("\n[bold]Dependencies:[/bold]")
-            for i, chunk in enumerate(response.dependencies, 1):
-                location = f"{chunk.file_path}:{chunk.start_line}-{chunk.end_line}"
-                name = chunk.class_name or chunk.file_path
-                console.print(f"  [cyan]{i}. {name}[/cyan] [dim]({location})[/dim]")
+def display_response_sources(response: RAGResponse) -> None:
+    """Display an answer's source chunks and dependencies."""
+    if response.sources:
+        console.print("\n[bold]Sources:[/bold]")
+        display_chunks(
+            list(zip(response.sources, response.scores)),
+            show_code=True,
+        )
+
+    if response.dependencies:
+        console.print("\n[bold]Dependencies:[/bold]")
+        for i, chunk in enumerate(response.dependencies, 1):
+            name = chunk.class_name or chunk.file_path
+            console.print(f"  [cyan]{i}. {name}[/cyan] [dim]({chunk.location})[/dim]")
 
 
 def run_class_lookup(retriever: CodeRetriever, class_name: str, show_sources: bool):
     """Look up a class with full dependency context."""
     console.print(f"[bold]Looking up class:[/bold] {class_name}\n")
 
-    response = retriever.query_class_with_context(class_name)
-
     console.print("[bold]Analysis:[/bold]")
-    console.print(Panel(Markdown(response.answer)))
+    response = _stream_answer(
+        lambda on_answer_chunk: retriever.query_class_with_context(
+            class_name, on_answer_chunk=on_answer_chunk
+        )
+    )
 
+    items: list[RenderableType] = []
     if show_sources and response.sources:
-        console.print("\n[bold]Class Code:[/bold]")
+        items.append("\n[bold]Class Code:[/bold]")
         for chunk in response.sources:
-            location = f"{chunk.file_path}:{chunk.start_line}-{chunk.end_line}"
-            console.print(f"[dim]{location}[/dim]")
-            syntax = Syntax(
-                chunk.content[:1000] + ("..." if len(chunk.content) > 1000 else ""),
+            items.append(f"[dim]{chunk.location}[/dim]")
+            syntax = _code_syntax(
+                _preview(chunk.content, 1000),
                 chunk.language,
-                theme="monokai",
-                line_numbers=True,
-                start_line=chunk.start_line,
+                chunk.start_line,
             )
-            console.print(Panel(syntax, border_style="green"))
+            items.append(Panel(syntax, border_style="green"))
 
     if response.dependencies:
-        console.print("\n[bold]Related Code (Dependencies & References):[/bold]")
+        items.append("\n[bold]Related Code (Dependencies & References):[/bold]")
         for i, chunk in enumerate(response.dependencies, 1):
-            location = f"{chunk.file_path}:{chunk.start_line}-{chunk.end_line}"
             name = chunk.class_name or chunk.file_path
             chunk_type = chunk.chunk_type or "code"
-            console.print(f"\n[cyan]{i}. {name}[/cyan] ({chunk_type})")
-            console.print(f"   [dim]{location}[/dim]")
+            items.append(f"\n[cyan]{i}. {name}[/cyan] ({chunk_type})")
+            items.append(f"   [dim]{chunk.location}[/dim]")
 
             if show_sources:
-                preview = chunk.content[:500] + (
-                    "..." if len(chunk.content) > 500 else ""
-                )
-                syntax = Syntax(
-                    preview,
+                syntax = _code_syntax(
+                    _preview(chunk.content, 500),
                     chunk.language,
-                    theme="monokai",
-                    line_numbers=True,
-                    start_line=chunk.start_line,
+                    chunk.start_line,
                 )
-                console.print(Panel(syntax, border_style="dim"))
+                items.append(Panel(syntax, border_style="dim"))
+    _print_group(items)
 
 
 def run_template_deps(retriever: CodeRetriever, template_path: str, show_sources: bool):
     """Find Java dependencies for a template."""
     console.print(f"[bold]Finding dependencies for template:[/bold] {template_path}\n")
 
-    response = retriever.find_template_dependencies(template_path)
-
     console.print("[bold]Analysis:[/bold]")
-    console.print(Panel(Markdown(response.answer)))
+    response = _stream_answer(
+        lambda on_answer_chunk: retriever.find_template_dependencies(
+            template_path, on_answer_chunk=on_answer_chunk
+        )
+    )
 
+    items: list[RenderableType] = []
     if show_sources and response.sources:
-        console.print("\n[bold]Template:[/bold]")
+        items.append("\n[bold]Template:[/bold]")
         for chunk in response.sources:
-            location = f"{chunk.file_path}:{chunk.start_line}-{chunk.end_line}"
-            console.print(f"[dim]{location}[/dim]")
+            items.append(f"[dim]{chunk.location}[/dim]")
             if chunk.references:
-                console.print(
+                items.append(
                     f"[yellow]References: {', '.join(chunk.references)}[/yellow]"
                 )
-            syntax = Syntax(
-                chunk.content[:1500] + ("..." if len(chunk.content) > 1500 else ""),
+            syntax = _code_syntax(
+                _preview(chunk.content, 1500),
                 chunk.language,
-                theme="monokai",
-                line_numbers=True,
-                start_line=chunk.start_line,
+                chunk.start_line,
             )
-            console.print(Panel(syntax, border_style="blue"))
+            items.append(Panel(syntax, border_style="blue"))
 
     if response.dependencies:
-        console.print("\n[bold]Java Class Dependencies:[/bold]")
+        items.append("\n[bold]Java Class Dependencies:[/bold]")
         for i, chunk in enumerate(response.dependencies, 1):
-            location = f"{chunk.file_path}:{chunk.start_line}-{chunk.end_line}"
-            console.print(f"\n[cyan]{i}. {chunk.class_name}[/cyan]")
-            console.print(f"   [dim]{location}[/dim]")
+            items.append(f"\n[cyan]{i}. {chunk.class_name}[/cyan]")
+            items.append(f"   [dim]{chunk.location}[/dim]")
 
             if show_sources:
-                preview = chunk.content[:500] + (
-                    "..." if len(chunk.content) > 500 else ""
-                )
-                syntax = Syntax(
-                    preview,
+                syntax = _code_syntax(
+                    _preview(chunk.content, 500),
                     chunk.language,
-                    theme="monokai",
-                    line_numbers=True,
-                    start_line=chunk.start_line,
+                    chunk.start_line,
                 )
-                console.print(Panel(syntax, border_style="green"))
+                items.append(Panel(syntax, border_style="green"))
+    _print_group(items)
 
 
 def display_chunks(results: list, show_code: bool = True):
     """Display retrieved code chunks."""
+    items: list[RenderableType] = []
     for i, (chunk, score) in enumerate(results, 1):
-        location = f"{chunk.file_path}:{chunk.start_line}-{chunk.end_line}"
         name = chunk.method_name or chunk.class_name or chunk.file_path
 
-        console.print(f"\n[cyan]{i}. {name}[/cyan]")
-        console.print(f"   [dim]{location} (score: {score:.3f})[/dim]")
+        items.append(f"\n[cyan]{i}. {name}[/cyan]")
+        items.append(f"   [dim]{chunk.location} (score: {score:.3f})[/dim]")
 
         if chunk.documentation:
             doc_preview = chunk.documentation[:150].replace("\n", " ")
-            console.print(f"   [italic]{doc_preview}...[/italic]")
+            items.append(f"   [italic]{doc_preview}...[/italic]")
 
         if show_code:
             # Show code with syntax highlighting
-            code_preview = chunk.content
-            if len(code_preview) > 500:
-                code_preview = code_preview[:500] + "\n// ... truncated"
-
-            syntax = Syntax(
-                code_preview,
+            syntax = _code_syntax(
+                _preview(chunk.content, CODE_PREVIEW_CHARS, "\n// ... truncated"),
                 chunk.language,
-                theme="monokai",
-                line_numbers=True,
-                start_line=chunk.start_line,
+                chunk.start_line,
             )
-            console.print(Panel(syntax, border_style="dim"))
+            items.append(Panel(syntax, border_style="dim"))
+    _print_group(items)
+
+
+class _TypingPrefetcher:
+    """Embed the question being typed whenever typing pauses.
+
+    By the time Enter is pressed the final text has usually been embedded,
+    so the turn's retrieval finds its vector in the embedder's memo. Each
+    prefetch is a billed API call, so very short texts and repeats of the
+    last prefetched text are skipped.
+    """
+
+    IDLE_SECONDS = 0.3
+
+    # Shorter texts are unlikely to be the final question
+    MIN_PREFETCH_CHARS = 12
+
+    def __init__(
+        self,
+        embed: Callable[[str], object],
+        text_to_embed: Callable[[str], Optional[str]],
+    ):
+        """Initialize the prefetcher.
+
+        Args:
+            embed: Embeds a text for a later lookup without persisting it
+                (e.g. embedder.prefetch_text)
+            text_to_embed: Maps the typed text to the text the turn will
+                embed, or None if it will not embed anything
+        """
+        self.embed = embed
+        self.text_to_embed = text_to_embed
+        self._timer: Optional[threading.Timer] = None
+        self._last_target: Optional[str] = None
+
+    def on_text_changed(self, buffer) -> None:
+        """Restart the idle timer with the prompt buffer's current text."""
+        if self._timer is not None:
+            self._timer.cancel()
+        self._timer = threading.Timer(self.IDLE_SECONDS, self._prefetch, (buffer.text,))
+        self._timer.daemon = True
+        self._timer.start()
+
+    def _prefetch(self, text: str) -> None:
+        target = self.text_to_embed(text)
+        if not target or len(target) < self.MIN_PREFETCH_CHARS:
+            return
+        if target == self._last_target:
+            return
+        self._last_target = target
+        try:
+            self.embed(target)
+        except Exception:
+            # Best effort; the turn embeds the text again and reports errors
+            pass
+
+    def settle(self) -> None:
+        """Drop a pending prefetch, or wait for the one already embedding.
+
+        The latest timer always holds the submitted text, so waiting for it
+        lets the turn reuse its vector instead of requesting it twice.
+        """
+        timer, self._timer = self._timer, None
+        if timer is not None:
+            timer.cancel()
+            timer.join()
+
+
+def _question_reader(prefetcher: _TypingPrefetcher) -> Callable[[], str]:
+    """Return a function that reads one interactive question.
+
+    With prompt_toolkit installed and a terminal attached, questions are
+    embedded while being typed; otherwise this is a plain rich prompt.
+    """
+    try:
+        from prompt_toolkit import PromptSession
+        from prompt_toolkit.formatted_text import HTML
+    except ImportError:
+        PromptSession = None
+    if PromptSession is None or not sys.stdin.isatty():
+        return lambda: Prompt.ask("[bold cyan]You[/bold cyan]")
+
+    session = PromptSession()
+    session.default_buffer.on_text_changed += prefetcher.on_text_changed
+
+    def read() -> str:
+        try:
+            return session.prompt(HTML("<ansicyan><b>You</b></ansicyan>: "))
+        finally:
+            prefetcher.settle()
+
+    return read
 
 
 def run_interactive_session(
@@ -577,20 +1128,45 @@ def run_interactive_session(
     top_k: int,
     language: str,
     show_sources: bool,
+    query_cache: Optional[QueryCache] = None,
 ):
-    """Run interactive query session."""
+    """Run interactive query session.
+
+    Class queries go straight to the retriever and are cached; other turns
+    depend on the conversation history and always run.
+    """
     console.print("[bold green]Interactive Session Started[/bold green]")
     console.print(
         "[dim]Commands: 'exit' to quit, 'clear' to reset, 'sources' to toggle source display[/dim]"
     )
     console.print()
 
+    from src.rag.retriever import InteractiveRetriever
+
     interactive = InteractiveRetriever(retriever)
     show_src = show_sources
 
+    def text_to_embed(text: str) -> Optional[str]:
+        # Mirrors the turn below: commands embed nothing, class questions
+        # embed the text as typed, others the history-enhanced question.
+        # A lone identifier is likely a bare class name, which goes to
+        # run_class_lookup() and embeds nothing; not worth a class_exists()
+        # query per pause to tell
+        if not text.strip() or text.lower() in ("exit", "quit", "clear", "sources"):
+            return None
+        if _CLASS_NAME_RE.fullmatch(text.strip()):
+            return None
+        if RetrievalPlan.from_user_input(text, top_k, language).chunk_type:
+            return text
+        return interactive.enhance_question(text)
+
+    read_question = _question_reader(
+        _TypingPrefetcher(retriever.embedder.prefetch_text, text_to_embed)
+    )
+
     while True:
         try:
-            user_input = Prompt.ask("[bold cyan]You[/bold cyan]")
+            user_input = read_question()
         except (KeyboardInterrupt, EOFError):
             console.print("\n[yellow]Session ended[/yellow]")
             break
@@ -604,30 +1180,6 @@ def run_interactive_session(
             console.print("[dim]Conversation cleared[/dim]")
             continue
         
-        # Detect if query is about classes and adjust retrieval
-        query_lower = user_input.lower()
-        class_keywords = ["class", "classes"]
-        is_class_query = any(keyword in query_lower for keyword in class_keywords)
-        
-        chunk_type = None
-        adjusted_top_k = top_k
-        detected_language = language
-        
-        if is_class_query:
-            chunk_type = "class"
-            adjusted_top_k = max(top_k * 3, 20)  # Get more classes
-            
-            # Extract language from query if not specified
-            if not detected_language:
-                if "java" in query_lower:
-                    detected_language = "java"
-                elif "python" in query_lower:
-                    detected_language = "python"
-                elif "javascript" in query_lower:
-                    detected_language = "javascript"
-                elif "typescript" in query_lower:
-                    detected_language = "typescript"
-
         if user_input.lower() == "sources":
             show_src = not show_src
             console.print(f"[dim]Source display: {'on' if show_src else 'off'}[/dim]")
@@ -636,31 +1188,262 @@ def run_interactive_session(
         if not user_input.strip():
             continue
 
+        console.print()
+
+        class_name = _bare_class_name(user_input, store)
+        if class_name:
+            run_class_lookup(retriever, class_name, show_src)
+            console.print()
+            continue
+
+        console.print("[bold green]Assistant:[/bold green]")
+
         # Query with appropriate filters for class queries
-        if is_class_query:
-            response = retriever.query(
-                user_input, 
-                top_k=adjusted_top_k, 
-                language=detected_language,
-                chunk_type=chunk_type
+        plan = RetrievalPlan.from_user_input(user_input, top_k, language)
+        if plan.chunk_type:
+            response = _stream_answer(
+                lambda on_answer_chunk: retriever.query(
+                    user_input, **plan.to_kwargs(), on_answer_chunk=on_answer_chunk
+                ),
+                query_cache,
+                _cache_key("query", user_input, **plan.to_kwargs()),
             )
         else:
-            response = interactive.query(user_input, top_k=top_k)
-
-        console.print()
-        console.print("[bold green]Assistant:[/bold green]")
-        console.print(Panel(Markdown(response.answer)))
+            response = _stream_answer(
+                lambda on_answer_chunk: interactive.query(
+                    user_input, top_k=top_k, on_answer_chunk=on_answer_chunk
+                )
+            )
 
         if show_src and response.sources:
             console.print("\n[dim]Sources:[/dim]")
             for i, (chunk, score) in enumerate(
                 zip(response.sources[:3], response.scores[:3]), 1
             ):
-                location = f"{chunk.file_path}:{chunk.start_line}"
-                console.print(f"  [dim]{i}. {location} (score: {score:.3f})[/dim]")
+                console.print(f"  [dim]{i}. {chunk.location} (score: {score:.3f})[/dim]")
 
         console.print()
 
 
+def _answer_request(
+    retriever: CodeRetriever,
+    request: dict,
+    on_answer_chunk: Callable[[str], None],
+    query_cache: Optional[QueryCache] = None,
+) -> dict:
+    """Answer one --client request as run_single_query would, returning JSON data.
+
+    Args:
+        retriever: Loaded retriever
+        request: Decoded request (query, top_k, language, retrieve_only,
+            hybrid, with_deps, preview_chars)
+        on_answer_chunk: Receives answer text chunks as they stream
+        query_cache: Optional cache shared by all requests
+
+    Returns:
+        Result message with answer (None for retrieve_only), sources,
+        scores and dependencies
+    """
+    query = request["query"]
+    plan = RetrievalPlan.from_user_input(
+        query,
+        int(request.get("top_k", 5)),
+        request.get("language"),
+        bool(request.get("with_deps")),
+    )
+
+    if request.get("retrieve_only"):
+        hybrid = bool(request.get("hybrid"))
+        preview_chars = request.get("preview_chars")
+        cache_key = _cache_key(
+            "retrieve_only",
+            query,
+            top_k=plan.top_k,
+            language=plan.language,
+            hybrid=hybrid,
+            preview_chars=preview_chars,
+        )
+        results = query_cache.get(cache_key) if query_cache is not None else None
+        if results is None:
+            results = retriever.retrieve_only(
+                query,
+                top_k=plan.top_k,
+                language=plan.language,
+                use_hybrid_search=hybrid,
+                preview_chars=preview_chars,
+            )
+            if query_cache is not None:
+                query_cache.put(cache_key, results)
+        return {
+            "type": "result",
+            "answer": None,
+            "sources": [chunk.to_dict() for chunk, _ in results],
+            "scores": [float(score) for _, score in results],
+            "dependencies": [],
+        }
+
+    if plan.with_deps:
+        cache_key = _cache_key("query_with_dependencies", query, top_k=plan.top_k)
+    else:
+        cache_key = _cache_key("query", query, **plan.to_kwargs())
+    response = query_cache.get(cache_key) if query_cache is not None else None
+    if response is None:
+        if plan.with_deps:
+            response = retriever.query_with_dependencies(
+                query, top_k=plan.top_k, on_answer_chunk=on_answer_chunk
+            )
+        else:
+            response = retriever.query(
+                query, **plan.to_kwargs(), on_answer_chunk=on_answer_chunk
+            )
+        if query_cache is not None:
+            query_cache.put(cache_key, response)
+
+    return {
+        "type": "result",
+        "answer": response.answer,
+        "sources": [chunk.to_dict() for chunk in response.sources],
+        "scores": [float(score) for score in response.scores],
+        "dependencies": [chunk.to_dict() for chunk in response.dependencies],
+    }
+
+
+def run_server(
+    socket_path: Path,
+    retriever: CodeRetriever,
+    query_cache: Optional[QueryCache] = None,
+) -> None:
+    """Serve --client queries on a Unix socket until interrupted.
+
+    Each connection carries one request as a JSON line. The reply is zero
+    or more {"type": "chunk", "text": ...} lines while the answer streams,
+    then one {"type": "result", ...} or {"type": "error", "message": ...}
+    line.
+    """
+
+    class QueryHandler(socketserver.StreamRequestHandler):
+        def handle(self) -> None:
+            def send(message: dict) -> None:
+                self.wfile.write(json.dumps(message).encode() + b"\n")
+                self.wfile.flush()
+
+            try:
+                line = self.rfile.readline()
+                # Empty when a starting server probes whether this one is alive
+                if not line:
+                    return
+                send(
+                    _answer_request(
+                        retriever,
+                        json.loads(line),
+                        lambda text: send({"type": "chunk", "text": text}),
+                        query_cache,
+                    )
+                )
+            except OSError:
+                pass  # Client went away
+            except Exception as e:
+                send({"type": "error", "message": str(e)})
+
+    # A socket left behind by a killed server would make bind() fail
+    if socket_path.is_socket():
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as probe:
+            if probe.connect_ex(str(socket_path)) == 0:
+                console.print(f"[red]Error: a server is already running on {socket_path}[/red]")
+                return
+        socket_path.unlink()
+
+    server = socketserver.ThreadingUnixStreamServer(str(socket_path), QueryHandler)
+    server.daemon_threads = True
+    console.print(f"[green]Serving queries on {socket_path}[/green] [dim](Ctrl+C to stop)[/dim]")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        console.print("\n[yellow]Server stopped[/yellow]")
+    finally:
+        server.server_close()
+        if socket_path.is_socket():
+            os.unlink(socket_path)
+
+
+def _chunk_from_dict(data: dict) -> CodeChunk:
+    """Rebuild a chunk from CodeChunk.to_dict() output sent by a --serve process."""
+    from src.rag.chunker import CodeChunk
+
+    return CodeChunk.from_dict(data)
+
+
+def run_client(
+    socket_path: Path,
+    queries: tuple[str, ...],
+    top_k: int,
+    language: Optional[str],
+    show_sources: bool,
+    retrieve_only: bool,
+    hybrid: bool,
+    with_deps: bool,
+) -> None:
+    """Send queries to a --serve process and render its replies."""
+    for i, query in enumerate(queries):
+        if i:
+            console.print()
+        console.print(f"[bold]Query:[/bold] {query}\n")
+
+        request = {
+            "query": query,
+            "top_k": top_k,
+            "language": language,
+            "retrieve_only": retrieve_only,
+            "hybrid": hybrid,
+            "with_deps": with_deps,
+            "preview_chars": CODE_PREVIEW_CHARS + 1 if show_sources else 0,
+        }
+        try:
+            sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            sock.connect(str(socket_path))
+        except OSError as e:
+            console.print(f"[red]Could not connect to server at {socket_path}: {e}[/red]")
+            console.print(f"Start one with: python scripts/query_codebase.py --serve {socket_path}")
+            return
+
+        with sock, sock.makefile("rwb") as stream:
+            stream.write(json.dumps(request).encode() + b"\n")
+            stream.flush()
+
+            def receive(on_answer_chunk: Callable[[str], None]) -> SimpleNamespace:
+                for line in stream:
+                    message = json.loads(line)
+                    if message["type"] == "chunk":
+                        on_answer_chunk(message["text"])
+                    elif message["type"] == "error":
+                        raise RuntimeError(message["message"])
+                    else:
+                        return SimpleNamespace(
+                            answer=message["answer"],
+                            sources=[_chunk_from_dict(c) for c in message["sources"]],
+                            scores=message["scores"],
+                            dependencies=[_chunk_from_dict(c) for c in message["dependencies"]],
+                        )
+                raise RuntimeError("server closed the connection without a result")
+
+            try:
+                if retrieve_only:
+                    response = receive(lambda text: None)
+                    display_chunks(
+                        list(zip(response.sources, response.scores)),
+                        show_code=show_sources,
+                    )
+                    continue
+
+                console.print("[bold]Answer:[/bold]")
+                response = _stream_answer(receive)
+            except RuntimeError as e:
+                console.print(f"[red]Server error: {e}[/red]")
+                continue
+
+        if show_sources:
+            display_response_sources(response)
+
+
 if __name__ == "__main__":
     main()
@@ -8,18 +8,12 @@ from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 import click
-import yaml
 from rich.console import Console
 from rich.panel import Panel
 from rich.prompt import Confirm
 
-from src.training.monitor import monitor_tuning_job
-from src.training.start_tuning import list_tuning_jobs, start_fine_tuning_job
-from src.training.upload_data import (
-    count_examples,
-    estimate_tokens,
-    upload_training_data,
-)
+from src.training.upload_data import count_examples, estimate_tokens
+from src.utils.config_cache import load_config_fast
 
 console = Console()
 
@@ -82,8 +76,7 @@ def main(
     )
 
     # Load configuration
-    with open(config) as f:
-        cfg = yaml.safe_load(f)
+    cfg = load_config_fast(config)
 
     gcp_config = cfg.get("gcp", {})
     training_config = cfg.get("training", {})
@@ -148,6 +141,12 @@ def main(
         console.print("\n[yellow]DRY RUN - No actions taken[/yellow]")
         return
 
+    # The Vertex AI and Cloud Storage SDKs are slow to import; --help,
+    # config errors and --dry-run finish without them
+    from src.training.monitor import monitor_tuning_job
+    from src.training.start_tuning import start_fine_tuning_job
+    from src.training.upload_data import upload_training_data
+
     console.print()
 
     # Upload data
@@ -8,13 +8,13 @@ from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 import click
-import yaml
-from google import genai
 from rich.console import Console
 from rich.markdown import Markdown
 from rich.panel import Panel
 from rich.prompt import Prompt
 
+from src.utils.config_cache import load_config_fast
+
 console = Console()
 
 
@@ -85,8 +85,7 @@ def main(
     )
 
     # Load configuration
-    with open(config) as f:
-        cfg = yaml.safe_load(f)
+    cfg = load_config_fast(config)
 
     gcp_config = cfg.get("gcp", {})
     project_id = gcp_config.get("project_id")
@@ -98,13 +97,6 @@ def main(
         )
         return
 
-    # Initialize client
-    client = genai.Client(
-        vertexai=True,
-        project=project_id,
-        location=location,
-    )
-
     # Get model name
     if not model:
         console.print(
@@ -117,6 +109,17 @@ def main(
         )
         return
 
+    # google-genai takes a noticeable time to import; only load it once
+    # the config and model are known to be usable
+    from google import genai
+
+    # Initialize client
+    client = genai.Client(
+        vertexai=True,
+        project=project_id,
+        location=location,
+    )
+
     console.print(f"\n[bold]Model:[/bold] {model}")
 
     # Get system instruction from config
@@ -1,19 +1,44 @@
 """Convert source code to JSONL training format for Vertex AI fine-tuning."""
 
-import json
-import random
-from dataclasses import asdict
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import ExitStack
+from itertools import islice
 from pathlib import Path
-from typing import Optional
+from typing import Iterable, Optional
+
+import numpy as np
+import orjson
 
 from ..extractors.generic_extractor import CodeBlock, GenericExtractor
 from ..extractors.java_extractor import JavaClass, JavaExtractor
+from ..utils.parse_cache import ParseCache
 from .strategies.code_explanation import CodeExplanationStrategy
 from .strategies.code_generation import CodeGenerationStrategy
 from .strategies.code_review import CodeReviewStrategy
 from .strategies.template_generation import TemplateGenerationStrategy
 
 
+# Per-process converter used by worker processes (set by _init_convert_worker)
+_worker_converter: Optional["CodeToJSONLConverter"] = None
+
+
+def _init_convert_worker(
+    strategy: str, system_instruction: Optional[str], parse_cache: Optional[Path]
+) -> None:
+    """Build the converter a worker process uses for every file."""
+    global _worker_converter
+    _worker_converter = CodeToJSONLConverter(
+        strategy=strategy,
+        system_instruction=system_instruction,
+        parse_cache=ParseCache(parse_cache) if parse_cache is not None else None,
+    )
+
+
+def _convert_java_file_lines(java_file: Path) -> tuple[int, list[bytes]]:
+    """Convert one Java file to serialized JSONL lines in a worker process."""
+    return _worker_converter._java_file_lines(java_file)
+
+
 class CodeToJSONLConverter:
     """Convert extracted code into JSONL format for Vertex AI fine-tuning."""
 
@@ -24,12 +49,17 @@ class CodeToJSONLConverter:
         "template_generation": TemplateGenerationStrategy,
     }
 
+    # Serialized lines joined into each write in _write_lines()
+    WRITE_BATCH_SIZE = 1024
+
     def __init__(
         self,
         strategy: str = "code_explanation",
         system_instruction: Optional[str] = None,
         validation_split: float = 0.1,
         max_validation: int = 500,
+        workers: int = 1,
+        parse_cache: Optional[ParseCache] = None,
     ):
         """Initialize the converter.
 
@@ -38,6 +68,8 @@ class CodeToJSONLConverter:
             system_instruction: Custom system instruction (optional)
             validation_split: Fraction of data for validation (0.0-1.0)
             max_validation: Maximum validation examples
+            workers: Processes used to convert Java files (1 converts inline)
+            parse_cache: Optional persistent cache; unchanged files skip parsing
         """
         if strategy not in self.STRATEGIES:
             raise ValueError(
@@ -46,8 +78,12 @@ class CodeToJSONLConverter:
 
         strategy_class = self.STRATEGIES[strategy]
         self.strategy = strategy_class(system_instruction=system_instruction)
+        self.strategy_name = strategy
+        self.system_instruction = system_instruction
         self.validation_split = validation_split
         self.max_validation = max_validation
+        self.workers = max(1, workers)
+        self.parse_cache = parse_cache
 
         # Extractors
         self.java_extractor = JavaExtractor()
@@ -73,42 +109,100 @@ class CodeToJSONLConverter:
         """
         output_dir.mkdir(parents=True, exist_ok=True)
 
-        # Extract all classes
-        java_classes = self.java_extractor.extract_directory(source_dir / "java")
-        other_code = self.generic_extractor.extract_directory(source_dir)
-
-        # Generate training examples
-        all_examples = []
+        # Each Java file is extracted and turned into serialized examples
+        # independently, so files are spread across worker processes and
+        # only finished JSONL lines come back to be shuffled and written
+        java_files = list((source_dir / "java").glob("**/*.java"))
 
-        for java_class in java_classes:
-            examples = self.strategy.generate_class_examples(java_class)
-            all_examples.extend(examples)
+        total_classes = 0
+        all_lines: list[bytes] = []
+        with ExitStack() as stack:
+            if self.workers > 1 and len(java_files) > 1:
+                executor = stack.enter_context(
+                    ProcessPoolExecutor(
+                        max_workers=self.workers,
+                        initializer=_init_convert_worker,
+                        initargs=(
+                            self.strategy_name,
+                            self.system_instruction,
+                            self.parse_cache.path if self.parse_cache else None,
+                        ),
+                    )
+                )
+                results = executor.map(
+                    _convert_java_file_lines, java_files, chunksize=8
+                )
+            else:
+                results = map(self._java_file_lines, java_files)
 
-        # Shuffle for randomness
-        random.shuffle(all_examples)
+            # Consume per-file results as they arrive so they are not held
+            # alongside the combined list
+            for n_classes, lines in results:
+                total_classes += n_classes
+                all_lines.extend(lines)
 
         # Split into train/validation
         n_validation = min(
-            int(len(all_examples) * self.validation_split),
+            int(len(all_lines) * self.validation_split),
             self.max_validation,
         )
-        n_training = len(all_examples) - n_validation
+        n_training = len(all_lines) - n_validation
 
-        training_examples = all_examples[:n_training]
-        validation_examples = all_examples[n_training:]
+        # Shuffle for randomness: permute an index array in C rather than
+        # swapping list items one by one in the interpreter
+        order = np.random.default_rng().permutation(len(all_lines)).tolist()
 
         # Write JSONL files
-        self._write_jsonl(training_examples, output_dir / train_file)
-        self._write_jsonl(validation_examples, output_dir / validation_file)
+        self._write_lines(
+            (all_lines[i] for i in order[:n_training]), output_dir / train_file
+        )
+        self._write_lines(
+            (all_lines[i] for i in order[n_training:]), output_dir / validation_file
+        )
 
         return {
-            "total_classes": len(java_classes),
-            "total_examples": len(all_examples),
-            "training_examples": len(training_examples),
-            "validation_examples": len(validation_examples),
+            "total_classes": total_classes,
+            "total_examples": len(all_lines),
+            "training_examples": n_training,
+            "validation_examples": n_validation,
             "strategy": type(self.strategy).__name__,
         }
 
+    def _java_file_lines(self, java_file: Path) -> tuple[int, list[bytes]]:
+        """Extract a Java file and serialize its training examples.
+
+        Returns:
+            Tuple of (number of classes extracted, JSONL lines)
+        """
+        java_classes = self._extract_java_file(java_file)
+        lines = [
+            orjson.dumps(self._to_vertex_format(example), option=orjson.OPT_APPEND_NEWLINE)
+            for java_class in java_classes
+            for example in self.strategy.generate_class_examples(java_class)
+        ]
+        return len(java_classes), lines
+
+    def _extract_java_file(self, java_file: Path) -> list[JavaClass]:
+        """Extract a Java file, reusing the parse cache when the file is unchanged."""
+        if self.parse_cache is None:
+            return self.java_extractor.extract_file(java_file)
+
+        # Same settings string as CodeChunker, so indexing and training
+        # data preparation share cache entries
+        settings = (
+            f"java:{self.java_extractor.include_comments}:{self.java_extractor.max_lines}"
+        )
+        key = self.parse_cache.key(java_file, settings)
+        if key is not None:
+            cached = self.parse_cache.get(key)
+            if cached is not None:
+                return cached
+
+        java_classes = self.java_extractor.extract_file(java_file)
+        if key is not None:
+            self.parse_cache.put_many([(key, java_classes)])
+        return java_classes
+
     def convert_file(self, source_file: Path) -> list[dict]:
         """Convert a single source file to training examples.
 
@@ -119,7 +213,7 @@ class CodeToJSONLConverter:
             List of training examples in JSONL format
         """
         if source_file.suffix == ".java":
-            classes = self.java_extractor.extract_file(source_file)
+            classes = self._extract_java_file(source_file)
             examples = []
             for java_class in classes:
                 class_examples = self.strategy.generate_class_examples(java_class)
@@ -157,12 +251,18 @@ class CodeToJSONLConverter:
             ],
         }
 
-    def _write_jsonl(self, examples: list, output_file: Path) -> None:
-        """Write examples to a JSONL file."""
-        with open(output_file, "w", encoding="utf-8") as f:
-            for example in examples:
-                vertex_format = self._to_vertex_format(example)
-                f.write(json.dumps(vertex_format, ensure_ascii=False) + "\n")
+    def _write_lines(self, lines: Iterable[bytes], output_file: Path) -> None:
+        """Write serialized JSONL lines to a file.
+
+        Lines are orjson output (UTF-8 bytes with a trailing newline), so
+        they go straight to a large-buffered binary file without a
+        text-layer encode per line. Batches of lines are joined into one
+        write, which is about twice as fast as a write per line.
+        """
+        lines = iter(lines)
+        with open(output_file, "wb", buffering=1 << 20) as f:
+            while batch := list(islice(lines, self.WRITE_BATCH_SIZE)):
+                f.write(b"".join(batch))
 
 
 def convert_java_to_training_data(
@@ -1,19 +1,43 @@
 """RAG (Retrieval-Augmented Generation) pipeline for codebase queries."""
 
-from .chunker import CodeChunk, CodeChunker
-from .embedder import VertexEmbedder
-from .query_analyzer import QueryAnalysis, QueryIntent, analyze_query
-from .retriever import CodeRetriever, RAGResponse
-from .vector_store import PgVectorStore
+import importlib
+
+# Submodules pull in google-genai, psycopg and numpy, so exports are imported
+# on first access; importing src.rag.chunker alone stays cheap
+_EXPORTS = {
+    "ClassLookupCache": ".answer_cache",
+    "CodeChunk": ".chunker",
+    "CodeChunker": ".chunker",
+    "EmbeddingCache": ".embed_cache",
+    "VertexEmbedder": ".embedder",
+    "PgVectorStore": ".vector_store",
+    "ClassSummary": ".vector_store",
+    "CodeRetriever": ".retriever",
+    "CrossEncoderReranker": ".reranker",
+    "RAGResponse": ".retriever",
+    "QueryAnalysis": ".query_analyzer",
+    "QueryIntent": ".query_analyzer",
+    "analyze_query": ".query_analyzer",
+}
 
 __all__ = [
+    "ClassLookupCache",
     "CodeChunk",
     "CodeChunker",
+    "EmbeddingCache",
     "VertexEmbedder",
     "PgVectorStore",
+    "ClassSummary",
     "CodeRetriever",
+    "CrossEncoderReranker",
     "RAGResponse",
     "QueryAnalysis",
     "QueryIntent",
     "analyze_query",
 ]
+
+
+def __getattr__(name: str):
+    if name in _EXPORTS:
+        return getattr(importlib.import_module(_EXPORTS[name], __name__), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
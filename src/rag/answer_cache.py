@@ -0,0 +1,81 @@
+"""Persistent cache of class lookup answers."""
+
+import hashlib
+import json
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Optional
+
+
+class ClassLookupCache:
+    """SQLite-backed cache of CodeRetriever.query_class_with_context() answers.
+
+    Each entry stores the response as JSON together with the
+    PgVectorStore.index_generation() it was built at. The retriever only
+    reuses an entry while the generation is unchanged, so any write to the
+    index (the class, its dependencies, a newly added template that
+    references it, moved line numbers) invalidates it.
+    """
+
+    def __init__(self, path: Path):
+        """Open (or create) the cache database.
+
+        Args:
+            path: SQLite database file
+        """
+        self.path = Path(path)
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS class_lookups ("
+                "hash BLOB PRIMARY KEY, generation TEXT NOT NULL, response TEXT NOT NULL)"
+            )
+            self._conn.commit()
+
+    @staticmethod
+    def key(*parts: object) -> bytes:
+        """Return the cache key for a lookup (class name, model, prompt...)."""
+        return hashlib.sha256(repr(parts).encode()).digest()
+
+    def get(self, key: bytes) -> Optional[tuple[str, dict]]:
+        """Look up a cached response.
+
+        Args:
+            key: Cache key from key()
+
+        Returns:
+            Tuple of (index generation, response data), or None if not cached
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT generation, response FROM class_lookups WHERE hash = ?", (key,)
+            ).fetchone()
+        if row is None:
+            return None
+        return row[0], json.loads(row[1])
+
+    def put(self, key: bytes, generation: str, response: dict) -> None:
+        """Store a response.
+
+        Args:
+            key: Cache key from key()
+            generation: Index generation the response was built at
+            response: JSON-serializable response data
+        """
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO class_lookups (hash, generation, response) "
+                "VALUES (?, ?, ?)",
+                (key, generation, json.dumps(response)),
+            )
+            self._conn.commit()
+
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            self._conn.close()
@@ -3,12 +3,15 @@
 import hashlib
 import json
 import re
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import dataclass, field
+from itertools import islice
 from pathlib import Path
-from typing import Optional
+from typing import Callable, Iterable, Iterator, Optional
 
 from ..extractors.generic_extractor import GenericExtractor
 from ..extractors.java_extractor import JavaExtractor
+from ..utils.parse_cache import ParseCache
 
 
 @dataclass
@@ -28,6 +31,26 @@ class CodeChunk:
     references: list[str] = field(default_factory=list)  # Class names referenced
     metadata: dict = field(default_factory=dict)
 
+    @property
+    def location(self) -> str:
+        """File path and line range, e.g. ``src/app.py:10-42``."""
+        return f"{self.file_path}:{self.start_line}-{self.end_line}"
+
+    @property
+    def content_hash(self) -> str:
+        """Fingerprint of the embedded text, used to skip re-embedding unchanged chunks.
+
+        Only content and documentation are covered; other fields (line span,
+        references, metadata) are refreshed separately by
+        PgVectorStore.update_chunk_fields(). The stored value also covers the
+        embedding model, see PgVectorStore.embedding_hash().
+        """
+        digest = hashlib.blake2b(self.content.encode(), digest_size=16)
+        if self.documentation:
+            digest.update(b"\0")
+            digest.update(self.documentation.encode())
+        return digest.hexdigest()
+
     def to_dict(self) -> dict:
         """Convert to dictionary for storage."""
         return {
@@ -64,6 +87,26 @@ class CodeChunk:
         )
 
 
+# Per-process chunker used by parse workers (set by _init_parse_worker)
+_worker_chunker: Optional["CodeChunker"] = None
+
+
+def _init_parse_worker(chunker_kwargs: dict) -> None:
+    """Build the chunker a parse worker process uses for every file."""
+    global _worker_chunker
+    _worker_chunker = CodeChunker(**chunker_kwargs)
+
+
+def _extract_java_file(file_path: Path) -> list:
+    """Parse one Java file in a worker process."""
+    return _worker_chunker.java_extractor.extract_file(file_path)
+
+
+def _extract_generic_file(file_path: Path) -> list:
+    """Extract code blocks from one non-Java source file in a worker process."""
+    return _worker_chunker.generic_extractor.extract_file(file_path)
+
+
 class CodeChunker:
     """Chunk source code and documents into semantic units for embedding."""
 
@@ -76,6 +119,9 @@ class CodeChunker:
         r"\b([A-Z][a-zA-Z0-9]*(?:Service|Controller|Repository|Manager|Handler|Factory|Builder|Processor|Validator|Mapper|Converter|Provider|Client|Config|Exception|Error|Request|Response|Dto|Entity|Model)?)\b"
     )
 
+    # Files handed to the process pool at a time; bounds results held in memory
+    PARSE_WINDOW_PER_WORKER = 16
+
     def __init__(
         self,
         include_methods: bool = True,
@@ -85,6 +131,8 @@ class CodeChunker:
         include_documents: bool = True,
         max_chunk_lines: int = 200,
         min_chunk_lines: int = 3,
+        parse_workers: int = 1,
+        parse_cache: Optional[ParseCache] = None,
     ):
         """Initialize the chunker.
 
@@ -96,6 +144,8 @@ class CodeChunker:
             include_documents: Include text/markdown documents
             max_chunk_lines: Maximum lines per chunk
             min_chunk_lines: Minimum lines per chunk (skip tiny chunks)
+            parse_workers: Processes used to parse source files (1 parses inline)
+            parse_cache: Optional persistent cache; unchanged files skip parsing
         """
         self.include_methods = include_methods
         self.include_classes = include_classes
@@ -104,6 +154,8 @@ class CodeChunker:
         self.include_documents = include_documents
         self.max_chunk_lines = max_chunk_lines
         self.min_chunk_lines = min_chunk_lines
+        self.parse_workers = max(1, parse_workers)
+        self.parse_cache = parse_cache
 
         self.java_extractor = JavaExtractor(
             include_private=True,
@@ -115,6 +167,61 @@ class CodeChunker:
         # Track known class names for cross-referencing
         self._known_classes: set[str] = set()
 
+    def _parse_map(
+        self,
+        worker_fn: Callable,
+        inline_fn: Callable,
+        settings: str,
+        paths: Iterable[Path],
+        executor: Optional[ProcessPoolExecutor],
+    ) -> Iterator[tuple[Path, list]]:
+        """Parse files in order, via the parse cache and worker pool if any.
+
+        Files are handled in bounded windows so a slow consumer never
+        leaves the whole corpus parsed and waiting in memory. Within a
+        window, cache hits are reused and only misses are parsed.
+
+        Args:
+            worker_fn: Module-level parse function run in worker processes
+            inline_fn: Equivalent parse function run in this process
+            settings: Parser configuration, part of the cache key
+            paths: Files to parse
+            executor: Worker pool, or None to parse inline
+
+        Yields:
+            (path, parse result) pairs in input order
+        """
+        paths = iter(paths)
+        window_size = self.parse_workers * self.PARSE_WINDOW_PER_WORKER
+        while window := list(islice(paths, window_size)):
+            results: list = [None] * len(window)
+            keys: list[Optional[bytes]] = [None] * len(window)
+            missing = []
+
+            for i, path in enumerate(window):
+                if self.parse_cache is not None:
+                    keys[i] = self.parse_cache.key(path, settings)
+                    if keys[i] is not None:
+                        results[i] = self.parse_cache.get(keys[i])
+                if results[i] is None:
+                    missing.append(i)
+
+            missing_paths = [window[i] for i in missing]
+            parsed = (
+                executor.map(worker_fn, missing_paths)
+                if executor is not None
+                else map(inline_fn, missing_paths)
+            )
+            for i, result in zip(missing, parsed):
+                results[i] = result
+
+            if self.parse_cache is not None:
+                self.parse_cache.put_many(
+                    [(keys[i], results[i]) for i in missing if keys[i] is not None]
+                )
+
+            yield from zip(window, results)
+
     def chunk_directory(
         self,
         source_dir: Path,
@@ -122,6 +229,8 @@ class CodeChunker:
     ) -> list[CodeChunk]:
         """Chunk all source files in a directory.
 
+        Materializes every chunk; prefer iter_chunks() for large trees.
+
         Args:
             source_dir: Directory containing source code
             base_path: Base path for relative file paths (defaults to source_dir)
@@ -129,53 +238,99 @@ class CodeChunker:
         Returns:
             List of code chunks
         """
+        return list(self.iter_chunks(source_dir, base_path))
+
+    def iter_chunks(
+        self,
+        source_dir: Path,
+        base_path: Optional[Path] = None,
+    ) -> Iterator[CodeChunk]:
+        """Lazily chunk all source files in a directory.
+
+        Yields chunks as each file is processed so callers can embed and
+        store them in bounded batches instead of holding the whole corpus
+        in memory. Known classes are complete once the generator is exhausted.
+
+        Args:
+            source_dir: Directory containing source code
+            base_path: Base path for relative file paths (defaults to source_dir)
+
+        Yields:
+            Code chunks
+        """
         if base_path is None:
             base_path = source_dir
 
-        chunks = []
         self._known_classes = set()
 
-        # Phase 1: Process Java files first to collect class names
-        java_dir = source_dir / "java"
-        if java_dir.exists():
-            java_classes = self.java_extractor.extract_directory(java_dir)
-            for java_class in java_classes:
-                # Track class name for cross-referencing
-                self._known_classes.add(java_class.name)
-                class_chunks = self._chunk_java_class(java_class, base_path)
-                chunks.extend(class_chunks)
+        if self.parse_workers > 1:
+            executor = ProcessPoolExecutor(
+                max_workers=self.parse_workers,
+                initializer=_init_parse_worker,
+                initargs=(self._worker_kwargs(),),
+            )
+        else:
+            executor = None
 
-        # Also scan for Java files outside java/ directory
-        for file_path in source_dir.rglob("*.java"):
-            if "java/" in str(file_path):
-                continue  # Already processed
-            java_classes = self.java_extractor.extract_file(file_path)
-            for java_class in java_classes:
-                self._known_classes.add(java_class.name)
-                class_chunks = self._chunk_java_class(java_class, base_path)
-                chunks.extend(class_chunks)
+        try:
+            # Phase 1: Process Java files first to collect class names
+            java_files = []
+            java_dir = source_dir / "java"
+            if java_dir.exists():
+                java_files.extend(java_dir.glob("**/*.java"))
+
+            # Also scan for Java files outside java/ directory
+            java_files.extend(
+                file_path
+                for file_path in source_dir.rglob("*.java")
+                if "java/" not in str(file_path)  # Already processed
+            )
 
-        # Phase 2: Process other language files
-        for ext in self.generic_extractor.LANGUAGE_EXTENSIONS:
-            for file_path in source_dir.rglob(f"*{ext}"):
+            java_settings = (
+                f"java:{self.java_extractor.include_comments}:{self.java_extractor.max_lines}"
+            )
+            for _, java_classes in self._parse_map(
+                _extract_java_file,
+                self.java_extractor.extract_file,
+                java_settings,
+                java_files,
+                executor,
+            ):
+                for java_class in java_classes:
+                    # Track class name for cross-referencing
+                    self._known_classes.add(java_class.name)
+                    yield from self._chunk_java_class(java_class, base_path)
+
+            # Phase 2: Process other language files
+            generic_files = (
+                file_path
+                for ext in self.generic_extractor.LANGUAGE_EXTENSIONS
+                for file_path in source_dir.rglob(f"*{ext}")
                 # Skip Java files (already processed)
-                if file_path.suffix == ".java":
-                    continue
-                file_chunks = self._chunk_generic_file(file_path, base_path)
-                chunks.extend(file_chunks)
+                if file_path.suffix != ".java"
+            )
+            for file_path, blocks in self._parse_map(
+                _extract_generic_file,
+                self.generic_extractor.extract_file,
+                f"generic:{self.generic_extractor.max_lines}",
+                generic_files,
+                executor,
+            ):
+                yield from self._chunk_code_blocks(blocks, file_path, base_path)
+        finally:
+            if executor is not None:
+                executor.shutdown(cancel_futures=True)
 
         # Phase 3: Process JSON templates
         if self.include_templates:
             templates_dir = source_dir / "templates"
             if templates_dir.exists():
                 for file_path in templates_dir.rglob("*.json"):
-                    template_chunks = self._chunk_json_template(file_path, base_path)
-                    chunks.extend(template_chunks)
+                    yield from self._chunk_json_template(file_path, base_path)
 
             # Also scan for JSON files in root
             for file_path in source_dir.glob("*.json"):
-                template_chunks = self._chunk_json_template(file_path, base_path)
-                chunks.extend(template_chunks)
+                yield from self._chunk_json_template(file_path, base_path)
 
         # Phase 4: Process documents (markdown, text)
         if self.include_documents:
@@ -183,16 +338,24 @@ class CodeChunker:
             if docs_dir.exists():
                 for ext in self.DOCUMENT_EXTENSIONS:
                     for file_path in docs_dir.rglob(f"*{ext}"):
-                        doc_chunks = self._chunk_document(file_path, base_path)
-                        chunks.extend(doc_chunks)
+                        yield from self._chunk_document(file_path, base_path)
 
             # Also scan root for docs
             for ext in self.DOCUMENT_EXTENSIONS:
                 for file_path in source_dir.glob(f"*{ext}"):
-                    doc_chunks = self._chunk_document(file_path, base_path)
-                    chunks.extend(doc_chunks)
+                    yield from self._chunk_document(file_path, base_path)
 
-        return chunks
+    def _worker_kwargs(self) -> dict:
+        """Constructor arguments that rebuild this chunker in a parse worker."""
+        return {
+            "include_methods": self.include_methods,
+            "include_classes": self.include_classes,
+            "include_documentation": self.include_documentation,
+            "include_templates": self.include_templates,
+            "include_documents": self.include_documents,
+            "max_chunk_lines": self.max_chunk_lines,
+            "min_chunk_lines": self.min_chunk_lines,
+        }
 
     def chunk_file(
         self, file_path: Path, base_path: Optional[Path] = None
@@ -341,8 +504,14 @@ class CodeChunker:
 
     def _chunk_generic_file(self, file_path: Path, base_path: Path) -> list[CodeChunk]:
         """Create chunks from a non-Java source file."""
-        chunks = []
         blocks = self.generic_extractor.extract_file(file_path)
+        return self._chunk_code_blocks(blocks, file_path, base_path)
+
+    def _chunk_code_blocks(
+        self, blocks: list, file_path: Path, base_path: Path
+    ) -> list[CodeChunk]:
+        """Create chunks from code blocks extracted from a non-Java source file."""
+        chunks = []
         relative_path = self._get_relative_path(str(file_path), base_path)
 
         for block in blocks:
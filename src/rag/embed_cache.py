@@ -0,0 +1,95 @@
+"""Persistent content-addressed cache of embedding vectors."""
+
+import hashlib
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Iterable
+
+import numpy as np
+
+
+class EmbeddingCache:
+    """SQLite-backed cache mapping embedded text to its vector.
+
+    Keys are SHA-256 digests of the model name, vector dimensions and the
+    exact text sent to the API, so switching models or dimensions never
+    returns stale vectors. Vectors are stored as raw float32 bytes.
+    """
+
+    # Keys per SELECT ... IN (...); stays under SQLite's bound-parameter limit
+    LOOKUP_BATCH_SIZE = 500
+
+    def __init__(self, path: Path, model: str, dimensions: int):
+        """Open (or create) the cache database.
+
+        Args:
+            path: SQLite database file
+            model: Embedding model name, part of every key
+            dimensions: Embedding dimensions, part of every key
+        """
+        self.path = Path(path)
+        self.model = model
+        self.dimensions = dimensions
+        self._key_prefix = f"{model}\0{dimensions}\0".encode()
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        # Embedding may run in worker threads; a lock serializes access
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS emb (hash BLOB PRIMARY KEY, vec BLOB NOT NULL)"
+            )
+            self._conn.commit()
+
+    def key(self, text: str) -> bytes:
+        """Return the cache key for a text."""
+        return hashlib.sha256(self._key_prefix + text.encode()).digest()
+
+    def get_many(self, keys: Iterable[bytes]) -> dict[bytes, np.ndarray]:
+        """Look up cached vectors.
+
+        Args:
+            keys: Cache keys from key()
+
+        Returns:
+            Dictionary mapping each cached key to its float32 vector
+        """
+        keys = list(dict.fromkeys(keys))
+        found = {}
+        with self._lock:
+            for start in range(0, len(keys), self.LOOKUP_BATCH_SIZE):
+                batch = keys[start:start + self.LOOKUP_BATCH_SIZE]
+                placeholders = ", ".join("?" * len(batch))
+                rows = self._conn.execute(
+                    f"SELECT hash, vec FROM emb WHERE hash IN ({placeholders})",
+                    batch,
+                )
+                for key, vec in rows:
+                    found[key] = np.frombuffer(vec, dtype=np.float32)
+        return found
+
+    def put_many(self, items: Iterable[tuple[bytes, list[float]]]) -> None:
+        """Store vectors in one transaction.
+
+        Args:
+            items: (key, embedding) pairs
+        """
+        rows = [
+            (key, np.asarray(embedding, dtype=np.float32).tobytes())
+            for key, embedding in items
+        ]
+        if not rows:
+            return
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO emb (hash, vec) VALUES (?, ?)", rows
+            )
+            self._conn.commit()
+
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            self._conn.close()
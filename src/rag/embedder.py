@@ -1,11 +1,16 @@
 """Vertex AI embeddings for code chunks."""
 
+import asyncio
+import warnings
+from functools import lru_cache
 from typing import Optional
 
+import numpy as np
 from google import genai
 from tqdm import tqdm
 
 from .chunker import CodeChunk
+from .embed_cache import EmbeddingCache
 
 
 class VertexEmbedder:
@@ -18,11 +23,18 @@ class VertexEmbedder:
         "text-multilingual-embedding-002": 768,
     }
 
+    # Largest single text we send; longer chunks are skipped and reported
+    MAX_TOKENS_PER_ITEM = 15000
+
+    # Single-text embeddings (queries) kept in memory per embedder
+    QUERY_MEMO_SIZE = 512
+
     def __init__(
         self,
         project_id: str,
         location: str = "us-central1",
         model: str = "text-embedding-005",
+        cache: Optional[EmbeddingCache] = None,
     ):
         """Initialize the embedder.
 
@@ -30,11 +42,22 @@ class VertexEmbedder:
             project_id: GCP project ID
             location: GCP region
             model: Embedding model name
+            cache: Optional persistent cache; texts found there skip the API
         """
         self.project_id = project_id
         self.location = location
         self.model = model
         self.dimensions = self.MODEL_DIMENSIONS.get(model, 768)
+        self.cache = cache
+        # Per instance so the model is implied by the key and self is not
+        # pinned by a class-level cache
+        self._embed_text_memo = lru_cache(maxsize=self.QUERY_MEMO_SIZE)(
+            self._embed_text_uncached
+        )
+        # Vectors from embed_queries waiting to be picked up by the memo
+        self._prefetched: dict[str, list[float]] = {}
+        # Latest prefetch_text() result: (text, embedding, already persisted)
+        self._typed_prefetch: Optional[tuple[str, list[float], bool]] = None
 
         self.client = genai.Client(
             vertexai=True,
@@ -51,129 +74,332 @@ class VertexEmbedder:
         """
         return int(len(text) / 2)
 
-    def embed_text(self, text: str) -> list[float]:
+    def embed_text(self, text: str) -> np.ndarray:
         """Embed a single text string.
 
+        Repeated texts are answered from an in-memory LRU within a session
+        (e.g. an interactive prompt asked twice) and from the persistent
+        cache across CLI runs when one is attached.
+
         Args:
             text: Text to embed
 
         Returns:
-            Embedding vector
+            Read-only float32 embedding vector (shared with the memo), in
+            the layout pgvector sends to the server
+        """
+        return self._embed_text_memo(text)
+
+    def embed_queries(self, texts: list[str]) -> list[np.ndarray]:
+        """Embed several query texts in one batched API call.
+
+        The vectors are seeded into the in-memory memo, so subsequent
+        embed_text calls for the same texts (e.g. from the retriever) are
+        lookups instead of one round-trip per query.
+
+        Args:
+            texts: Query texts
+
+        Returns:
+            Read-only float32 embedding vectors aligned with texts
+        """
+        unique_texts = list(dict.fromkeys(texts))
+        embeddings = self.embed_texts(unique_texts, show_progress=False)
+        self._prefetched.update(
+            (text, embedding)
+            for text, embedding in zip(unique_texts, embeddings)
+            if embedding is not None
+        )
+        try:
+            return [self._embed_text_memo(text) for text in texts]
+        finally:
+            self._prefetched.clear()
+
+    def prefetch_text(self, text: str) -> None:
+        """Embed a text that may be submitted soon, e.g. a question being typed.
+
+        Only the latest prefetched vector is kept, in memory; the next
+        embed_text() call for the same text picks it up and only then saves
+        it to the persistent cache, so abandoned partial questions never
+        reach it.
+
+        Args:
+            text: Text to embed
         """
+        typed = self._typed_prefetch
+        if typed is not None and typed[0] == text:
+            return
+
+        embeddings, missing = self._lookup_cached([text])
+        if missing:
+            response = self.client.models.embed_content(
+                model=self.model,
+                contents=text,
+            )
+            embeddings[0] = response.embeddings[0].values
+        self._typed_prefetch = (text, embeddings[0], not missing)
+
+    def _embed_text_uncached(self, text: str) -> np.ndarray:
+        """Embed a single text via prefetched vectors, the persistent cache or the API."""
+        prefetched = self._prefetched.pop(text, None)
+        if prefetched is not None:
+            return self._as_query_vector(prefetched)
+
+        typed = self._typed_prefetch
+        if typed is not None and typed[0] == text:
+            self._typed_prefetch = None
+            if not typed[2]:
+                # The prefetched text was submitted; keep it across runs
+                self._store_cached([text], [typed[1]], [0])
+            return self._as_query_vector(typed[1])
+
+        embeddings, missing = self._lookup_cached([text])
+        if not missing:
+            return self._as_query_vector(embeddings[0])
+
         response = self.client.models.embed_content(
             model=self.model,
             contents=text,
         )
-        return response.embeddings[0].values
+        embeddings[0] = response.embeddings[0].values
+        self._store_cached([text], embeddings, missing)
+        return self._as_query_vector(embeddings[0])
 
-    def embed_texts(
+    @staticmethod
+    def _as_query_vector(embedding) -> np.ndarray:
+        """Convert an embedding to the float32 array kept in the memo.
+
+        Half the size of float64 and what pgvector encodes anyway; frozen
+        because the memo hands the same array to every caller.
+        """
+        vector = np.asarray(embedding, dtype=np.float32)
+        vector.flags.writeable = False
+        return vector
+
+    def _pack_batches(
         self,
         texts: list[str],
-        batch_size: int = 100,
-        show_progress: bool = True,
-        max_tokens_per_batch: int = 15000,  # Conservative limit (API limit is 20k)
-    ) -> list[list[float]]:
-        """Embed multiple texts in batches.
+        batch_size: int,
+        max_tokens_per_batch: int,
+        indices: Optional[list[int]] = None,
+    ) -> tuple[list[list[int]], int]:
+        """Group text indices into API batches respecting count and token limits.
 
         Args:
-            texts: List of texts to embed
-            batch_size: Maximum number of texts per API call (may be reduced if token limit hit)
-            show_progress: Show progress bar
-            max_tokens_per_batch: Maximum tokens per batch (default 15k, API limit is 20k)
+            texts: Texts to embed
+            batch_size: Maximum number of texts per batch
+            max_tokens_per_batch: Maximum estimated tokens per batch
+            indices: Indices of the texts to pack (default: all)
 
         Returns:
-            List of embedding vectors
+            Tuple of (batches of indices into texts, number of texts skipped as too large)
         """
-        embeddings = []
-        
-        # Build batches respecting token limits
+        max_tokens_per_item = min(max_tokens_per_batch, self.MAX_TOKENS_PER_ITEM)
         batches = []
         current_batch = []
         current_tokens = 0
         skipped_count = 0
-        
-        for text in texts:
-            text_tokens = self._estimate_tokens(text)
-            
-            # If single text exceeds limit, skip it with a warning
-            if text_tokens > max_tokens_per_batch:
+
+        for i in range(len(texts)) if indices is None else indices:
+            text_tokens = self._estimate_tokens(texts[i])
+
+            # If single text exceeds limit, skip it (its result stays None)
+            if text_tokens > max_tokens_per_item:
                 skipped_count += 1
-                embeddings.append(None)  # Placeholder for skipped item
                 continue
-            
+
             # Check if adding this text would exceed the limit
             if current_batch and (current_tokens + text_tokens > max_tokens_per_batch):
                 # Start a new batch
                 batches.append(current_batch)
-                current_batch = [text]
+                current_batch = [i]
                 current_tokens = text_tokens
             else:
                 # Add to current batch
-                current_batch.append(text)
+                current_batch.append(i)
                 current_tokens += text_tokens
-                
+
                 # If batch is full by count, check token limit before adding more
                 if len(current_batch) >= batch_size:
                     batches.append(current_batch)
                     current_batch = []
                     current_tokens = 0
-        
+
         # Add remaining batch
         if current_batch:
             batches.append(current_batch)
-        
+
         if skipped_count > 0:
-            import warnings
             warnings.warn(
-                f"Skipped {skipped_count} texts that exceeded token limit of {max_tokens_per_batch}"
+                f"Skipped {skipped_count} texts that exceeded token limit of {max_tokens_per_item}"
             )
 
-        iterator = tqdm(batches, desc="Embedding") if show_progress else batches
+        return batches, skipped_count
 
-        for batch in iterator:
+    def _lookup_cached(self, texts: list[str]) -> tuple[list[Optional[list[float]]], list[int]]:
+        """Fill in embeddings already in the cache.
+
+        Returns:
+            Tuple of (embeddings aligned with texts, indices of texts still to embed)
+        """
+        embeddings: list[Optional[list[float]]] = [None] * len(texts)
+        if self.cache is None:
+            return embeddings, list(range(len(texts)))
+
+        keys = [self.cache.key(text) for text in texts]
+        cached = self.cache.get_many(keys)
+        missing = []
+        for i, key in enumerate(keys):
+            embedding = cached.get(key)
+            if embedding is None:
+                missing.append(i)
+            else:
+                embeddings[i] = embedding
+        return embeddings, missing
+
+    def _store_cached(
+        self,
+        texts: list[str],
+        embeddings: list[Optional[list[float]]],
+        indices: list[int],
+    ) -> None:
+        """Save newly computed embeddings for the given text indices to the cache."""
+        if self.cache is None:
+            return
+        self.cache.put_many(
+            (self.cache.key(texts[i]), embeddings[i])
+            for i in indices
+            if embeddings[i] is not None
+        )
+
+    def _embed_batch(
+        self,
+        batch: list[str],
+        max_tokens_per_item: int,
+    ) -> list[Optional[list[float]]]:
+        """Embed one packed batch with a single API call.
+
+        If the API rejects the batch for its token count, falls back to
+        embedding each text on its own.
+
+        Args:
+            batch: Texts to embed together
+            max_tokens_per_item: Texts estimated above this are skipped in the fallback
+
+        Returns:
+            Embedding per text, or None for texts that could not be embedded
+        """
+        try:
+            response = self.client.models.embed_content(
+                model=self.model,
+                contents=batch,
+            )
+            return [embedding.values for embedding in response.embeddings]
+        except Exception as e:
+            # If batch fails due to token limit, process individually
+            error_msg = str(e).lower()
+            if not ("token count" in error_msg or "20000" in error_msg or "invalid_argument" in error_msg):
+                raise
+
+        warnings.warn(
+            f"Batch of {len(batch)} items exceeded token limit, processing individually"
+        )
+        embeddings = []
+        for text in batch:
             try:
+                # Check if individual text is too large
+                if self._estimate_tokens(text) > max_tokens_per_item:
+                    warnings.warn(f"Skipping text with estimated {self._estimate_tokens(text)} tokens")
+                    embeddings.append(None)
+                    continue
+
                 response = self.client.models.embed_content(
                     model=self.model,
-                    contents=batch,
+                    contents=[text],
                 )
-                for embedding in response.embeddings:
-                    embeddings.append(embedding.values)
-            except Exception as e:
-                # If batch fails due to token limit, process individually
-                error_msg = str(e).lower()
-                if "token count" in error_msg or "20000" in error_msg or "invalid_argument" in error_msg:
-                    import warnings
-                    warnings.warn(
-                        f"Batch of {len(batch)} items exceeded token limit, processing individually"
-                    )
-                    for text in batch:
-                        try:
-                            # Check if individual text is too large
-                            if self._estimate_tokens(text) > max_tokens_per_batch:
-                                warnings.warn(f"Skipping text with estimated {self._estimate_tokens(text)} tokens")
-                                embeddings.append(None)
-                                continue
-                            
-                            response = self.client.models.embed_content(
-                                model=self.model,
-                                contents=[text],
-                            )
-                            embeddings.append(response.embeddings[0].values)
-                        except Exception as e2:
-                            # Track the specific error for reporting
-                            error_msg = str(e2).lower()
-                            if "token count" in error_msg or "20000" in error_msg:
-                                # Still too large even individually
-                                token_est = self._estimate_tokens(text)
-                                embeddings.append(None)  # Will be tracked as skipped
-                            else:
-                                # Other API error
-                                import warnings
-                                warnings.warn(f"Failed to embed individual text: {e2}")
-                                embeddings.append(None)
-                else:
-                    raise
+                embeddings.append(response.embeddings[0].values)
+            except Exception as e2:
+                # Track the specific error for reporting
+                error_msg = str(e2).lower()
+                if not ("token count" in error_msg or "20000" in error_msg):
+                    # Other API error (still-too-large texts are reported as skipped)
+                    warnings.warn(f"Failed to embed individual text: {e2}")
+                embeddings.append(None)
+        return embeddings
+
+    def embed_texts(
+        self,
+        texts: list[str],
+        batch_size: int = 100,
+        show_progress: bool = True,
+        max_tokens_per_batch: int = 15000,  # Conservative limit (API limit is 20k)
+    ) -> list[Optional[list[float]]]:
+        """Embed multiple texts in batches.
+
+        Args:
+            texts: List of texts to embed
+            batch_size: Maximum number of texts per API call (may be reduced if token limit hit)
+            show_progress: Show progress bar
+            max_tokens_per_batch: Maximum tokens per batch (default 15k, API limit is 20k);
+                single texts are also capped at MAX_TOKENS_PER_ITEM
 
+        Returns:
+            List of embedding vectors aligned with texts (None for skipped texts)
+        """
+        embeddings, missing = self._lookup_cached(texts)
+        max_tokens_per_item = min(max_tokens_per_batch, self.MAX_TOKENS_PER_ITEM)
+        batches, _ = self._pack_batches(texts, batch_size, max_tokens_per_batch, missing)
+
+        iterator = tqdm(batches, desc="Embedding") if show_progress else batches
+
+        for indices in iterator:
+            batch_embeddings = self._embed_batch(
+                [texts[i] for i in indices], max_tokens_per_item
+            )
+            for i, embedding in zip(indices, batch_embeddings):
+                embeddings[i] = embedding
+
+        self._store_cached(texts, embeddings, missing)
+        return embeddings
+
+    async def embed_texts_async(
+        self,
+        texts: list[str],
+        batch_size: int = 100,
+        max_tokens_per_batch: int = 15000,
+        concurrency: int = 8,
+    ) -> list[Optional[list[float]]]:
+        """Embed multiple texts with several API calls in flight at once.
+
+        Cached texts are filled in first and the rest are packed exactly as
+        in embed_texts, then sent from worker threads with at most
+        ``concurrency`` requests outstanding, which also keeps the request
+        rate within Vertex quotas.
+
+        Args:
+            texts: List of texts to embed
+            batch_size: Maximum number of texts per API call
+            max_tokens_per_batch: Maximum tokens per batch (API limit is 20k)
+            concurrency: Maximum concurrent API calls
+
+        Returns:
+            List of embedding vectors aligned with texts (None for skipped texts)
+        """
+        embeddings, missing = self._lookup_cached(texts)
+        max_tokens_per_item = min(max_tokens_per_batch, self.MAX_TOKENS_PER_ITEM)
+        batches, _ = self._pack_batches(texts, batch_size, max_tokens_per_batch, missing)
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def embed(indices: list[int]) -> None:
+            async with semaphore:
+                batch_embeddings = await asyncio.to_thread(
+                    self._embed_batch, [texts[i] for i in indices], max_tokens_per_item
+                )
+            for i, embedding in zip(indices, batch_embeddings):
+                embeddings[i] = embedding
+
+        await asyncio.gather(*(embed(indices) for indices in batches))
+        self._store_cached(texts, embeddings, missing)
         return embeddings
 
     def embed_chunks(
@@ -181,6 +407,7 @@ class VertexEmbedder:
         chunks: list[CodeChunk],
         batch_size: int = 100,
         show_progress: bool = True,
+        max_tokens_per_request: int = 15000,
     ) -> tuple[list[tuple[CodeChunk, list[float]]], list[dict]]:
         """Embed code chunks.
 
@@ -188,6 +415,7 @@ class VertexEmbedder:
             chunks: List of code chunks to embed
             batch_size: Maximum number of chunks per API call (may be reduced if token limit hit)
             show_progress: Show progress bar
+            max_tokens_per_request: Token budget packed into each API call (API limit is 20k)
 
         Returns:
             Tuple of:
@@ -196,27 +424,67 @@ class VertexEmbedder:
         """
         # Build text representations for embedding
         texts = [self._chunk_to_text(chunk) for chunk in chunks]
-        
-        max_tokens_per_batch = 15000
 
         # Get embeddings (will handle token limits automatically)
-        embeddings = self.embed_texts(texts, batch_size, show_progress)
+        embeddings = self.embed_texts(
+            texts, batch_size, show_progress, max_tokens_per_batch=max_tokens_per_request
+        )
+
+        return self._pair_chunk_embeddings(chunks, texts, embeddings, max_tokens_per_request)
 
-        # Pair chunks with embeddings, tracking skipped ones
+    async def embed_chunks_async(
+        self,
+        chunks: list[CodeChunk],
+        batch_size: int = 100,
+        max_tokens_per_request: int = 15000,
+        concurrency: int = 8,
+    ) -> tuple[list[tuple[CodeChunk, list[float]]], list[dict]]:
+        """Embed code chunks without blocking the event loop.
+
+        Up to ``concurrency`` Vertex calls run at once, and callers can
+        overlap them with other I/O such as database inserts.
+
+        Args:
+            chunks: List of code chunks to embed
+            batch_size: Maximum number of chunks per API call
+            max_tokens_per_request: Token budget packed into each API call
+            concurrency: Maximum concurrent API calls
+
+        Returns:
+            Same as embed_chunks
+        """
+        texts = [self._chunk_to_text(chunk) for chunk in chunks]
+        embeddings = await self.embed_texts_async(
+            texts,
+            batch_size,
+            max_tokens_per_batch=max_tokens_per_request,
+            concurrency=concurrency,
+        )
+        return self._pair_chunk_embeddings(chunks, texts, embeddings, max_tokens_per_request)
+
+    def _pair_chunk_embeddings(
+        self,
+        chunks: list[CodeChunk],
+        texts: list[str],
+        embeddings: list[Optional[list[float]]],
+        max_tokens_per_request: int,
+    ) -> tuple[list[tuple[CodeChunk, list[float]]], list[dict]]:
+        """Pair chunks with their embeddings, describing the ones that were skipped."""
+        max_tokens_per_item = min(max_tokens_per_request, self.MAX_TOKENS_PER_ITEM)
         result = []
         skipped = []
-        
+
         for chunk, text, embedding in zip(chunks, texts, embeddings):
             if embedding is not None:
                 result.append((chunk, embedding))
             else:
                 # Chunk was skipped - determine why
                 token_count = self._estimate_tokens(text)
-                if token_count > max_tokens_per_batch:
-                    reason = f"Exceeds token limit ({token_count:,} tokens > {max_tokens_per_batch:,} limit)"
+                if token_count > max_tokens_per_item:
+                    reason = f"Exceeds token limit ({token_count:,} tokens > {max_tokens_per_item:,} limit)"
                 else:
                     reason = "Failed during embedding (API error or token estimation mismatch)"
-                
+
                 skipped.append({
                     'chunk': chunk,
                     'reason': reason,
@@ -226,7 +494,7 @@ class VertexEmbedder:
                     'size_chars': len(text),
                     'size_lines': chunk.end_line - chunk.start_line + 1 if chunk.start_line and chunk.end_line else None,
                 })
-        
+
         return result, skipped
 
     def _chunk_to_text(self, chunk: CodeChunk) -> str:
@@ -0,0 +1,101 @@
+"""Local cross-encoder reranking of retrieved chunks."""
+
+from pathlib import Path
+
+import numpy as np
+
+from .chunker import CodeChunk
+
+
+class CrossEncoderReranker:
+    """Rerank candidate chunks with an ONNX cross-encoder (e.g. ms-marco-MiniLM-L-6-v2).
+
+    The model directory must contain ``model.onnx`` and ``tokenizer.json``,
+    as produced by e.g.::
+
+        optimum-cli export onnx --model cross-encoder/ms-marco-MiniLM-L-6-v2 models/reranker
+
+    Requires the optional ``onnxruntime`` and ``tokenizers`` packages.
+    """
+
+    # Characters of chunk content passed to the tokenizer; the tokenizer
+    # truncates to max_length tokens anyway, this just avoids tokenizing
+    # very large chunks in full
+    CHARS_PER_TOKEN = 4
+
+    def __init__(self, model_dir: Path, max_length: int = 512):
+        """Load the model and tokenizer.
+
+        Args:
+            model_dir: Directory containing model.onnx and tokenizer.json
+            max_length: Maximum tokens per (query, chunk) pair
+
+        Raises:
+            ImportError: If onnxruntime or tokenizers is not installed
+        """
+        try:
+            import onnxruntime as ort
+            from tokenizers import Tokenizer
+        except ImportError as e:
+            raise ImportError(
+                "Reranking requires onnxruntime and tokenizers: "
+                "pip install onnxruntime tokenizers"
+            ) from e
+
+        model_dir = Path(model_dir)
+        self.max_length = max_length
+        self.session = ort.InferenceSession(
+            str(model_dir / "model.onnx"), providers=["CPUExecutionProvider"]
+        )
+        self.tokenizer = Tokenizer.from_file(str(model_dir / "tokenizer.json"))
+        self.tokenizer.enable_truncation(max_length=max_length)
+        self.tokenizer.enable_padding()
+        self._input_names = {model_input.name for model_input in self.session.get_inputs()}
+
+    def score(self, query: str, texts: list[str]) -> np.ndarray:
+        """Score (query, text) pairs in one batched model call.
+
+        Args:
+            query: User's question
+            texts: Candidate texts
+
+        Returns:
+            Relevance probabilities (0.0-1.0) aligned with texts
+        """
+        if not texts:
+            return np.empty(0, dtype=np.float32)
+
+        max_chars = self.max_length * self.CHARS_PER_TOKEN
+        encodings = self.tokenizer.encode_batch(
+            [(query, text[:max_chars]) for text in texts]
+        )
+        feeds = {
+            "input_ids": np.array([e.ids for e in encodings], dtype=np.int64),
+            "attention_mask": np.array([e.attention_mask for e in encodings], dtype=np.int64),
+            "token_type_ids": np.array([e.type_ids for e in encodings], dtype=np.int64),
+        }
+        # Some exports drop token_type_ids; only feed what the model declares
+        feeds = {name: value for name, value in feeds.items() if name in self._input_names}
+
+        logits = self.session.run(None, feeds)[0].reshape(len(texts), -1)[:, 0]
+        return 1.0 / (1.0 + np.exp(-logits))
+
+    def rerank(
+        self,
+        query: str,
+        chunks: list[CodeChunk],
+        top_k: int,
+    ) -> tuple[list[CodeChunk], list[float]]:
+        """Reorder chunks by cross-encoder relevance and keep the best.
+
+        Args:
+            query: User's question
+            chunks: Candidate chunks
+            top_k: Number of chunks to keep
+
+        Returns:
+            Tuple of (chunks, scores), best first
+        """
+        scores = self.score(query, [chunk.content for chunk in chunks])
+        order = np.argsort(-scores, kind="stable")[:top_k]
+        return [chunks[i] for i in order], [float(scores[i]) for i in order]
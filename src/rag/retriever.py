@@ -2,12 +2,12 @@
 
 import re
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Optional
-
-from google import genai
+from typing import Callable, Optional
 
+from .answer_cache import ClassLookupCache
 from .chunker import CodeChunk
 from .embedder import VertexEmbedder
 from .query_analyzer import (
@@ -16,7 +16,8 @@ from .query_analyzer import (
     analyze_query,
     get_keywords_for_search,
 )
-from .vector_store import PgVectorStore
+from .reranker import CrossEncoderReranker
+from .vector_store import ClassSummary, PgVectorStore
 
 
 @dataclass
@@ -35,16 +36,14 @@ class RAGResponse:
         """Format sources for display."""
         lines = []
         for i, (chunk, score) in enumerate(zip(self.sources, self.scores), 1):
-            location = f"{chunk.file_path}:{chunk.start_line}-{chunk.end_line}"
             name = chunk.method_name or chunk.class_name or chunk.file_path
-            lines.append(f"{i}. {name} ({location}) [score: {score:.3f}]")
+            lines.append(f"{i}. {name} ({chunk.location}) [score: {score:.3f}]")
 
         if self.dependencies:
             lines.append("\nRelated dependencies:")
             for i, chunk in enumerate(self.dependencies, 1):
-                location = f"{chunk.file_path}:{chunk.start_line}-{chunk.end_line}"
                 name = chunk.class_name or chunk.file_path
-                lines.append(f"  {i}. {name} ({location})")
+                lines.append(f"  {i}. {name} ({chunk.location})")
 
         return "\n".join(lines)
 
@@ -63,12 +62,17 @@ CRITICAL RULES:
 - If the answer is not in the provided code, say so clearly: "Based on the provided code snippets, I cannot find [what was asked]. The codebase may use a different approach or this may be defined elsewhere."
 - Be concise but thorough"""
 
+    # Candidates fetched per kept chunk when a reranker is configured
+    RERANK_CANDIDATE_FACTOR = 4
+
     def __init__(
         self,
         embedder: VertexEmbedder,
         store: PgVectorStore,
         llm_model: str = "gemini-2.5-pro",
         system_prompt: Optional[str] = None,
+        reranker: Optional[CrossEncoderReranker] = None,
+        lookup_cache: Optional[ClassLookupCache] = None,
     ):
         """Initialize the retriever.
 
@@ -77,17 +81,26 @@ CRITICAL RULES:
             store: Vector store for chunk retrieval
             llm_model: Model for answer generation
             system_prompt: Custom system prompt
+            reranker: Optional cross-encoder; when set, query() over-fetches
+                RERANK_CANDIDATE_FACTOR x top_k candidates and keeps the
+                top_k it ranks highest
+            lookup_cache: Optional persistent cache; query_class_with_context()
+                answers from it while the index generation is unchanged
         """
         self.embedder = embedder
         self.store = store
         self.llm_model = llm_model
         self.system_prompt = system_prompt or self.DEFAULT_SYSTEM_PROMPT
+        self.reranker = reranker
+        self.lookup_cache = lookup_cache
+        # (question, language, preview_chars) -> (top_k, results) from
+        # prefetch_retrievals, waiting to be picked up by retrieve_only
+        self._prefetched: dict[tuple, tuple[int, list[tuple[CodeChunk, float]]]] = {}
 
-        self.client = genai.Client(
-            vertexai=True,
-            project=embedder.project_id,
-            location=embedder.location,
-        )
+        # Same project and region as the embedder, so share its client:
+        # one credential lookup and one pooled keep-alive connection to
+        # Vertex AI per process instead of two
+        self.client = embedder.client
 
     def query(
         self,
@@ -100,6 +113,8 @@ CRITICAL RULES:
         max_dependencies: int = 3,
         use_hybrid_search: bool = True,
         min_similarity: Optional[float] = None,
+        on_answer_chunk: Optional[Callable[[str], None]] = None,
+        all_classes: Optional[list[ClassSummary]] = None,
     ) -> RAGResponse:
         """Query the codebase and generate an answer.
 
@@ -120,6 +135,10 @@ CRITICAL RULES:
             max_dependencies: Maximum dependencies per source chunk
             use_hybrid_search: Combine semantic and keyword search for better accuracy
             min_similarity: Minimum similarity threshold (auto-determined if None)
+            on_answer_chunk: If set, the answer is streamed and each text
+                chunk is passed here as it arrives
+            all_classes: list_classes(language) result the caller already
+                has; list/count class queries then skip fetching it again
 
         Returns:
             RAGResponse with answer and sources
@@ -271,17 +290,6 @@ CRITICAL RULES:
                                 file=sys.stderr,
                             )
 
-        # If asking to list/count classes, get ALL classes from database
-        all_classes_list = None
-        if is_list_count_query and is_class_query:
-            all_classes = self.store.list_classes(language=language)
-            if all_classes:
-                all_classes_list = all_classes
-                print(
-                    f"[DEBUG] List query. Found {len(all_classes)} classes.",
-                    file=sys.stderr,
-                )
-
         # For enum queries, lower similarity threshold to find more results
         search_min_similarity = min_similarity
         if is_enum_query and min_similarity > 0.3:
@@ -290,17 +298,44 @@ CRITICAL RULES:
                 f"[DEBUG] Lowered similarity threshold to {search_min_similarity} for enum query",
                 file=sys.stderr,
             )
-        
-        # Perform hybrid search: combine semantic and keyword search
-        chunks, scores = self._hybrid_search(
-            question=question,
-            analysis=analysis,
-            top_k=top_k,
-            language=language,
-            chunk_type=chunk_type,
-            min_similarity=search_min_similarity,
-            use_hybrid=use_hybrid_search,
-        )
+
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            # If asking to list/count classes, get ALL classes from database;
+            # that needs no embedding, so it runs in a worker thread while
+            # the question is embedded and searched
+            all_classes_future = None
+            if is_list_count_query and is_class_query and all_classes is None:
+                all_classes_future = executor.submit(self.store.list_classes, language=language)
+
+            # Perform hybrid search: combine semantic and keyword search
+            chunks, scores = self._hybrid_search(
+                question=question,
+                analysis=analysis,
+                top_k=top_k * self.RERANK_CANDIDATE_FACTOR if self.reranker else top_k,
+                language=language,
+                chunk_type=chunk_type,
+                min_similarity=search_min_similarity,
+                use_hybrid=use_hybrid_search,
+            )
+
+            if all_classes_future is not None:
+                all_classes = all_classes_future.result()
+
+        all_classes_list = None
+        if is_list_count_query and is_class_query and all_classes:
+            all_classes_list = all_classes
+            print(
+                f"[DEBUG] List query. Found {len(all_classes)} classes.",
+                file=sys.stderr,
+            )
+
+        if self.reranker:
+            candidate_count = len(chunks)
+            chunks, scores = self.reranker.rerank(question, chunks, top_k)
+            print(
+                f"[DEBUG] Reranked {candidate_count} candidates, kept {len(chunks)}",
+                file=sys.stderr,
+            )
         
         # Boost exact class name matches if class names were mentioned in query
         if analysis.class_names and not direct_class_chunk:
@@ -403,8 +438,7 @@ CRITICAL RULES:
                 all_classes_list, key=lambda c: c.class_name or c.file_path
             ):
                 class_name = cls.class_name or Path(cls.file_path).stem
-                location = f"{cls.file_path}:{cls.start_line}-{cls.end_line}"
-                class_summaries.append(f"{class_name} ({location})")
+                class_summaries.append(f"{class_name} ({cls.location})")
 
             context = f"""DATABASE QUERY RESULT - ALL {len(all_classes_list)} INDEXED CLASSES
 
@@ -421,7 +455,10 @@ Total: {len(all_classes_list)} classes."""
 
         # Generate answer using LLM
         answer = self._generate_answer(
-            question, context, is_list_query=(is_list_count_query and is_class_query)
+            question,
+            context,
+            is_list_query=(is_list_count_query and is_class_query),
+            on_answer_chunk=on_answer_chunk,
         )
 
         return RAGResponse(
@@ -443,6 +480,7 @@ Total: {len(all_classes_list)} classes."""
         chunk_type: Optional[str],
         min_similarity: float,
         use_hybrid: bool = True,
+        preview_chars: Optional[int] = None,
     ) -> tuple[list[CodeChunk], list[float]]:
         """Perform hybrid search combining semantic and keyword search.
 
@@ -457,31 +495,19 @@ Total: {len(all_classes_list)} classes."""
             chunk_type: Chunk type filter
             min_similarity: Minimum similarity threshold
             use_hybrid: Whether to use hybrid search
+            preview_chars: Only fetch this many leading characters of content
 
         Returns:
             Tuple of (chunks, scores)
         """
-        # Semantic search - embed the question
-        query_embedding = self.embedder.embed_text(question)
-
         # Fetch more candidates for hybrid merging
         semantic_top_k = top_k * 2 if use_hybrid else top_k
 
-        semantic_results = self.store.search(
-            query_embedding=query_embedding,
-            top_k=semantic_top_k,
-            language=language,
-            chunk_type=chunk_type,
-            min_similarity=min_similarity,
-        )
-
-        print(
-            f"[DEBUG] Semantic search: {len(semantic_results)} results "
-            f"(threshold={min_similarity})",
-            file=sys.stderr,
-        )
-
         if not use_hybrid:
+            semantic_results = self._semantic_search(
+                question, semantic_top_k, language, chunk_type, min_similarity,
+                preview_chars,
+            )
             chunks = [chunk for chunk, _ in semantic_results[:top_k]]
             scores = [score for _, score in semantic_results[:top_k]]
             return chunks, scores
@@ -490,12 +516,22 @@ Total: {len(all_classes_list)} classes."""
         keywords = get_keywords_for_search(analysis)
         all_keywords = keywords + analysis.expanded_terms[:5]
 
-        keyword_results = self.store.keyword_search(
-            keywords=all_keywords,
-            top_k=top_k,
-            language=language,
-            chunk_type=chunk_type,
-        )
+        # The keyword search needs no embedding, so it runs in a worker
+        # thread while the question is embedded and searched semantically
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            keyword_future = executor.submit(
+                self.store.keyword_search,
+                keywords=all_keywords,
+                top_k=top_k,
+                language=language,
+                chunk_type=chunk_type,
+                preview_chars=preview_chars,
+            )
+            semantic_results = self._semantic_search(
+                question, semantic_top_k, language, chunk_type, min_similarity,
+                preview_chars,
+            )
+            keyword_results = keyword_future.result()
 
         print(
             f"[DEBUG] Keyword search: {len(keyword_results)} results "
@@ -517,6 +553,34 @@ Total: {len(all_classes_list)} classes."""
 
         return chunks, scores
 
+    def _semantic_search(
+        self,
+        question: str,
+        top_k: int,
+        language: Optional[str],
+        chunk_type: Optional[str],
+        min_similarity: float,
+        preview_chars: Optional[int] = None,
+    ) -> list[tuple[CodeChunk, float]]:
+        """Embed the question and run the vector similarity search."""
+        query_embedding = self.embedder.embed_text(question)
+
+        semantic_results = self.store.search(
+            query_embedding=query_embedding,
+            top_k=top_k,
+            language=language,
+            chunk_type=chunk_type,
+            min_similarity=min_similarity,
+            preview_chars=preview_chars,
+        )
+
+        print(
+            f"[DEBUG] Semantic search: {len(semantic_results)} results "
+            f"(threshold={min_similarity})",
+            file=sys.stderr,
+        )
+        return semantic_results
+
     def _merge_results_rrf(
         self,
         semantic_results: list[tuple[CodeChunk, float]],
@@ -580,6 +644,7 @@ Total: {len(all_classes_list)} classes."""
         question: str,
         top_k: int = 5,
         max_dependencies: int = 5,
+        on_answer_chunk: Optional[Callable[[str], None]] = None,
     ) -> RAGResponse:
         """Query with automatic dependency resolution.
 
@@ -591,6 +656,7 @@ Total: {len(all_classes_list)} classes."""
             question: User's question
             top_k: Number of chunks to retrieve
             max_dependencies: Maximum dependencies to include
+            on_answer_chunk: If set, receives answer text chunks as they stream
 
         Returns:
             RAGResponse with answer, sources, and dependencies
@@ -600,6 +666,7 @@ Total: {len(all_classes_list)} classes."""
             top_k=top_k,
             include_dependencies=True,
             max_dependencies=max_dependencies,
+            on_answer_chunk=on_answer_chunk,
         )
 
     def query_class_with_context(
@@ -607,6 +674,7 @@ Total: {len(all_classes_list)} classes."""
         class_name: str,
         include_referencing: bool = True,
         include_referenced: bool = True,
+        on_answer_chunk: Optional[Callable[[str], None]] = None,
     ) -> RAGResponse:
         """Query for a specific class with full dependency context.
 
@@ -614,48 +682,72 @@ Total: {len(all_classes_list)} classes."""
             class_name: Class name to look up
             include_referencing: Include chunks that reference this class
             include_referenced: Include classes this class references
+            on_answer_chunk: If set, receives answer text chunks as they stream
 
         Returns:
             RAGResponse with class context
         """
-        # Get the class chunk
-        class_chunk = self.store.get_class_chunk(class_name)
-        if not class_chunk:
-            return RAGResponse(
-                answer=f"Class `{class_name}` not found in the codebase.",
-                sources=[],
-                scores=[],
-                query=f"Lookup: {class_name}",
-                model=self.llm_model,
-                dependencies=[],
+        lookup_key = None
+        generation = None
+        if self.lookup_cache is not None:
+            lookup_key = self.lookup_cache.key(
+                class_name,
+                include_referencing,
+                include_referenced,
+                self.llm_model,
+                self.system_prompt,
+            )
+            # Read before fetching, so a re-index while the answer is
+            # generated leaves the stored entry already out of date
+            generation = self.store.index_generation()
+            cached = self._cached_class_lookup(lookup_key, generation)
+            if cached is not None:
+                return cached
+
+        # Chunks that reference this class (e.g., templates) only need its
+        # name, so they are searched in a worker thread while the class and
+        # the classes it references are fetched
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            referencing_future = (
+                executor.submit(self.store.search_by_class_reference, class_name, top_k=5)
+                if include_referencing
+                else None
             )
 
-        sources = [class_chunk]
-        scores = [1.0]
-        dependencies = []
+            # Get the class chunk
+            class_chunk = self.store.get_class_chunk(class_name)
+            if not class_chunk:
+                return RAGResponse(
+                    answer=f"Class `{class_name}` not found in the codebase.",
+                    sources=[],
+                    scores=[],
+                    query=f"Lookup: {class_name}",
+                    model=self.llm_model,
+                    dependencies=[],
+                )
+
+            # Get classes that this class references
+            ref_classes = class_chunk.references[:5] if include_referenced else []
+            ref_chunks = self.store.get_class_chunks(ref_classes) if ref_classes else {}
 
-        # Get chunks that reference this class (e.g., templates)
-        if include_referencing:
-            referencing = self.store.search_by_class_reference(class_name, top_k=5)
-            for chunk in referencing:
-                if chunk.id != class_chunk.id:
-                    dependencies.append(chunk)
+            referencing = referencing_future.result() if referencing_future else []
 
-        # Get classes that this class references
-        if include_referenced and class_chunk.references:
-            for ref_class in class_chunk.references[:5]:
-                ref_chunk = self.store.get_class_chunk(ref_class)
-                if ref_chunk and ref_chunk.id != class_chunk.id:
-                    dependencies.append(ref_chunk)
+        sources = [class_chunk]
+        scores = [1.0]
+        dependencies = [chunk for chunk in referencing if chunk.id != class_chunk.id]
+        for ref_class in ref_classes:
+            ref_chunk = ref_chunks.get(ref_class)
+            if ref_chunk and ref_chunk.id != class_chunk.id:
+                dependencies.append(ref_chunk)
 
         # Build context
         context = self._build_context(sources, dependencies)
 
         # Generate comprehensive answer
         question = f"Describe the {class_name} class, its purpose, and its relationships with other code."
-        answer = self._generate_answer(question, context)
+        answer = self._generate_answer(question, context, on_answer_chunk=on_answer_chunk)
 
-        return RAGResponse(
+        response = RAGResponse(
             answer=answer,
             sources=sources,
             scores=scores,
@@ -663,15 +755,53 @@ Total: {len(all_classes_list)} classes."""
             model=self.llm_model,
             dependencies=dependencies,
         )
+        if lookup_key is not None and generation is not None:
+            self.lookup_cache.put(
+                lookup_key,
+                str(generation),
+                {
+                    "answer": response.answer,
+                    "sources": [chunk.to_dict() for chunk in response.sources],
+                    "scores": response.scores,
+                    "query": response.query,
+                    "model": response.model,
+                    "dependencies": [chunk.to_dict() for chunk in response.dependencies],
+                },
+            )
+        return response
+
+    def _cached_class_lookup(
+        self, key: bytes, generation: Optional[int]
+    ) -> Optional[RAGResponse]:
+        """Return a cached class lookup built at this index generation, else None."""
+        if generation is None:
+            return None
+        entry = self.lookup_cache.get(key)
+        if entry is None or entry[0] != str(generation):
+            return None
+        data = entry[1]
+
+        sources = [CodeChunk.from_dict(chunk) for chunk in data["sources"]]
+        dependencies = [CodeChunk.from_dict(chunk) for chunk in data["dependencies"]]
+        return RAGResponse(
+            answer=data["answer"],
+            sources=sources,
+            scores=data["scores"],
+            query=data["query"],
+            model=data["model"],
+            dependencies=dependencies,
+        )
 
     def find_template_dependencies(
         self,
         template_path: str,
+        on_answer_chunk: Optional[Callable[[str], None]] = None,
     ) -> RAGResponse:
         """Find all Java classes referenced by a template.
 
         Args:
             template_path: Path to the template file
+            on_answer_chunk: If set, receives answer text chunks as they stream
 
         Returns:
             RAGResponse with the template and its Java dependencies
@@ -699,8 +829,9 @@ Total: {len(all_classes_list)} classes."""
 
         # Get all referenced classes
         if template_chunk.references:
+            class_chunks = self.store.get_class_chunks(template_chunk.references)
             for class_name in template_chunk.references:
-                class_chunk = self.store.get_class_chunk(class_name)
+                class_chunk = class_chunks.get(class_name)
                 if class_chunk:
                     dependencies.append(class_chunk)
 
@@ -709,7 +840,7 @@ Total: {len(all_classes_list)} classes."""
 
         # Generate answer
         question = f"Explain the template and its Java class dependencies."
-        answer = self._generate_answer(question, context)
+        answer = self._generate_answer(question, context, on_answer_chunk=on_answer_chunk)
 
         return RAGResponse(
             answer=answer,
@@ -737,21 +868,35 @@ Total: {len(all_classes_list)} classes."""
         seen_ids = {c.id for c in chunks}
         dependencies = []
 
+        # Look up every referenced class, and everything referencing the
+        # templates/documents, in one query each instead of one per chunk
+        class_chunks = self.store.get_class_chunks(
+            class_name
+            for chunk in chunks
+            if chunk.references
+            for class_name in chunk.references[:max_per_chunk]
+        )
+        referencing_chunks = self.store.search_by_class_references(
+            (
+                chunk.class_name
+                for chunk in chunks
+                if chunk.chunk_type in ("template", "document") and chunk.class_name
+            ),
+            top_k=max_per_chunk,
+        )
+
         for chunk in chunks:
             # Get classes referenced by this chunk
             if chunk.references:
                 for class_name in chunk.references[:max_per_chunk]:
-                    dep_chunk = self.store.get_class_chunk(class_name)
+                    dep_chunk = class_chunks.get(class_name)
                     if dep_chunk and dep_chunk.id not in seen_ids:
                         dependencies.append(dep_chunk)
                         seen_ids.add(dep_chunk.id)
 
             # For templates/documents, also find what references them
             if chunk.chunk_type in ("template", "document") and chunk.class_name:
-                referencing = self.store.search_by_class_reference(
-                    chunk.class_name, top_k=max_per_chunk
-                )
-                for ref_chunk in referencing:
+                for ref_chunk in referencing_chunks[chunk.class_name]:
                     if ref_chunk.id not in seen_ids:
                         dependencies.append(ref_chunk)
                         seen_ids.add(ref_chunk.id)
@@ -764,6 +909,8 @@ Total: {len(all_classes_list)} classes."""
         top_k: int = 10,
         language: Optional[str] = None,
         chunk_type: Optional[str] = None,
+        use_hybrid_search: bool = False,
+        preview_chars: Optional[int] = None,
     ) -> list[tuple[CodeChunk, float]]:
         """Retrieve relevant chunks without generating an answer.
 
@@ -772,10 +919,31 @@ Total: {len(all_classes_list)} classes."""
             top_k: Number of chunks to retrieve
             language: Filter by language
             chunk_type: Filter by chunk type
+            use_hybrid_search: Fuse semantic and keyword results with RRF
+                (scores are then RRF scores, not cosine similarities)
+            preview_chars: Only fetch this many leading characters of each
+                chunk's content, for callers that only display a preview
 
         Returns:
             List of (chunk, score) tuples
         """
+        if use_hybrid_search:
+            chunks, scores = self._hybrid_search(
+                question=question,
+                analysis=analyze_query(question),
+                top_k=top_k,
+                language=language,
+                chunk_type=chunk_type,
+                min_similarity=0.0,
+                preview_chars=preview_chars,
+            )
+            return list(zip(chunks, scores))
+
+        if chunk_type is None:
+            prefetched = self._prefetched.pop((question, language, preview_chars), None)
+            if prefetched is not None and prefetched[0] >= top_k:
+                return prefetched[1][:top_k]
+
         query_embedding = self.embedder.embed_text(question)
 
         return self.store.search(
@@ -783,6 +951,44 @@ Total: {len(all_classes_list)} classes."""
             top_k=top_k,
             language=language,
             chunk_type=chunk_type,
+            preview_chars=preview_chars,
+        )
+
+    def prefetch_retrievals(
+        self,
+        questions: list[str],
+        top_k: int,
+        language: Optional[str] = None,
+        preview_chars: Optional[int] = None,
+    ) -> None:
+        """Run semantic retrieval for several questions in two round trips.
+
+        The questions are embedded in one API call and searched in one
+        statement. Results are held until retrieve_only is called for the
+        same question, language and preview_chars with top_k at most the
+        prefetched top_k (and no hybrid search or chunk_type filter).
+
+        Args:
+            questions: Questions about to be passed to retrieve_only
+            top_k: Results to fetch per question (the largest top_k later used)
+            language: Filter by language
+            preview_chars: Only fetch this many leading characters of each
+                chunk's content
+        """
+        questions = list(dict.fromkeys(questions))
+        if not questions:
+            return
+
+        embeddings = self.embedder.embed_queries(questions)
+        results = self.store.search_many(
+            embeddings,
+            top_k=top_k,
+            language=language,
+            preview_chars=preview_chars,
+        )
+        self._prefetched.update(
+            ((question, language, preview_chars), (top_k, question_results))
+            for question, question_results in zip(questions, results)
         )
 
     def _build_context(
@@ -795,8 +1001,7 @@ Total: {len(all_classes_list)} classes."""
 
         # Main chunks
         for i, chunk in enumerate(chunks, 1):
-            location = f"{chunk.file_path}:{chunk.start_line}-{chunk.end_line}"
-            header = f"--- Code Snippet {i} ({location}) ---"
+            header = f"--- Code Snippet {i} ({chunk.location}) ---"
 
             if chunk.documentation:
                 header += f"\nDocumentation: {chunk.documentation}"
@@ -812,10 +1017,9 @@ Total: {len(all_classes_list)} classes."""
         if dependencies:
             context_parts.append("\n--- Related Dependencies ---\n")
             for i, chunk in enumerate(dependencies, 1):
-                location = f"{chunk.file_path}:{chunk.start_line}-{chunk.end_line}"
                 chunk_type = chunk.chunk_type or "code"
                 header = f"--- Dependency {i}: {chunk.class_name or chunk.file_path} ({chunk_type}) ---"
-                header += f"\nLocation: {location}"
+                header += f"\nLocation: {chunk.location}"
 
                 context_parts.append(
                     f"{header}\n\n```{chunk.language}\n{chunk.content}\n```"
@@ -824,9 +1028,17 @@ Total: {len(all_classes_list)} classes."""
         return "\n\n".join(context_parts)
 
     def _generate_answer(
-        self, question: str, context: str, is_list_query: bool = False
+        self,
+        question: str,
+        context: str,
+        is_list_query: bool = False,
+        on_answer_chunk: Optional[Callable[[str], None]] = None,
     ) -> str:
-        """Generate an answer using the LLM."""
+        """Generate an answer using the LLM.
+
+        With on_answer_chunk set, the answer is streamed and each text chunk
+        is passed to it as it arrives; the full answer is still returned.
+        """
         # Check if context contains a complete class list
         has_complete_list = "DATABASE QUERY RESULT" in context or is_list_query
 
@@ -888,18 +1100,31 @@ Answer:"""
         print(f"[DEBUG] Calling LLM ({self.llm_model}) with prompt length: {len(prompt)} chars", file=sys.stderr)
         print(f"[DEBUG] Context length: {len(context)} chars", file=sys.stderr)
         
+        config = {
+            "system_instruction": system_instruction,
+            "temperature": 0.3,
+            "max_output_tokens": 8192,  # Increased to allow full class listings
+        }
+
         try:
-            response = self.client.models.generate_content(
-                model=self.llm_model,
-                contents=prompt,
-                config={
-                    "system_instruction": system_instruction,
-                    "temperature": 0.3,
-                    "max_output_tokens": 8192,  # Increased to allow full class listings
-                },
-            )
-            
-            answer_text = response.text
+            if on_answer_chunk is None:
+                response = self.client.models.generate_content(
+                    model=self.llm_model,
+                    contents=prompt,
+                    config=config,
+                )
+                answer_text = response.text
+            else:
+                parts = []
+                for chunk in self.client.models.generate_content_stream(
+                    model=self.llm_model,
+                    contents=prompt,
+                    config=config,
+                ):
+                    if chunk.text:
+                        parts.append(chunk.text)
+                        on_answer_chunk(chunk.text)
+                answer_text = "".join(parts)
             print(f"[DEBUG] LLM response received, length: {len(answer_text)} chars", file=sys.stderr)
             return answer_text
         except Exception as e:
@@ -931,21 +1156,25 @@ class InteractiveRetriever:
         self,
         question: str,
         top_k: int = 5,
+        on_answer_chunk: Optional[Callable[[str], None]] = None,
     ) -> RAGResponse:
         """Query with conversation context.
 
         Args:
             question: User's question
             top_k: Number of chunks to retrieve
+            on_answer_chunk: If set, receives answer text chunks as they stream
 
         Returns:
             RAGResponse with answer and sources
         """
         # Add conversation context to retrieval
-        enhanced_question = self._enhance_question(question)
+        enhanced_question = self.enhance_question(question)
 
         # Get response
-        response = self.retriever.query(enhanced_question, top_k=top_k)
+        response = self.retriever.query(
+            enhanced_question, top_k=top_k, on_answer_chunk=on_answer_chunk
+        )
 
         # Update history
         self.history.append(
@@ -967,8 +1196,8 @@ class InteractiveRetriever:
 
         return response
 
-    def _enhance_question(self, question: str) -> str:
-        """Enhance question with conversation context."""
+    def enhance_question(self, question: str) -> str:
+        """Enhance question with conversation context, as query() retrieves it."""
         if not self.history:
             return question
 
@@ -1,19 +1,55 @@
 """PostgreSQL + pgvector storage for code embeddings."""
 
+import asyncio
+import hashlib
 import json
 import os
-from typing import Optional
+import threading
+from contextlib import contextmanager
+from typing import Iterable, Iterator, NamedTuple, Optional, Union
 
 import numpy as np
 import psycopg
 from pgvector.psycopg import register_vector
+from psycopg.pq import TransactionStatus
+from psycopg.types.json import Jsonb
 
 from .chunker import CodeChunk
 
 
+class ClassSummary(NamedTuple):
+    """Location of an indexed class, as returned by PgVectorStore.list_classes."""
+
+    language: str
+    class_name: Optional[str]
+    file_path: str
+    start_line: int
+    end_line: int
+
+    @property
+    def location(self) -> str:
+        """File path and line range, e.g. ``src/app.py:10-42``."""
+        return f"{self.file_path}:{self.start_line}-{self.end_line}"
+
+
 class PgVectorStore:
     """Store and search code embeddings using PostgreSQL + pgvector."""
 
+    # HNSW graph parameters (pgvector defaults)
+    HNSW_M = 16
+    HNSW_EF_CONSTRUCTION = 64
+
+    # Candidate list size for HNSW searches (pgvector default); higher
+    # values trade latency for recall
+    DEFAULT_EF_SEARCH = 40
+
+    # Upper bound pgvector accepts for hnsw.ef_search
+    MAX_EF_SEARCH = 1000
+
+    # Candidates fetched per result from the binary-quantized index before
+    # rescoring them with full-precision distances (quantized_search)
+    BINARY_RESCORE_FACTOR = 4
+
     def __init__(
         self,
         host: Optional[str] = None,
@@ -23,6 +59,10 @@ class PgVectorStore:
         password: Optional[str] = None,
         table_name: str = "code_chunks",
         embedding_dimensions: int = 768,
+        ef_search: Optional[int] = None,
+        max_connections: int = 1,
+        quantized_search: bool = False,
+        embedding_model: Optional[str] = None,
     ):
         """Initialize the vector store.
 
@@ -34,6 +74,18 @@ class PgVectorStore:
             password: Database password (defaults to PGPASSWORD env var)
             table_name: Table name for storing chunks
             embedding_dimensions: Dimensions of embedding vectors
+            ef_search: HNSW candidate list size per search (defaults to
+                DEFAULT_EF_SEARCH; always raised to at least top_k)
+            max_connections: Connections for concurrent searches. Above 1,
+                reads go through a psycopg_pool.ConnectionPool so threads
+                (e.g. web requests) do not queue on one connection; writes
+                always use the dedicated connection.
+            quantized_search: Search the binary-quantized index built by
+                create_binary_index() first and rescore its candidates with
+                full-precision distances. Ignored if that index does not exist.
+            embedding_model: Model that produced the stored vectors; folded
+                into each row's content_hash so chunks embedded by another
+                model are never treated as unchanged
         """
         self.host = host or os.environ.get("PGHOST", "localhost")
         self.port = port or int(os.environ.get("PGPORT", "5432"))
@@ -42,8 +94,17 @@ class PgVectorStore:
         self.password = password or os.environ.get("PGPASSWORD", "")
         self.table_name = table_name
         self.embedding_dimensions = embedding_dimensions
+        self.ef_search = ef_search or self.DEFAULT_EF_SEARCH
+        self.max_connections = max_connections
+        self.quantized_search = quantized_search
+        self.embedding_model = embedding_model
 
         self._conn = None
+        self._pool = None
+        # Serializes reads on the dedicated connection across threads
+        self._conn_lock = threading.RLock()
+        # Whether create_binary_index() has been run, looked up on first search
+        self._has_binary_index: Optional[bool] = None
 
     @property
     def connection_string(self) -> str:
@@ -59,8 +120,62 @@ class PgVectorStore:
             self._conn.commit()
         register_vector(self._conn)
 
+        if self.max_connections > 1:
+            from psycopg_pool import ConnectionPool
+
+            self._pool = ConnectionPool(
+                self.connection_string,
+                min_size=min(2, self.max_connections),
+                max_size=self.max_connections,
+                configure=self._configure_pooled,
+                open=True,
+            )
+
+    @staticmethod
+    def _configure_pooled(conn: psycopg.Connection) -> None:
+        """Prepare a new pool connection; the pool requires it left idle."""
+        register_vector(conn)
+        conn.commit()
+
+    @contextmanager
+    def _cursor(self) -> Iterator[psycopg.Cursor]:
+        """Cursor for read queries, from the pool when one is open.
+
+        A pooled connection's transaction is committed when it is returned,
+        so per-query settings such as SET LOCAL never leak between callers.
+        On the dedicated connection, a read that opens a transaction also
+        ends it, so the connection does not sit idle in transaction (holding
+        a snapshot and table locks that block DDL and vacuum) while the
+        caller waits on e.g. LLM generation. Reads inside a caller's open
+        transaction leave it alone. The connection is shared by the
+        retriever's worker threads, so the whole block (SET LOCAL, query,
+        fetch and commit) runs under a lock; otherwise a thread could start
+        while another's read is in flight, take that transaction for the
+        caller's and leave the connection idle in transaction once it commits.
+        """
+        if self._pool is None:
+            with self._conn_lock:
+                owns_transaction = (
+                    self._conn.info.transaction_status == TransactionStatus.IDLE
+                )
+                try:
+                    with self._conn.cursor() as cur:
+                        yield cur
+                except BaseException:
+                    if owns_transaction:
+                        self._conn.rollback()
+                    raise
+                if owns_transaction:
+                    self._conn.commit()
+        else:
+            with self._pool.connection() as conn, conn.cursor() as cur:
+                yield cur
+
     def close(self) -> None:
         """Close database connection."""
+        if self._pool:
+            self._pool.close()
+            self._pool = None
         if self._conn:
             self._conn.close()
             self._conn = None
@@ -95,21 +210,70 @@ class PgVectorStore:
                     documentation TEXT,
                     "references" TEXT[],
                     metadata JSONB,
+                    content_hash TEXT,
                     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
                 )
             """)
 
+            # Tables created before content hashing was added lack the column
+            cur.execute(f"""
+                ALTER TABLE {self.table_name}
+                ADD COLUMN IF NOT EXISTS content_hash TEXT
+            """)
+
+            # Single-row counter bumped by every write (see index_generation);
+            # kept across drop_table() so a reset still reads as a change
+            cur.execute(f"""
+                CREATE TABLE IF NOT EXISTS {self.table_name}_generation (
+                    id BOOLEAN PRIMARY KEY DEFAULT TRUE CHECK (id),
+                    generation BIGINT NOT NULL DEFAULT 0
+                )
+            """)
+            cur.execute(f"""
+                INSERT INTO {self.table_name}_generation (id) VALUES (TRUE)
+                ON CONFLICT DO NOTHING
+            """)
+
             # Create index for file path lookups (fast, can create on empty table)
             cur.execute(f"""
                 CREATE INDEX IF NOT EXISTS {self.table_name}_file_path_idx
                 ON {self.table_name} (file_path)
             """)
 
+            # Covering index for class lookups (get_class_chunk, list_classes);
+            # INCLUDE allows index-only scans that return file_path without heap fetches
+            cur.execute(f"""
+                CREATE INDEX IF NOT EXISTS {self.table_name}_type_class_lang_idx
+                ON {self.table_name} (chunk_type, class_name, language)
+                INCLUDE (file_path)
+            """)
+
             self._conn.commit()
-        
-        # Note: Vector index (IVFFlat) is created after data insertion for better performance
+
+        self._create_trigram_indexes()
+
+        # Note: Vector index (HNSW) is created after data insertion for better performance
         # See create_vector_index() method
 
+    def _create_trigram_indexes(self) -> None:
+        """Create pg_trgm GIN indexes for substring (LIKE '%...%') lookups.
+
+        B-tree indexes cannot serve patterns with a leading wildcard. pg_trgm
+        ships with PostgreSQL contrib; if it is unavailable, the indexes are
+        skipped and such lookups fall back to sequential scans.
+        """
+        try:
+            with self._conn.cursor() as cur:
+                cur.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+                for column in ("file_path", "class_name"):
+                    cur.execute(f"""
+                        CREATE INDEX IF NOT EXISTS {self.table_name}_{column}_trgm_idx
+                        ON {self.table_name} USING gin ({column} gin_trgm_ops)
+                    """)
+            self._conn.commit()
+        except psycopg.Error:
+            self._conn.rollback()
+
     def drop_table(self) -> None:
         """Drop the chunks table and its indexes.
         
@@ -121,49 +285,233 @@ class PgVectorStore:
             cur.execute(f"DROP TABLE IF EXISTS {self.table_name} CASCADE")
             self._conn.commit()
     
-    def create_vector_index(self) -> None:
-        """Create the IVFFlat vector index after data is inserted.
-        
-        IVFFlat indexes work better when created after data exists.
-        This should be called after bulk inserts for optimal performance.
+    def create_vector_index(
+        self,
+        maintenance_workers: Optional[int] = None,
+        maintenance_work_mem: Optional[str] = None,
+    ) -> None:
+        """Create the HNSW vector index after data is inserted.
+
+        HNSW keeps searches logarithmic in the number of chunks. Building
+        the graph once after bulk inserts is much faster than maintaining
+        it row by row, so this should be called after loading. An existing
+        IVFFlat index from older versions is replaced.
+
+        Args:
+            maintenance_workers: Parallel workers PostgreSQL may use for the
+                build (server default if not set)
+            maintenance_work_mem: Memory for the build, e.g. "2GB" (server
+                default if not set). HNSW builds are much faster while the
+                graph fits in memory.
         """
+        self._discard_failed_transaction()
         with self._conn.cursor() as cur:
             # Check if index already exists
             cur.execute(f"""
-                SELECT COUNT(*) FROM pg_indexes 
+                SELECT indexdef FROM pg_indexes 
                 WHERE indexname = '{self.table_name}_embedding_idx'
             """)
-            exists = cur.fetchone()[0] > 0
-            
+            row = cur.fetchone()
+            exists = row is not None and "USING hnsw" in row[0]
+
+            if row is not None and not exists:
+                # Replace the IVFFlat index built by older versions
+                cur.execute(f"DROP INDEX {self.table_name}_embedding_idx")
+
             if not exists:
-                # Calculate optimal lists parameter based on row count
-                cur.execute(f"SELECT COUNT(*) FROM {self.table_name}")
-                row_count = cur.fetchone()[0]
-                
-                # IVFFlat lists should be rows / 1000 for good performance
-                # But cap between 10 and 1000
-                lists = max(10, min(1000, row_count // 1000))
-                
+                self._set_index_build_settings(cur, maintenance_workers, maintenance_work_mem)
                 cur.execute(f"""
                     CREATE INDEX {self.table_name}_embedding_idx
                     ON {self.table_name}
-                    USING ivfflat (embedding vector_cosine_ops)
-                    WITH (lists = {lists})
+                    USING hnsw (embedding vector_cosine_ops)
+                    WITH (m = {self.HNSW_M}, ef_construction = {self.HNSW_EF_CONSTRUCTION})
                 """)
                 self._conn.commit()
 
+    def create_binary_index(
+        self,
+        maintenance_workers: Optional[int] = None,
+        maintenance_work_mem: Optional[str] = None,
+    ) -> None:
+        """Create an HNSW index over binary-quantized embeddings.
+
+        Each embedding is reduced to one bit per dimension and compared by
+        Hamming distance, so the graph is 32x smaller than the float index
+        and cheaper to traverse. Used by quantized_search; requires
+        pgvector 0.7+. Like create_vector_index(), call it after loading.
+
+        Args:
+            maintenance_workers: Parallel workers PostgreSQL may use for the
+                build (server default if not set)
+            maintenance_work_mem: Memory for the build (server default if not set)
+        """
+        self._discard_failed_transaction()
+        try:
+            with self._conn.cursor() as cur:
+                self._set_index_build_settings(cur, maintenance_workers, maintenance_work_mem)
+                cur.execute(f"""
+                    CREATE INDEX IF NOT EXISTS {self.table_name}_embedding_bit_idx
+                    ON {self.table_name}
+                    USING hnsw ((binary_quantize(embedding)::bit({self.embedding_dimensions})) bit_hamming_ops)
+                    WITH (m = {self.HNSW_M}, ef_construction = {self.HNSW_EF_CONSTRUCTION})
+                """)
+            self._conn.commit()
+        except psycopg.Error:
+            # e.g. pgvector older than 0.7; leave the connection usable
+            self._conn.rollback()
+            raise
+        self._has_binary_index = True
+
+    def _discard_failed_transaction(self) -> None:
+        """Roll back a transaction aborted by an earlier error.
+
+        Lets the indexes be rebuilt on the same connection after a load
+        failed partway (e.g. in an upsert).
+        """
+        if self._conn.info.transaction_status == TransactionStatus.INERROR:
+            self._conn.rollback()
+
+    @staticmethod
+    def _set_index_build_settings(
+        cur: psycopg.Cursor,
+        maintenance_workers: Optional[int],
+        maintenance_work_mem: Optional[str],
+    ) -> None:
+        """Apply index build settings until the current transaction commits."""
+        if maintenance_workers is not None:
+            cur.execute(
+                f"SET LOCAL max_parallel_maintenance_workers = {int(maintenance_workers)}"
+            )
+        if maintenance_work_mem is not None:
+            cur.execute(
+                "SELECT set_config('maintenance_work_mem', %s, true)",
+                (str(maintenance_work_mem),),
+            )
+
+    def _use_binary_index(self) -> bool:
+        """Whether searches should go through the binary-quantized index."""
+        if not self.quantized_search:
+            return False
+        if self._has_binary_index is None:
+            with self._cursor() as cur:
+                cur.execute(
+                    "SELECT to_regclass(%s)", (f"{self.table_name}_embedding_bit_idx",)
+                )
+                self._has_binary_index = cur.fetchone()[0] is not None
+        return self._has_binary_index
+
+    def prewarm_vector_index(self) -> bool:
+        """Load the HNSW index into shared buffers ahead of the first search.
+
+        After a server restart the first searches otherwise read the graph
+        from disk page by page. Uses pg_prewarm (PostgreSQL contrib) when
+        available, else runs one probe search, which at least loads the
+        upper graph layers. Best effort: database errors are swallowed.
+
+        Runs on its own short-lived connection, so it is safe to call from
+        a background thread while this store serves queries.
+
+        Returns:
+            True if the whole index was loaded with pg_prewarm
+        """
+        index_name = f"{self.table_name}_embedding_idx"
+        probe = "[" + ",".join(["1"] + ["0"] * (self.embedding_dimensions - 1)) + "]"
+        try:
+            with psycopg.connect(self.connection_string, autocommit=True) as conn:
+                if conn.execute("SELECT to_regclass(%s)", (index_name,)).fetchone()[0] is None:
+                    return False
+                try:
+                    conn.execute("CREATE EXTENSION IF NOT EXISTS pg_prewarm")
+                    conn.execute("SELECT pg_prewarm(%s::regclass)", (index_name,))
+                    return True
+                except psycopg.Error:
+                    conn.execute(
+                        f"SELECT id FROM {self.table_name} "
+                        "ORDER BY embedding <=> %s::vector LIMIT 1",
+                        (probe,),
+                    )
+                    return False
+        except psycopg.Error:
+            return False
+
+    def drop_vector_index(self) -> None:
+        """Drop the vector indexes so bulk loads skip per-row index maintenance.
+
+        Call create_vector_index() (and create_binary_index() if used)
+        afterwards to rebuild them in one pass.
+        """
+        with self._conn.cursor() as cur:
+            cur.execute(f"DROP INDEX IF EXISTS {self.table_name}_embedding_idx")
+            cur.execute(f"DROP INDEX IF EXISTS {self.table_name}_embedding_bit_idx")
+            self._conn.commit()
+        self._has_binary_index = False
+
+    # Columns written by upsert/upsert_copy, in row order
+    UPSERT_COLUMNS = (
+        "id", "content", "embedding", "language", "chunk_type", "file_path",
+        "start_line", "end_line", "class_name", "method_name", "documentation",
+        '"references"', "metadata", "content_hash",
+    )
+
+    # Postgres types of UPSERT_COLUMNS, needed for binary COPY
+    UPSERT_COLUMN_TYPES = (
+        "text", "text", "vector", "text", "text", "text",
+        "int4", "int4", "text", "text", "text",
+        "text[]", "jsonb", "text",
+    )
+
+    def embedding_hash(self, chunk: CodeChunk) -> str:
+        """Hash stored in content_hash: the chunk's content plus the embedding setup.
+
+        Covering the model and dimensions means switching rag.embedding_model
+        re-embeds every chunk instead of mixing two vector spaces in one table.
+        """
+        key = f"{self.embedding_model}\0{self.embedding_dimensions}\0{chunk.content_hash}"
+        return hashlib.blake2b(key.encode(), digest_size=16).hexdigest()
+
+    def _chunk_to_row(self, chunk: CodeChunk, embedding: list[float]) -> tuple:
+        """Build a row tuple (in UPSERT_COLUMNS order) for a chunk."""
+        return (
+            chunk.id,
+            chunk.content,
+            np.asarray(embedding, dtype=np.float32),
+            chunk.language,
+            chunk.chunk_type,
+            chunk.file_path,
+            chunk.start_line,
+            chunk.end_line,
+            chunk.class_name,
+            chunk.method_name,
+            chunk.documentation,
+            chunk.references if chunk.references else None,
+            Jsonb(chunk.metadata) if chunk.metadata else None,
+            self.embedding_hash(chunk),
+        )
+
+    def _upsert_conflict_clause(self) -> str:
+        """ON CONFLICT clause updating every column except the id."""
+        updates = ",\n".join(
+            f"{col} = EXCLUDED.{col}" for col in self.UPSERT_COLUMNS if col != "id"
+        )
+        return f"ON CONFLICT (id) DO UPDATE SET\n{updates}"
+
     def upsert(
         self,
         chunks: list[CodeChunk],
         embeddings: list[list[float]],
-        batch_size: int = 500,
+        batch_size: int = 1000,
     ) -> int:
         """Insert or update chunks with embeddings using batch inserts.
 
+        Parameters are sent in binary format, so embeddings travel as
+        pgvector's binary representation rather than formatted float text.
+        psycopg pipelines executemany() and prepares the repeated statement
+        server-side.
+
         Args:
             chunks: List of code chunks
             embeddings: Corresponding embedding vectors
-            batch_size: Number of chunks to insert per batch (default 500)
+            batch_size: Number of chunks to insert per batch (default 1000)
 
         Returns:
             Number of rows upserted
@@ -173,6 +521,8 @@ class PgVectorStore:
 
         total = len(chunks)
         inserted = 0
+        columns = ", ".join(self.UPSERT_COLUMNS)
+        placeholders = ", ".join(["%s"] * len(self.UPSERT_COLUMNS))
 
         # Process in batches for better performance
         for batch_start in range(0, total, batch_size):
@@ -180,50 +530,23 @@ class PgVectorStore:
             batch_chunks = chunks[batch_start:batch_end]
             batch_embeddings = embeddings[batch_start:batch_end]
 
-            with self._conn.cursor() as cur:
+            with self._conn.cursor(binary=True) as cur:
                 # Prepare batch data
-                batch_data = []
-                for chunk, embedding in zip(batch_chunks, batch_embeddings):
-                    embedding_vec = np.array(embedding, dtype=np.float32)
-                    batch_data.append((
-                        chunk.id,
-                        chunk.content,
-                        embedding_vec,
-                        chunk.language,
-                        chunk.chunk_type,
-                        chunk.file_path,
-                        chunk.start_line,
-                        chunk.end_line,
-                        chunk.class_name,
-                        chunk.method_name,
-                        chunk.documentation,
-                        chunk.references if chunk.references else None,
-                        json.dumps(chunk.metadata) if chunk.metadata else None,
-                    ))
+                batch_data = [
+                    self._chunk_to_row(chunk, embedding)
+                    for chunk, embedding in zip(batch_chunks, batch_embeddings)
+                ]
 
                 # Use executemany for batch insert (much faster than individual inserts)
                 cur.executemany(
                     f"""
-                    INSERT INTO {self.table_name}
-                    (id, content, embedding, language, chunk_type, file_path,
-                     start_line, end_line, class_name, method_name, documentation, "references", metadata)
-                    VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
-                    ON CONFLICT (id) DO UPDATE SET
-                        content = EXCLUDED.content,
-                        embedding = EXCLUDED.embedding,
-                        language = EXCLUDED.language,
-                        chunk_type = EXCLUDED.chunk_type,
-                        file_path = EXCLUDED.file_path,
-                        start_line = EXCLUDED.start_line,
-                        end_line = EXCLUDED.end_line,
-                        class_name = EXCLUDED.class_name,
-                        method_name = EXCLUDED.method_name,
-                        documentation = EXCLUDED.documentation,
-                        "references" = EXCLUDED."references",
-                        metadata = EXCLUDED.metadata
+                    INSERT INTO {self.table_name} ({columns})
+                    VALUES ({placeholders})
+                    {self._upsert_conflict_clause()}
                     """,
                     batch_data,
                 )
+                self._bump_generation(cur)
 
             # Commit after each batch to avoid long transactions
             self._conn.commit()
@@ -231,14 +554,106 @@ class PgVectorStore:
 
         return inserted
 
+    def upsert_copy(
+        self,
+        chunks: list[CodeChunk],
+        embeddings: list[list[float]],
+    ) -> int:
+        """Insert or update chunks using binary COPY.
+
+        Args:
+            chunks: List of code chunks
+            embeddings: Corresponding embedding vectors
+
+        Returns:
+            Number of rows upserted
+        """
+        if len(chunks) != len(embeddings):
+            raise ValueError("Chunks and embeddings must have same length")
+        return self.copy_stream(zip(chunks, embeddings))
+
+    def copy_stream(
+        self,
+        chunk_embeddings: Iterable[tuple[CodeChunk, list[float]]],
+    ) -> int:
+        """Insert or update (chunk, embedding) pairs streamed through binary COPY.
+
+        Rows are written with COPY ... (FORMAT BINARY) into a temporary
+        staging table as the iterable is consumed, then merged with a single
+        INSERT ... SELECT ... ON CONFLICT. This avoids per-row statement
+        overhead and text encoding of the embedding floats (pgvector's
+        registered dumper sends them in its binary wire format), which makes
+        it much faster than upsert() for bulk loads.
+
+        Args:
+            chunk_embeddings: Iterable of (chunk, embedding) pairs
+
+        Returns:
+            Number of rows upserted
+        """
+        staging_table = f"{self.table_name}_staging"
+        columns = ", ".join(self.UPSERT_COLUMNS)
+        written = 0
+
+        with self._conn.cursor() as cur:
+            cur.execute(f"""
+                CREATE TEMP TABLE IF NOT EXISTS {staging_table}
+                (LIKE {self.table_name} INCLUDING DEFAULTS)
+                ON COMMIT DELETE ROWS
+            """)
+
+            with cur.copy(
+                f"COPY {staging_table} ({columns}) FROM STDIN (FORMAT BINARY)"
+            ) as copy:
+                copy.set_types(list(self.UPSERT_COLUMN_TYPES))
+                for chunk, embedding in chunk_embeddings:
+                    copy.write_row(self._chunk_to_row(chunk, embedding))
+                    written += 1
+
+            if not written:
+                self._conn.rollback()
+                return 0
+
+            # DISTINCT ON guards against duplicate ids within one load, which
+            # ON CONFLICT DO UPDATE cannot apply twice in a single statement
+            cur.execute(f"""
+                INSERT INTO {self.table_name} ({columns})
+                SELECT DISTINCT ON (id) {columns} FROM {staging_table}
+                {self._upsert_conflict_clause()}
+            """)
+            upserted = cur.rowcount
+            self._bump_generation(cur)
+
+        self._conn.commit()
+        return upserted
+
+    async def upsert_async(
+        self,
+        chunk_embeddings: Iterable[tuple[CodeChunk, list[float]]],
+    ) -> int:
+        """Bulk-load (chunk, embedding) pairs without blocking the event loop.
+
+        Runs copy_stream in a worker thread so inserts can overlap with
+        embedding requests. Callers must not issue other queries on this
+        store while the upsert is in flight.
+
+        Args:
+            chunk_embeddings: Iterable of (chunk, embedding) pairs
+
+        Returns:
+            Number of rows upserted
+        """
+        return await asyncio.to_thread(self.copy_stream, chunk_embeddings)
+
     def search(
         self,
-        query_embedding: list[float],
+        query_embedding: Union[np.ndarray, list[float]],
         top_k: int = 10,
         language: Optional[str] = None,
         chunk_type: Optional[str] = None,
         file_path_prefix: Optional[str] = None,
         min_similarity: float = 0.0,
+        preview_chars: Optional[int] = None,
     ) -> list[tuple[CodeChunk, float]]:
         """Search for similar chunks using cosine similarity.
 
@@ -249,52 +664,56 @@ class PgVectorStore:
             chunk_type: Filter by chunk type
             file_path_prefix: Filter by file path prefix
             min_similarity: Minimum similarity threshold (0.0-1.0)
+            preview_chars: Only fetch this many leading characters of each
+                chunk's content (full content if None)
 
         Returns:
             List of (chunk, similarity_score) tuples, ordered by similarity
         """
-        # Build WHERE clause
-        conditions = []
-        params = [query_embedding, top_k]
-
-        if language:
-            conditions.append(f"language = %s")
-            params.insert(-1, language)
-        if chunk_type:
-            conditions.append(f"chunk_type = %s")
-            params.insert(-1, chunk_type)
-        if file_path_prefix:
-            conditions.append(f"file_path LIKE %s")
-            params.insert(-1, f"{file_path_prefix}%")
-
-        where_clause = ""
-        if conditions:
-            where_clause = "WHERE " + " AND ".join(conditions)
-
-        # Convert query_embedding to numpy array for pgvector
-        # pgvector adapter (registered via register_vector) will convert numpy array to vector type
-        query_vec = np.array(query_embedding, dtype=np.float32)
-
+        content_column = "content"
+        if preview_chars is not None:
+            content_column = "LEFT(content, %(preview_chars)s)"
+
+        # One fixed statement for every filter combination: unused filters
+        # are passed as NULL, so the text never changes and the server can
+        # reuse the prepared plan on every call
+        filters = """
+            (%(language)s::text IS NULL OR language = %(language)s)
+            AND (%(chunk_type)s::text IS NULL OR chunk_type = %(chunk_type)s)
+            AND (%(path_pattern)s::text IS NULL OR file_path LIKE %(path_pattern)s)
+        """
+        use_binary_index = self._use_binary_index()
         query = f"""
             SELECT
-                id, content, language, chunk_type, file_path,
+                id, {content_column}, language, chunk_type, file_path,
                 start_line, end_line, class_name, method_name,
                 documentation, "references", metadata,
-                1 - (embedding <=> %s) as similarity
-            FROM {self.table_name}
-            {where_clause}
-            ORDER BY embedding <=> %s
-            LIMIT %s
+                1 - (embedding <=> %(embedding)s) as similarity
+            FROM {self._search_source("%(embedding)s", filters, use_binary_index)}
+            WHERE {filters}
+            ORDER BY embedding <=> %(embedding)s
+            LIMIT %(top_k)s
         """
+        params = {
+            # pgvector adapter (registered via register_vector) converts
+            # the numpy array to the vector type
+            "embedding": np.asarray(query_embedding, dtype=np.float32),
+            "language": language or None,
+            "chunk_type": chunk_type or None,
+            "path_pattern": f"{file_path_prefix}%" if file_path_prefix else None,
+            "top_k": top_k,
+            "candidates": top_k * self.BINARY_RESCORE_FACTOR,
+            "preview_chars": preview_chars,
+        }
 
-        # Replace the first query_embedding with numpy array
-        # pgvector adapter will automatically convert it to vector type
-        params[0] = query_vec
-        # Add query_embedding again for ORDER BY
-        params.insert(-1, query_vec)
+        # HNSW returns at most ef_search rows, so never go below the rows
+        # the index scan must produce
+        scanned = params["candidates"] if use_binary_index else top_k
+        ef_search = min(max(self.ef_search, scanned), self.MAX_EF_SEARCH)
 
-        with self._conn.cursor() as cur:
-            cur.execute(query, params)
+        with self._cursor() as cur:
+            cur.execute(f"SET LOCAL hnsw.ef_search = {int(ef_search)}")
+            cur.execute(query, params, prepare=True)
             rows = cur.fetchall()
 
         results = []
@@ -326,12 +745,124 @@ class PgVectorStore:
 
         return results
 
+    def _search_source(
+        self, embedding_sql: str, filters_sql: str, use_binary_index: bool
+    ) -> str:
+        """FROM clause for a similarity search ordered by embedding distance.
+
+        Without the binary index this is the table itself, searched through
+        the float HNSW index. With it, a first stage takes the nearest
+        rows by Hamming distance between quantized vectors (as many as the
+        "candidates" parameter), and the caller's ORDER BY rescores only
+        those with full-precision distances.
+
+        Args:
+            embedding_sql: SQL expression of the query vector
+            filters_sql: WHERE condition the candidates must satisfy
+            use_binary_index: Whether to add the quantized first stage
+        """
+        if not use_binary_index:
+            return self.table_name
+        bits = f"bit({self.embedding_dimensions})"
+        return f"""(
+                SELECT * FROM {self.table_name}
+                WHERE {filters_sql}
+                ORDER BY binary_quantize(embedding)::{bits}
+                    <~> binary_quantize({embedding_sql})::{bits}
+                LIMIT %(candidates)s
+            ) AS candidates"""
+
+    def search_many(
+        self,
+        query_embeddings: list[Union[np.ndarray, list[float]]],
+        top_k: int = 10,
+        language: Optional[str] = None,
+        chunk_type: Optional[str] = None,
+        preview_chars: Optional[int] = None,
+    ) -> list[list[tuple[CodeChunk, float]]]:
+        """Run several similarity searches in one statement.
+
+        Each query vector drives its own HNSW scan through a LATERAL join,
+        so results match calling search() per vector while paying a single
+        round trip.
+
+        Args:
+            query_embeddings: Query vectors
+            top_k: Number of results per query
+            language: Filter by language
+            chunk_type: Filter by chunk type
+            preview_chars: Only fetch this many leading characters of each
+                chunk's content (full content if None)
+
+        Returns:
+            One list of (chunk, similarity_score) tuples per query vector,
+            aligned with query_embeddings and ordered by similarity
+        """
+        if not query_embeddings:
+            return []
+
+        content_column = "content"
+        if preview_chars is not None:
+            content_column = "LEFT(content, %(preview_chars)s)"
+
+        filters = """
+            (%(language)s::text IS NULL OR language = %(language)s)
+            AND (%(chunk_type)s::text IS NULL OR chunk_type = %(chunk_type)s)
+        """
+        use_binary_index = self._use_binary_index()
+        query = f"""
+            SELECT
+                r.id, r.content, r.language, r.chunk_type, r.file_path,
+                r.start_line, r.end_line, r.class_name, r.method_name,
+                r.documentation, r."references", r.metadata,
+                r.similarity, q.query_index
+            FROM unnest(%(embeddings)s::vector[])
+                WITH ORDINALITY AS q(query_embedding, query_index)
+            CROSS JOIN LATERAL (
+                SELECT
+                    id, {content_column} AS content, language, chunk_type,
+                    file_path, start_line, end_line, class_name, method_name,
+                    documentation, "references", metadata,
+                    1 - (embedding <=> q.query_embedding) AS similarity
+                FROM {self._search_source("q.query_embedding", filters, use_binary_index)}
+                WHERE {filters}
+                ORDER BY embedding <=> q.query_embedding
+                LIMIT %(top_k)s
+            ) AS r
+            ORDER BY q.query_index, r.similarity DESC
+        """
+        params = {
+            "embeddings": [
+                np.asarray(embedding, dtype=np.float32) for embedding in query_embeddings
+            ],
+            "language": language or None,
+            "chunk_type": chunk_type or None,
+            "top_k": top_k,
+            "candidates": top_k * self.BINARY_RESCORE_FACTOR,
+            "preview_chars": preview_chars,
+        }
+
+        scanned = params["candidates"] if use_binary_index else top_k
+        ef_search = min(max(self.ef_search, scanned), self.MAX_EF_SEARCH)
+
+        with self._cursor() as cur:
+            cur.execute(f"SET LOCAL hnsw.ef_search = {int(ef_search)}")
+            cur.execute(query, params, prepare=True)
+            rows = cur.fetchall()
+
+        results: list[list[tuple[CodeChunk, float]]] = [[] for _ in query_embeddings]
+        for row in rows:
+            # WITH ORDINALITY is 1-based
+            results[row[13] - 1].append((self._row_to_chunk(row), row[12]))
+        return results
+
     def keyword_search(
         self,
         keywords: list[str],
         top_k: int = 10,
         language: Optional[str] = None,
         chunk_type: Optional[str] = None,
+        preview_chars: Optional[int] = None,
     ) -> list[tuple[CodeChunk, float]]:
         """Search for chunks containing keywords using full-text search.
 
@@ -340,6 +871,8 @@ class PgVectorStore:
             top_k: Number of results to return
             language: Filter by language
             chunk_type: Filter by chunk type
+            preview_chars: Only fetch this many leading characters of each
+                chunk's content (full content if None)
 
         Returns:
             List of (chunk, relevance_score) tuples
@@ -375,8 +908,10 @@ class PgVectorStore:
         where_clause = "WHERE " + " AND ".join(conditions) if conditions else ""
 
         # Calculate a simple relevance score based on keyword matches
-        # Higher score = more keywords matched
+        # Higher score = more keywords matched. These placeholders appear in
+        # the SELECT list, before the WHERE clause, so their values go first.
         score_cases = []
+        select_params = []
         for keyword in keywords:
             keyword_lower = keyword.lower()
             score_cases.append(
@@ -385,7 +920,12 @@ class PgVectorStore:
                 f"CASE WHEN LOWER(COALESCE(method_name, '')) LIKE %s THEN 2 ELSE 0 END"
             )
             pattern = f"%{keyword_lower}%"
-            params.extend([pattern, pattern, pattern])
+            select_params.extend([pattern, pattern, pattern])
+
+        content_column = "content"
+        if preview_chars is not None:
+            content_column = "LEFT(content, %s)"
+            select_params.insert(0, preview_chars)
 
         score_expression = " + ".join(score_cases) if score_cases else "0"
         max_possible_score = (
@@ -394,7 +934,7 @@ class PgVectorStore:
 
         query = f"""
             SELECT
-                id, content, language, chunk_type, file_path,
+                id, {content_column}, language, chunk_type, file_path,
                 start_line, end_line, class_name, method_name,
                 documentation, "references", metadata,
                 ({score_expression})::float / {max_possible_score} as relevance
@@ -403,9 +943,9 @@ class PgVectorStore:
             ORDER BY relevance DESC
             LIMIT %s
         """
-        params.append(top_k)
+        params = select_params + params + [top_k]
 
-        with self._conn.cursor() as cur:
+        with self._cursor() as cur:
             cur.execute(query, params)
             rows = cur.fetchall()
 
@@ -450,7 +990,7 @@ class PgVectorStore:
         Returns:
             List of chunks that reference this class
         """
-        with self._conn.cursor() as cur:
+        with self._cursor() as cur:
             cur.execute(
                 f"""
                 SELECT
@@ -490,6 +1030,67 @@ class PgVectorStore:
 
         return results
 
+    def search_by_class_references(
+        self,
+        class_names: Iterable[str],
+        top_k: int = 10,
+    ) -> dict[str, list[CodeChunk]]:
+        """Find chunks that reference each of several classes in one query.
+
+        Args:
+            class_names: Class names to search for
+            top_k: Maximum results per class
+
+        Returns:
+            Dictionary mapping each class name to the chunks referencing it
+        """
+        class_names = list(dict.fromkeys(class_names))
+        if not class_names:
+            return {}
+
+        with self._cursor() as cur:
+            cur.execute(
+                f"""
+                SELECT
+                    c.id, c.content, c.language, c.chunk_type, c.file_path,
+                    c.start_line, c.end_line, c.class_name, c.method_name,
+                    c.documentation, c."references", c.metadata, n.name
+                FROM unnest(%s::text[]) AS n(name)
+                CROSS JOIN LATERAL (
+                    SELECT * FROM {self.table_name}
+                    WHERE n.name = ANY("references")
+                    LIMIT %s
+                ) AS c
+                """,
+                (class_names, top_k),
+            )
+            rows = cur.fetchall()
+
+        results: dict[str, list[CodeChunk]] = {name: [] for name in class_names}
+        for row in rows:
+            results[row[12]].append(self._row_to_chunk(row))
+        return results
+
+    def class_exists(self, class_name: str) -> bool:
+        """Check whether a class is indexed, via the class lookup index.
+
+        Args:
+            class_name: Exact class name
+
+        Returns:
+            True if a class chunk with that name exists
+        """
+        with self._cursor() as cur:
+            cur.execute(
+                f"""
+                SELECT 1 FROM {self.table_name}
+                WHERE chunk_type = 'class' AND class_name = %s
+                LIMIT 1
+                """,
+                (class_name,),
+            )
+            return cur.fetchone() is not None
+
     def get_class_chunk(self, class_name: str) -> Optional[CodeChunk]:
         """Get the chunk for a specific class.
 
@@ -499,7 +1100,7 @@ class PgVectorStore:
         Returns:
             CodeChunk for the class, or None if not found
         """
-        with self._conn.cursor() as cur:
+        with self._cursor() as cur:
             cur.execute(
                 f"""
                 SELECT
@@ -517,6 +1118,41 @@ class PgVectorStore:
         if not row:
             return None
 
+        return self._row_to_chunk(row)
+
+    def get_class_chunks(self, class_names: Iterable[str]) -> dict[str, CodeChunk]:
+        """Get the class chunks for several classes in one query.
+
+        Args:
+            class_names: Class names to find
+
+        Returns:
+            Dictionary mapping each found class name to its chunk
+        """
+        class_names = list(dict.fromkeys(class_names))
+        if not class_names:
+            return {}
+
+        with self._cursor() as cur:
+            cur.execute(
+                f"""
+                SELECT DISTINCT ON (class_name)
+                    id, content, language, chunk_type, file_path,
+                    start_line, end_line, class_name, method_name,
+                    documentation, "references", metadata
+                FROM {self.table_name}
+                WHERE class_name = ANY(%s) AND chunk_type = 'class'
+                ORDER BY class_name, id
+                """,
+                (class_names,),
+            )
+            rows = cur.fetchall()
+
+        return {row[7]: self._row_to_chunk(row) for row in rows}
+
+    @staticmethod
+    def _row_to_chunk(row: tuple) -> CodeChunk:
+        """Build a CodeChunk from a row of the standard chunk columns."""
         references = row[10] if row[10] else []
         # Metadata is JSONB, so psycopg3 returns it as a dict already
         metadata = row[11] if row[11] else {}
@@ -546,7 +1182,7 @@ class PgVectorStore:
         Returns:
             List of all chunks for this class
         """
-        with self._conn.cursor() as cur:
+        with self._cursor() as cur:
             cur.execute(
                 f"""
                 SELECT
@@ -586,6 +1222,100 @@ class PgVectorStore:
 
         return results
 
+    def get_content_hashes(self, chunk_ids: list[str]) -> dict[str, str]:
+        """Look up the stored content hashes for a set of chunk ids.
+
+        Args:
+            chunk_ids: Chunk ids to look up
+
+        Returns:
+            Dictionary mapping each stored chunk id to its content hash, as
+            computed by embedding_hash()
+        """
+        if not chunk_ids:
+            return {}
+
+        with self._cursor() as cur:
+            cur.execute(
+                f"""
+                SELECT id, content_hash FROM {self.table_name}
+                WHERE id = ANY(%s) AND content_hash IS NOT NULL
+                """,
+                (chunk_ids,),
+            )
+            return dict(cur.fetchall())
+
+    # Columns refreshed by update_chunk_fields(), with their Postgres types
+    CHUNK_FIELD_COLUMNS = (
+        ("language", "text"),
+        ("chunk_type", "text"),
+        ("file_path", "text"),
+        ("start_line", "int4"),
+        ("end_line", "int4"),
+        ("class_name", "text"),
+        ("method_name", "text"),
+        ('"references"', "text[]"),
+        ("metadata", "jsonb"),
+    )
+
+    def update_chunk_fields(self, chunks: list[CodeChunk]) -> int:
+        """Refresh the non-embedding columns of chunks already stored.
+
+        Chunks whose content hash is unchanged skip re-embedding, but their
+        line span, references and metadata can still move (code added above
+        a method, a newly indexed class). Rows whose fields already match
+        are left untouched.
+
+        Args:
+            chunks: Stored chunks to refresh
+
+        Returns:
+            Number of rows updated
+        """
+        if not chunks:
+            return 0
+
+        params = [col.strip('"') for col, _ in self.CHUNK_FIELD_COLUMNS]
+        assignments = ", ".join(
+            f"{col} = %({name})s::{pg_type}"
+            for (col, pg_type), name in zip(self.CHUNK_FIELD_COLUMNS, params)
+        )
+        stored = ", ".join(col for col, _ in self.CHUNK_FIELD_COLUMNS)
+        incoming = ", ".join(
+            f"%({name})s::{pg_type}"
+            for (_, pg_type), name in zip(self.CHUNK_FIELD_COLUMNS, params)
+        )
+        rows = [
+            {
+                "id": chunk.id,
+                "language": chunk.language,
+                "chunk_type": chunk.chunk_type,
+                "file_path": chunk.file_path,
+                "start_line": chunk.start_line,
+                "end_line": chunk.end_line,
+                "class_name": chunk.class_name,
+                "method_name": chunk.method_name,
+                "references": chunk.references if chunk.references else None,
+                "metadata": Jsonb(chunk.metadata) if chunk.metadata else None,
+            }
+            for chunk in chunks
+        ]
+
+        with self._conn.cursor() as cur:
+            cur.executemany(
+                f"""
+                UPDATE {self.table_name} SET {assignments}
+                WHERE id = %(id)s
+                  AND ({stored}) IS DISTINCT FROM ({incoming})
+                """,
+                rows,
+            )
+            updated = cur.rowcount
+            if updated > 0:
+                self._bump_generation(cur)
+        self._conn.commit()
+        return max(updated, 0)
+
     def delete_by_file(self, file_path: str) -> int:
         """Delete all chunks from a specific file.
 
@@ -601,6 +1331,8 @@ class PgVectorStore:
                 (file_path,),
             )
             deleted = cur.rowcount
+            if deleted:
+                self._bump_generation(cur)
             self._conn.commit()
         return deleted
 
@@ -619,78 +1351,77 @@ class PgVectorStore:
                 (f"{file_path_prefix}%",),
             )
             deleted = cur.rowcount
+            if deleted:
+                self._bump_generation(cur)
             self._conn.commit()
         return deleted
 
+    def _bump_generation(self, cur: psycopg.Cursor) -> None:
+        """Advance the index generation inside the current write transaction."""
+        cur.execute(
+            f"UPDATE {self.table_name}_generation SET generation = generation + 1"
+        )
+
+    def index_generation(self) -> Optional[int]:
+        """Return a counter that changes whenever indexed chunks are written.
+
+        Every upsert, field refresh and delete bumps it in the same
+        transaction, so unlike the row count it also changes when a
+        re-index rewrites content without adding or removing chunks.
+        Caches of answers built from the index compare it to detect staleness.
+
+        Returns:
+            The current generation, or None if the table predates it (the
+            next index_codebase.py run creates it)
+        """
+        try:
+            with self._cursor() as cur:
+                cur.execute(f"SELECT generation FROM {self.table_name}_generation")
+                row = cur.fetchone()
+        except psycopg.errors.UndefinedTable:
+            return None
+        return row[0] if row else None
+
     def count(self) -> int:
         """Count total chunks in the store."""
-        with self._conn.cursor() as cur:
+        with self._cursor() as cur:
             cur.execute(f"SELECT COUNT(*) FROM {self.table_name}")
             return cur.fetchone()[0]
 
-    def list_classes(self, language: Optional[str] = None) -> list[CodeChunk]:
+    def list_classes(self, language: Optional[str] = None) -> list[ClassSummary]:
         """List all class chunks, optionally filtered by language.
 
+        Only the columns needed to list classes are fetched, not their
+        content. Rows are sorted by language, then by class name (file path
+        for unnamed classes), in code point order like Python's str sort,
+        so callers can group them without re-sorting.
+
         Args:
             language: Filter by language (e.g., 'java')
 
         Returns:
-            List of CodeChunk objects for classes
+            List of ClassSummary rows
         """
-        conditions = ["chunk_type = 'class'"]
-        params = []
-
-        if language:
-            conditions.append("language = %s")
-            params.append(language)
-
-        where_clause = "WHERE " + " AND ".join(conditions)
-
-        with self._conn.cursor() as cur:
+        with self._cursor() as cur:
             cur.execute(
                 f"""
-                SELECT
-                    id, content, language, chunk_type, file_path,
-                    start_line, end_line, class_name, method_name,
-                    documentation, "references", metadata
+                SELECT language, class_name, file_path, start_line, end_line
                 FROM {self.table_name}
-                {where_clause}
-                ORDER BY language, class_name
+                WHERE chunk_type = 'class'
+                  AND (%(language)s::text IS NULL OR language = %(language)s)
+                ORDER BY
+                    language COLLATE "C",
+                    COALESCE(NULLIF(class_name, ''), file_path) COLLATE "C"
                 """,
-                params,
+                {"language": language or None},
             )
             rows = cur.fetchall()
 
-        results = []
-        for row in rows:
-            references = row[10] if row[10] else []
-            # Metadata is JSONB, so psycopg3 returns it as a dict already
-            metadata = row[11] if row[11] else {}
-            if isinstance(metadata, str):
-                metadata = json.loads(metadata)
-
-            results.append(
-                CodeChunk(
-                    id=row[0],
-                    content=row[1],
-                    language=row[2],
-                    chunk_type=row[3],
-                    file_path=row[4],
-                    start_line=row[5],
-                    end_line=row[6],
-                    class_name=row[7],
-                    method_name=row[8],
-                    documentation=row[9],
-                    references=references,
-                    metadata=metadata,
-                )
-            )
-
-        return results
+        return [ClassSummary._make(row) for row in rows]
 
     def get_stats(self) -> dict:
         """Get statistics about stored chunks."""
-        with self._conn.cursor() as cur:
+        with self._cursor() as cur:
             # Total count
             cur.execute(f"SELECT COUNT(*) FROM {self.table_name}")
             total = cur.fetchone()[0]
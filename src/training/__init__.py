@@ -1,7 +1,19 @@
 """Vertex AI training integration modules."""
 
-from .monitor import monitor_tuning_job
-from .start_tuning import start_fine_tuning_job
-from .upload_data import upload_training_data
+import importlib
+
+# Submodules pull in the Vertex AI and Cloud Storage SDKs, so exports are
+# imported on first access rather than with the package
+_EXPORTS = {
+    "upload_training_data": ".upload_data",
+    "start_fine_tuning_job": ".start_tuning",
+    "monitor_tuning_job": ".monitor",
+}
 
 __all__ = ["upload_training_data", "start_fine_tuning_job", "monitor_tuning_job"]
+
+
+def __getattr__(name: str):
+    if name in _EXPORTS:
+        return getattr(importlib.import_module(_EXPORTS[name], __name__), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,7 @@
+"""Shared utilities for scripts and pipeline modules."""
+
+from .config_cache import load_config_fast, load_yaml_cached
+from .parse_cache import ParseCache
+from .query_cache import QueryCache
+
+__all__ = ["load_config_fast", "load_yaml_cached", "ParseCache", "QueryCache"]
@@ -0,0 +1,140 @@
+"""Cached YAML config loading shared by the CLI scripts."""
+
+import copy
+import json
+import os
+import tempfile
+import warnings
+from collections import OrderedDict
+from pathlib import Path
+
+import yaml
+
+try:
+    from yaml import CSafeLoader as SafeLoader
+except ImportError:  # libyaml not available
+    from yaml import SafeLoader
+
+    warnings.warn(
+        "PyYAML was built without libyaml; falling back to the pure-Python "
+        "SafeLoader. Install libyaml for faster config parsing."
+    )
+
+# Maximum number of parsed files kept in memory
+MAX_CACHE_ENTRIES = 100
+
+# absolute path -> (st_mtime_ns, st_size, parsed dict)
+_cache: "OrderedDict[str, tuple[int, int, dict]]" = OrderedDict()
+
+
+def load_yaml_cached(path: Path) -> dict:
+    """Load a YAML file, reusing the parsed result while the file is unchanged.
+
+    Entries are keyed by absolute path and validated against the file's
+    modification time and size from a single ``os.stat`` call. The least
+    recently used entry is evicted once the cache is full.
+
+    Args:
+        path: Path to the YAML file
+
+    Returns:
+        Parsed YAML content (a deep copy, safe to mutate)
+    """
+    key = str(Path(path).absolute())
+    st = os.stat(key)
+
+    cached = _cache.get(key)
+    if cached is not None and cached[0] == st.st_mtime_ns and cached[1] == st.st_size:
+        _cache.move_to_end(key)
+        return copy.deepcopy(cached[2])
+
+    with open(key, encoding="utf-8") as f:
+        data = yaml.load(f, Loader=SafeLoader) or {}
+
+    _cache[key] = (st.st_mtime_ns, st.st_size, data)
+    _cache.move_to_end(key)
+    while len(_cache) > MAX_CACHE_ENTRIES:
+        _cache.popitem(last=False)
+
+    return copy.deepcopy(data)
+
+
+def _sidecar_path(path: Path) -> Path:
+    """Return the JSON cache path for a YAML file (config.yaml -> config.yaml.cache.json)."""
+    return path.with_name(path.name + ".cache.json")
+
+
+def _json_safe_keys(data) -> bool:
+    """Whether every mapping key in ``data`` is a string.
+
+    json.dumps silently turns int, bool and None keys into strings, so a
+    config with such keys would load differently from the sidecar than
+    from the YAML it was written from.
+    """
+    if isinstance(data, dict):
+        return all(
+            isinstance(key, str) and _json_safe_keys(value)
+            for key, value in data.items()
+        )
+    if isinstance(data, list):
+        return all(map(_json_safe_keys, data))
+    return True
+
+
+def load_config_fast(path: Path) -> dict:
+    """Load a YAML config via a persistent JSON sidecar cache.
+
+    Short-lived scripts pay the YAML parse on every start. The sidecar
+    ``<path>.cache.json`` records the size and modification time (in
+    nanoseconds) of the YAML it was built from and is only used while both
+    match exactly, so a config restored with an older mtime (checkout of an
+    old revision, ``cp -p``, a volume mount) is reparsed rather than served
+    stale. Otherwise the YAML is parsed and the sidecar is rewritten
+    atomically.
+
+    Configs that cannot round-trip through JSON unchanged (dates, sets,
+    non-string mapping keys) are never cached, so the first and later
+    runs always see the same dict.
+
+    Args:
+        path: Path to the YAML file
+
+    Returns:
+        Parsed config dictionary
+    """
+    path = Path(path)
+    sidecar = _sidecar_path(path)
+    st = os.stat(path)
+    source = {"mtime_ns": st.st_mtime_ns, "size": st.st_size}
+
+    try:
+        with open(sidecar, encoding="utf-8") as f:
+            cached = json.load(f)
+        if cached["source"] == source:
+            return cached["config"]
+    except (OSError, ValueError, KeyError, TypeError):
+        pass  # Missing, stale or unreadable sidecar - rebuild from YAML
+
+    with open(path, "rb") as f:
+        data = yaml.load(f.read(), Loader=SafeLoader) or {}
+
+    if not _json_safe_keys(data):
+        return data
+
+    try:
+        payload = json.dumps({"source": source, "config": data})
+        fd, tmp_path = tempfile.mkstemp(
+            dir=sidecar.parent, prefix=sidecar.name, suffix=".tmp"
+        )
+    except (OSError, TypeError, ValueError):
+        # Read-only config dir or non-JSON YAML types; the parsed dict is still valid
+        return data
+
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write(payload)
+        os.replace(tmp_path, sidecar)
+    except OSError:
+        Path(tmp_path).unlink(missing_ok=True)
+
+    return data
@@ -0,0 +1,91 @@
+"""Persistent content-addressed cache of source file parse results."""
+
+import hashlib
+import pickle
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Any, Optional
+
+
+class ParseCache:
+    """SQLite-backed cache of extractor output keyed by file content.
+
+    Keys are SHA-256 digests of PARSE_CACHE_VERSION, the parser settings,
+    the file path and the file bytes, so editing a file, moving it or
+    changing the parser configuration all miss. Values are pickled.
+    """
+
+    # Bump when extractor output changes shape to invalidate old entries
+    PARSE_CACHE_VERSION = 1
+
+    def __init__(self, path: Path):
+        """Open (or create) the cache database.
+
+        Args:
+            path: SQLite database file
+        """
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS parse (key BLOB PRIMARY KEY, result BLOB NOT NULL)"
+            )
+            self._conn.commit()
+
+    def key(self, file_path: Path, settings: str) -> Optional[bytes]:
+        """Return the cache key for a file, or None if it cannot be read.
+
+        Args:
+            file_path: Source file
+            settings: Parser configuration that affects the result
+        """
+        try:
+            data = file_path.read_bytes()
+        except OSError:
+            return None
+        digest = hashlib.sha256(
+            f"{self.PARSE_CACHE_VERSION}\0{settings}\0{file_path}\0".encode()
+        )
+        digest.update(data)
+        return digest.digest()
+
+    def get(self, key: bytes) -> Optional[Any]:
+        """Return the cached result for a key, or None on a miss."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT result FROM parse WHERE key = ?", (key,)
+            ).fetchone()
+        if row is None:
+            return None
+        try:
+            return pickle.loads(row[0])
+        except (pickle.UnpicklingError, AttributeError, EOFError, ImportError):
+            return None
+
+    def put_many(self, items: list[tuple[bytes, Any]]) -> None:
+        """Store results in one transaction.
+
+        Args:
+            items: (key, result) pairs
+        """
+        rows = [
+            (key, pickle.dumps(result, protocol=pickle.HIGHEST_PROTOCOL))
+            for key, result in items
+        ]
+        if not rows:
+            return
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO parse (key, result) VALUES (?, ?)", rows
+            )
+            self._conn.commit()
+
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,118 @@
+"""In-memory LRU + TTL cache for repeated RAG queries within a session."""
+
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Hashable, Optional
+
+
+class QueryCache:
+    """Thread-safe LRU cache whose entries expire after a fixed time.
+
+    Entries are dropped wholesale when the optional ``generation`` callable
+    (e.g. PgVectorStore.index_generation) returns a different value than it
+    did when the first entry was stored. It is called at most once per
+    ``ttl_seconds`` and only while the cache holds entries: entries are
+    already allowed to be that old, and a cold cache (a single query) never
+    pays for the check.
+    """
+
+    def __init__(
+        self,
+        max_size: int = 2000,
+        ttl_seconds: float = 300,
+        generation: Optional[Callable[[], Hashable]] = None,
+    ):
+        """Initialize the cache.
+
+        Args:
+            max_size: Maximum number of entries before the least recently
+                used one is evicted
+            ttl_seconds: Seconds an entry stays valid after it is stored
+            generation: Returns a marker of the underlying data; a changed
+                result clears the cache
+        """
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self.generation = generation
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        self._lock = threading.RLock()
+        # key -> (expiry time on the monotonic clock, value)
+        self._entries: "OrderedDict[bytes, tuple[float, Any]]" = OrderedDict()
+        self._generation: Optional[Hashable] = None
+        # Monotonic time of the next generation check; None until the first put
+        self._next_generation_check: Optional[float] = None
+
+    @staticmethod
+    def make_key(*parts: Hashable) -> bytes:
+        """Build a compact cache key from hashable parts (method, query, filters...)."""
+        return hashlib.blake2b(repr(parts).encode(), digest_size=16).digest()
+
+    def _generation_due(self, now: float) -> bool:
+        """Whether the generation should be re-read before this lookup."""
+        with self._lock:
+            return (
+                self.generation is not None
+                and self._next_generation_check is not None
+                and bool(self._entries)
+                and now >= self._next_generation_check
+            )
+
+    def get(self, key: bytes) -> Optional[Any]:
+        """Return the cached value for a key, or None on a miss or expiry."""
+        now = time.monotonic()
+        due = self._generation_due(now)
+        current = self.generation() if due else None
+        with self._lock:
+            if due:
+                self._next_generation_check = now + self.ttl_seconds
+                if current != self._generation:
+                    self._entries.clear()
+                    self._generation = current
+
+            entry = self._entries.get(key)
+            if entry is None or entry[0] < time.monotonic():
+                if entry is not None:
+                    del self._entries[key]
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def put(self, key: bytes, value: Any) -> None:
+        """Store a value, evicting the least recently used entries if full."""
+        if self.generation is not None and self._next_generation_check is None:
+            # Baseline for the entries stored from now on
+            current = self.generation()
+            with self._lock:
+                if self._next_generation_check is None:
+                    self._generation = current
+                    self._next_generation_check = time.monotonic() + self.ttl_seconds
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl_seconds, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self) -> None:
+        """Remove all entries."""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        """Return hit/miss/eviction counters and the current size."""
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "size": len(self._entries),
+            }
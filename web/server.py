@@ -6,7 +6,6 @@ import sys
 from pathlib import Path
 from typing import Optional
 
-import yaml
 from fastapi import FastAPI, WebSocket, WebSocketDisconnect
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel
@@ -19,6 +18,7 @@ from src.rag import CodeRetriever
 from src.rag.embedder import VertexEmbedder
 from src.rag.vector_store import PgVectorStore
 from src.rag.query_analyzer import analyze_query
+from src.utils.config_cache import load_yaml_cached
 
 app = FastAPI(title="Koda API", version="1.0.0")
 
@@ -47,8 +47,7 @@ def load_config():
     for config_path in config_paths:
         if config_path.exists():
             try:
-                with open(config_path) as f:
-                    return yaml.safe_load(f)
+                return load_yaml_cached(config_path)
             except Exception as e:
                 print(f"Warning: Failed to load config from {config_path}: {e}")
     
@@ -88,8 +87,9 @@ def get_retriever() -> Optional[CodeRetriever]:
                 model=embedding_model,
             )
             
-            # Initialize vector store
-            store = PgVectorStore()
+            # Initialize vector store; queries run in executor threads, so
+            # give them a pool instead of queueing on one connection
+            store = PgVectorStore(max_connections=8)
             store.connect()
             
             # Initialize retriever